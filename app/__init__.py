@@ -15,35 +15,65 @@
 #
 # SPDX-License-Identifier: AGPL-3.0-or-later
 
+# First, so the time spent on the other imports is measured
+from .startup import startup_profiler
+
 from contextlib import asynccontextmanager
 
 from fastmcp import FastMCP
+from starlette.middleware import Middleware
 from openremote_client.schemas import ExternalServiceSchema
-from starlette.templating import Jinja2Templates
 
-from services.openremote_service import init_openremote_service
+from services.attribute_events import init_attribute_events, stop_attribute_events
+from services.leader import LeaderElection
+from services.openremote_service import HeartbeatSchedule, init_openremote_service, stop_openremote_service, \
+    stop_heartbeat_takeover
+from services.resilience import CircuitBreaker, Retry
+from services.upstream import Bulkhead
 from .config import config
-from .health import init_health
-from .services import init_services
-import json
+from .health import init_health, health_prober
+from .homepage import init_homepage
+from .metrics import init_metrics
+from .middleware import SessionTrackingMiddleware, RateLimitingMiddleware, UpstreamMetrics, UpstreamTracing, \
+    DrainingMiddleware
+from .services import init_services, stop_services
+from .shutdown import graceful_shutdown
+from .tracing import init_tracing
+from .utils import add_tool_registry_listener, tracer
+
+startup_profiler.mark('imports')
 
 mcp = FastMCP("OpenRemote Tools")
 
-@mcp.custom_route("/", methods=['GET'])
-async def homepage(request):
-    return Jinja2Templates(directory="templates").TemplateResponse(
-        "index.html",
-        {
-            "request": request,
-            "tools": await mcp.get_tools(),
-            "app_homepage_url": config.app_homepage_url,
-            "json": json
-        }
-    )
+# Added first, so calls rejected by the other middleware are measured as well
+init_metrics(mcp)
+
+# Connected clients are told to list the tools again whenever the asset tools change
+session_tracker = SessionTrackingMiddleware()
+mcp.add_middleware(session_tracker)
+add_tool_registry_listener(session_tracker.on_tool_registry_changed)
+
+mcp.add_middleware(RateLimitingMiddleware(
+    session_rate=config.app_rate_limit_session_rate,
+    session_burst=config.app_rate_limit_session_burst,
+    client_rate=config.app_rate_limit_client_rate,
+    client_burst=config.app_rate_limit_client_burst,
+    concurrency=max(1, config.app_tool_concurrency),
+))
 
+# Added last, so the spans only cover the tool call itself and not the wait for a slot
+init_tracing(mcp)
+
+init_homepage(mcp)
 init_health(mcp)
 
-app = mcp.http_app()
+# Outermost, so requests turned away while draining don't reach anything else
+app = mcp.http_app(middleware=[Middleware(DrainingMiddleware, shutdown=graceful_shutdown)])
+
+# A worker that is shutting down must not take over the heartbeats of one that already stopped
+graceful_shutdown.add_listener(stop_heartbeat_takeover)
+
+startup_profiler.mark('server setup')
 
 
 def extend_lifespan(original_lifespan):
@@ -56,23 +86,78 @@ def extend_lifespan(original_lifespan):
         # Run FastMCP's original lifespan (manages session manager)
         async with original_lifespan(app):
             # Init OpenRemote service
-            await init_openremote_service(
+            with startup_profiler.phase('registration'):
+                await init_openremote_service(
+                    host=str(config.openremote_url),
+                    client_id=config.openremote_client_id,
+                    client_secret=config.openremote_client_secret,
+                    verify_SSL=config.openremote_verify_ssl,
+                    interceptors=[
+                        CircuitBreaker(
+                            failure_threshold=config.app_circuit_breaker_failure_threshold,
+                            reset_timeout=config.app_circuit_breaker_reset_timeout,
+                        ),
+                        Retry(
+                            attempts=config.app_upstream_retry_attempts,
+                            base_delay=config.app_upstream_retry_base_delay,
+                            max_delay=config.app_upstream_retry_max_delay,
+                        ),
+                        Bulkhead(
+                            limits=config.app_upstream_concurrency,
+                            default_limit=config.app_upstream_default_concurrency,
+                            reserved_limit=config.app_upstream_reserved_concurrency,
+                        ),
+                        UpstreamTracing(),
+                        UpstreamMetrics(),
+                    ],
+                    # With `uvicorn --workers`, only one worker registers the service and sends heartbeats
+                    election=LeaderElection(config.app_worker_lock_path) if config.app_worker_lock_path else None,
+                    leader_timeout=config.app_worker_leader_timeout,
+                    heartbeat_schedule=HeartbeatSchedule(
+                        interval=config.openremote_heartbeat_interval,
+                        timeout=config.openremote_heartbeat_timeout,
+                        jitter=config.openremote_heartbeat_jitter,
+                    ),
+                    service_schema=ExternalServiceSchema(
+                        serviceId=config.openremote_service_id,
+                        label="MCP-Server",
+                        homepageUrl=config.app_homepage_url,
+                        status="AVAILABLE",
+                    )
+                )
+
+            health_prober.start()
+
+            # Attribute values read by the tools are served from the event stream of these realms
+            init_attribute_events(
                 host=str(config.openremote_url),
                 client_id=config.openremote_client_id,
                 client_secret=config.openremote_client_secret,
+                realms=config.app_attribute_events_realms,
                 verify_SSL=config.openremote_verify_ssl,
-                service_schema=ExternalServiceSchema(
-                    serviceId=config.openremote_service_id,
-                    label="MCP-Server",
-                    homepageUrl=config.app_homepage_url,
-                    status="AVAILABLE",
-                )
+                max_assets=config.app_attribute_events_max_assets,
+                reconnect_max_delay=config.app_attribute_events_reconnect_max_delay,
             )
 
             await init_services(mcp)
 
+            startup_profiler.finish()
+            if config.app_startup_profile:
+                startup_profiler.log_report(config.app_startup_profile_path)
+
+            graceful_shutdown.install_signal_handlers()
+
             yield
 
+            # Usually begun already by the signal that stopped uvicorn
+            await graceful_shutdown.drain()
+
+            await stop_services()
+            await stop_attribute_events()
+            await health_prober.stop()
+            await stop_openremote_service()
+            tracer.shutdown()
+
     return combined_lifespan
 
 app.router.lifespan_context = extend_lifespan(app.router.lifespan_context)
\ No newline at end of file
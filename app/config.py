@@ -20,6 +20,8 @@ from pydantic_settings import BaseSettings, SettingsConfigDict
 
 import logging
 
+from .startup import startup_profiler
+
 
 logger = logging.getLogger("uvicorn")
 
@@ -33,6 +35,46 @@ class Config(BaseSettings):
 
     app_debug: bool = False
     app_homepage_url: str = 'http://localhost:8420/'
+    app_cache_ttl: int = 300
+    app_cache_stale_ttl: int = 3600
+    app_health_probe_interval: int = 15
+    app_health_probe_timeout: int = 5
+    app_health_ready_max_age: int = 60
+    app_lazy_tool_compilation: bool = False
+    app_asset_snapshot_path: str = '.cache/asset_infos.json'
+    app_asset_reconcile_interval: int = 300
+    app_query_page_max_limit: int = 500
+    app_attribute_write_batch_size: int = 500
+    app_get_by_ids_concurrency: int = 8
+    app_get_by_ids_query_threshold: int = 20
+    app_bulk_create_concurrency: int = 4
+    app_upstream_concurrency: dict[str, int] = {'asset': 8, 'asset_model': 4, 'realm': 4, 'rule': 4}
+    app_upstream_default_concurrency: int = 8
+    app_upstream_reserved_concurrency: int = 2
+    app_upstream_retry_attempts: int = 3
+    app_upstream_retry_base_delay: float = 0.2
+    app_upstream_retry_max_delay: float = 2
+    app_circuit_breaker_failure_threshold: int = 5
+    app_circuit_breaker_reset_timeout: float = 30
+    app_rate_limit_session_rate: float = 5
+    app_rate_limit_session_burst: int = 20
+    app_rate_limit_client_rate: float = 20
+    app_rate_limit_client_burst: int = 60
+    app_tool_concurrency: int = 32
+    app_tracing_exporter: str = ''
+    app_tracing_jsonl_path: str = '.cache/traces.jsonl'
+    app_startup_profile: bool = False
+    app_startup_profile_path: str = '.cache/startup_profile.json'
+    app_worker_lock_path: str | None = None
+    app_worker_leader_timeout: float = 30
+    app_shutdown_drain_timeout: float = 20
+    app_attribute_events_realms: list[str] = []
+    app_attribute_events_max_assets: int = 10000
+    app_attribute_events_reconnect_max_delay: float = 30
+    app_asset_index_realms: list[str] = []
+    app_asset_index_sync_interval: int = 60
+    app_asset_index_page_size: int = 1000
+    app_asset_tree_max_assets: int = 5000
 
     openremote_url: HttpUrl
     openremote_client_id: str
@@ -40,9 +82,12 @@ class Config(BaseSettings):
     openremote_verify_ssl: bool = True
     openremote_service_id: str = 'MCP-Server'
     openremote_heartbeat_interval: int = 30
+    openremote_heartbeat_timeout: float = 10
+    openremote_heartbeat_jitter: float = 0.1
 
 
-config = Config()
+with startup_profiler.phase('config'):
+    config = Config()
 
 if config.app_debug:
     logging.basicConfig(level=logging.DEBUG)
\ No newline at end of file
@@ -15,27 +15,199 @@
 #
 # SPDX-License-Identifier: AGPL-3.0-or-later
 
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+
 from fastmcp import FastMCP
-from httpx import HTTPStatusError
 from starlette.responses import JSONResponse
 
-from services.openremote_service import get_openremote_service
+from services.attribute_events import get_attribute_event_stream
+from services.openremote_service import OpenRemoteService, get_openremote_service
+from services.resilience import CircuitBreaker
+from services.upstream import Bulkhead, OpenRemoteUpstream
 from .config import config
+from .shutdown import graceful_shutdown
+from .utils import get_tool_registry_version
+
+logger = logging.getLogger("uvicorn")
 
 mcp_health = FastMCP("Health Check")
 
 
+@dataclass
+class HealthProbeResult:
+    healthy: bool
+    checked_at: float
+    latency: float
+    error: str | None = None
+
+
+class HealthProber:
+    """
+    Probes the health of OpenRemote on an interval in the background.
+
+    Health requests are answered from the last result, so probes from Docker or Kubernetes
+    never reach OpenRemote and don't depend on its latency.
+    """
+
+    def __init__(self, interval: float, timeout: float):
+        self.interval = interval
+        self.timeout = timeout
+        self.last_result: HealthProbeResult | None = None
+        self.last_success_at: float | None = None
+        self.__probing: asyncio.Task | None = None
+        self.__task: asyncio.Task | None = None
+
+    async def probe(self) -> HealthProbeResult:
+        # Concurrent callers share a single probe
+        if self.__probing is None:
+            self.__probing = asyncio.create_task(self.__probe())
+
+        try:
+            return await asyncio.shield(self.__probing)
+        finally:
+            if self.__probing is not None and self.__probing.done():
+                self.__probing = None
+
+    async def __probe(self) -> HealthProbeResult:
+        started = time.perf_counter()
+
+        try:
+            openremote_service = get_openremote_service()
+            await asyncio.wait_for(openremote_service.client.status.get_health_status(), timeout=self.timeout)
+            result = HealthProbeResult(healthy=True, checked_at=time.time(), latency=time.perf_counter() - started)
+            self.last_success_at = result.checked_at
+        except Exception as e:
+            logger.debug(e)
+            result = HealthProbeResult(
+                healthy=False,
+                checked_at=time.time(),
+                latency=time.perf_counter() - started,
+                error="Failed to connect to OpenRemote"
+            )
+
+        self.last_result = result
+
+        return result
+
+    async def __loop(self):
+        while True:
+            await self.probe()
+            await asyncio.sleep(self.interval)
+
+    def start(self):
+        if self.__task is None:
+            self.__task = asyncio.create_task(self.__loop())
+
+    async def stop(self):
+        if self.__task is not None:
+            self.__task.cancel()
+            try:
+                await self.__task
+            except asyncio.CancelledError:
+                pass
+            self.__task = None
+
+    def reset(self):
+        self.last_result = None
+        self.last_success_at = None
+        self.__probing = None
+
+
+health_prober = HealthProber(
+    interval=config.app_health_probe_interval,
+    timeout=config.app_health_probe_timeout
+)
+
+
 @mcp_health.custom_route("/api/health", methods=['GET'])
 async def health(request):
-    openremote_service = get_openremote_service()
+    # Only the very first request (before the prober ran) has to wait for OpenRemote
+    result = health_prober.last_result or await health_prober.probe()
+
+    body = {
+        "status": "healthy" if result.healthy else "unhealthy",
+        "service_id": config.openremote_service_id,
+        "checked_at": result.checked_at,
+        "latency_ms": round(result.latency * 1000, 2),
+    }
 
+    if result.error:
+        body["error"] = result.error
+
+    heartbeat = heartbeat_stats()
+    if heartbeat:
+        body["heartbeat"] = heartbeat
+
+    upstream = upstream_stats()
+    if upstream:
+        body["upstream"] = upstream
+
+    attribute_events = get_attribute_event_stream()
+    if attribute_events is not None:
+        body["attribute_events"] = attribute_events.stats()
+
+    return JSONResponse(body, status_code=200)
+
+
+def heartbeat_stats() -> dict:
+    """When the last heartbeat to OpenRemote succeeded, and whether this worker sends them at all."""
+    try:
+        openremote_service = get_openremote_service()
+    except RuntimeError:
+        return {}
+
+    if not isinstance(openremote_service, OpenRemoteService):
+        return {}
+
+    return openremote_service.heartbeat_stats()
+
+
+def upstream_stats() -> dict:
+    """Load of the calls to OpenRemote, e.g. the active and waiting calls per bulkhead lane."""
     try:
-        await openremote_service.client.status.get_health_status()
-    except HTTPStatusError:
-        return JSONResponse({"status": "unhealthy", "service_id": config.openremote_service_id, "error": "Failed to connect to OpenRemote"}, status_code=200)
+        client = get_openremote_service().client
+    except RuntimeError:
+        return {}
+
+    if not isinstance(client, OpenRemoteUpstream):
+        return {}
+
+    stats = {}
+
+    circuit_breaker = client.get_interceptor(CircuitBreaker)
+    if circuit_breaker is not None:
+        stats["circuit_breaker"] = circuit_breaker.stats()
+
+    bulkhead = client.get_interceptor(Bulkhead)
+    if bulkhead is not None:
+        stats["bulkheads"] = bulkhead.stats()
+
+    return stats
+
+
+@mcp_health.custom_route("/api/health/live", methods=['GET'])
+async def live(request):
+    return JSONResponse({"status": "alive", "service_id": config.openremote_service_id}, status_code=200)
+
+
+@mcp_health.custom_route("/api/health/ready", methods=['GET'])
+async def ready(request):
+    checks = {
+        "accepting_sessions": not graceful_shutdown.draining,
+        "tools": get_tool_registry_version() > 0,
+        "openremote": health_prober.last_success_at is not None
+                      and time.time() - health_prober.last_success_at <= config.app_health_ready_max_age,
+    }
+    is_ready = all(checks.values())
 
-    return JSONResponse({"status": "healthy", "service_id": config.openremote_service_id}, status_code=200)
+    return JSONResponse(
+        {"status": "ready" if is_ready else "not_ready", "service_id": config.openremote_service_id, "checks": checks},
+        status_code=200 if is_ready else 503
+    )
 
 
 def init_health(mcp: FastMCP):
-    mcp.mount(mcp_health)
\ No newline at end of file
+    mcp.mount(mcp_health)
@@ -0,0 +1,103 @@
+# Copyright 2025, OpenRemote Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+
+import asyncio
+import hashlib
+import json
+from dataclasses import dataclass
+
+from fastmcp import FastMCP
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.templating import Jinja2Templates
+
+from .config import config
+from .utils import get_tool_registry_version
+
+templates = Jinja2Templates(directory="templates")
+
+
+@dataclass
+class RenderedHomepage:
+    tool_registry_version: int
+    body: bytes
+    etag: str
+
+
+__rendered_homepage: RenderedHomepage | None = None
+__render_lock = asyncio.Lock()
+
+
+async def render_homepage(mcp: FastMCP) -> RenderedHomepage:
+    """Render the homepage once per version of the tool registry and keep it in memory."""
+    global __rendered_homepage
+
+    version = get_tool_registry_version()
+
+    if __rendered_homepage is not None and __rendered_homepage.tool_registry_version == version:
+        return __rendered_homepage
+
+    async with __render_lock:
+        # Another request may have rendered this version while we were waiting
+        if __rendered_homepage is None or __rendered_homepage.tool_registry_version != version:
+            tools = await mcp.get_tools()
+
+            # Rendering hundreds of tool schemas takes a while, keep it off the event loop
+            body = await asyncio.to_thread(
+                lambda: templates.get_template("index.html").render(
+                    tools=tools,
+                    app_homepage_url=config.app_homepage_url,
+                    json=json
+                ).encode()
+            )
+
+            __rendered_homepage = RenderedHomepage(
+                tool_registry_version=version,
+                body=body,
+                etag=f'"{hashlib.sha256(body).hexdigest()}"'
+            )
+
+    return __rendered_homepage
+
+
+def reset_homepage():
+    """Drop the rendered homepage, the next request renders it again."""
+    global __rendered_homepage
+
+    __rendered_homepage = None
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+
+    candidates = [candidate.strip().removeprefix("W/") for candidate in if_none_match.split(",")]
+
+    return "*" in candidates or etag in candidates
+
+
+def init_homepage(mcp: FastMCP):
+    @mcp.custom_route("/", methods=['GET'])
+    async def homepage(request: Request):
+        rendered = await render_homepage(mcp)
+        headers = {"ETag": rendered.etag, "Cache-Control": "no-cache"}
+
+        if etag_matches(request.headers.get("if-none-match"), rendered.etag):
+            return Response(status_code=304, headers=headers)
+
+        return Response(rendered.body, media_type="text/html", headers=headers)
@@ -0,0 +1,35 @@
+# Copyright 2025, OpenRemote Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+
+from fastmcp import FastMCP
+from starlette.requests import Request
+from starlette.responses import Response
+
+from .middleware import MetricsMiddleware
+from .utils import metrics_registry
+
+# Version 0.0.4 of the Prometheus text exposition format
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def init_metrics(mcp: FastMCP):
+    mcp.add_middleware(MetricsMiddleware())
+
+    @mcp.custom_route("/metrics", methods=['GET'])
+    async def metrics(request: Request):
+        return Response(metrics_registry.render(), media_type=CONTENT_TYPE)
@@ -0,0 +1,60 @@
+# Copyright 2025, OpenRemote Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+from mcp.server.streamable_http import MCP_SESSION_ID_HEADER
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.shutdown import GracefulShutdown
+
+
+class DrainingMiddleware:
+    """
+    ASGI middleware that lets the server drain before it stops.
+
+    Requests other than GET (the notification streams) are counted as in flight. While draining, requests to
+    start a new MCP session are answered with 503, so the client retries on another instance.
+    """
+
+    def __init__(self, app: ASGIApp, shutdown: GracefulShutdown, path: str = "/mcp"):
+        self.app = app
+        self.shutdown = shutdown
+        self.path = path
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        if self.shutdown.draining and self.is_new_session(scope):
+            response = JSONResponse(
+                {"jsonrpc": "2.0", "id": None, "error": {"code": -32000, "message": "Server is shutting down"}},
+                status_code=503,
+                headers={"Retry-After": "1", "Connection": "close"},
+            )
+            return await response(scope, receive, send)
+
+        if scope["method"] == "GET":
+            return await self.app(scope, receive, send)
+
+        async with self.shutdown.request():
+            return await self.app(scope, receive, send)
+
+    def is_new_session(self, scope: Scope) -> bool:
+        if scope["method"] != "POST" or scope["path"].rstrip("/") != self.path.rstrip("/"):
+            return False
+
+        return not any(name.decode("latin-1").lower() == MCP_SESSION_ID_HEADER for name, _ in scope["headers"])
@@ -0,0 +1,118 @@
+# Copyright 2025, OpenRemote Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+
+import time
+from typing import Any
+
+from fastmcp.exceptions import NotFoundError
+from fastmcp.server.middleware import Middleware, MiddlewareContext, CallNext
+
+from services.upstream import CallNext as UpstreamCallNext, UpstreamCall, UpstreamInterceptor
+from app.utils import metrics_registry
+
+mcp_requests_in_flight = metrics_registry.gauge(
+    "mcp_requests_in_flight",
+    "MCP requests being handled right now",
+    ("method",),
+)
+mcp_tool_calls_total = metrics_registry.counter(
+    "mcp_tool_calls_total",
+    "Tool calls by tool",
+    ("tool",),
+)
+mcp_tool_errors_total = metrics_registry.counter(
+    "mcp_tool_errors_total",
+    "Tool calls that raised an error, by tool and error type",
+    ("tool", "error"),
+)
+mcp_tool_duration_seconds = metrics_registry.histogram(
+    "mcp_tool_duration_seconds",
+    "Duration of tool calls by tool",
+    ("tool",),
+)
+openremote_requests_in_flight = metrics_registry.gauge(
+    "openremote_requests_in_flight",
+    "Calls to OpenRemote waiting for a response right now",
+)
+openremote_requests_total = metrics_registry.counter(
+    "openremote_requests_total",
+    "Calls to OpenRemote by endpoint and outcome",
+    ("endpoint", "outcome"),
+)
+openremote_request_duration_seconds = metrics_registry.histogram(
+    "openremote_request_duration_seconds",
+    "Duration of calls to OpenRemote by endpoint",
+    ("endpoint",),
+)
+openremote_heartbeats_total = metrics_registry.counter(
+    "openremote_heartbeats_total",
+    "Heartbeats sent to OpenRemote by outcome",
+    ("outcome",),
+)
+
+
+class MetricsMiddleware(Middleware):
+    """Measures every MCP request and tool call, so no tool has to be instrumented itself."""
+
+    async def on_request(self, context: MiddlewareContext, call_next: CallNext):
+        method = context.method or "unknown"
+
+        mcp_requests_in_flight.inc(method=method)
+        try:
+            return await call_next(context)
+        finally:
+            mcp_requests_in_flight.dec(method=method)
+
+    async def on_call_tool(self, context: MiddlewareContext, call_next: CallNext):
+        tool = context.message.name
+        started = time.perf_counter()
+
+        try:
+            return await call_next(context)
+        except Exception as e:
+            # Clients can call any number of made up names, they share a single series instead of adding one each
+            if isinstance(e, NotFoundError):
+                tool = "unknown"
+
+            mcp_tool_errors_total.inc(tool=tool, error=type(e).__name__)
+            raise
+        finally:
+            mcp_tool_calls_total.inc(tool=tool)
+            mcp_tool_duration_seconds.observe(time.perf_counter() - started, tool=tool)
+
+
+class UpstreamMetrics(UpstreamInterceptor):
+    """Measures the calls to OpenRemote, placed last in the chain so only actual requests are measured."""
+
+    async def __call__(self, call: UpstreamCall, call_next: UpstreamCallNext) -> Any:
+        endpoint = call.endpoint
+        started = time.perf_counter()
+        outcome = "error"
+
+        openremote_requests_in_flight.inc()
+        try:
+            result = await call_next(call)
+            outcome = "success"
+            return result
+        finally:
+            openremote_requests_in_flight.dec()
+            openremote_request_duration_seconds.observe(time.perf_counter() - started, endpoint=endpoint)
+            openremote_requests_total.inc(endpoint=endpoint, outcome=outcome)
+
+            if endpoint == "services.heartbeat":
+                openremote_heartbeats_total.inc(outcome=outcome)
@@ -0,0 +1,228 @@
+# Copyright 2025, OpenRemote Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+
+import asyncio
+import time
+from collections import OrderedDict, deque
+
+from fastmcp import Context
+from fastmcp.server.dependencies import get_access_token
+from fastmcp.server.middleware import Middleware, MiddlewareContext, CallNext
+from mcp import McpError
+from mcp.types import ErrorData
+
+# Buckets of idle sessions and clients are dropped once there are more than this many, the least recently
+# used ones are dropped as well when that isn't enough
+MAX_BUCKETS = 1024
+
+
+class RateLimitExceededError(McpError):
+    """Tool call rejected by the rate limiter, `retry_after` tells the client how many seconds to back off."""
+
+    def __init__(self, scope: str, retry_after: float):
+        self.retry_after = retry_after
+        super().__init__(ErrorData(
+            code=-32000,
+            message=f"Rate limit of this {scope} exceeded, retry after {retry_after:.1f} seconds",
+            data={"scope": scope, "retry_after": retry_after},
+        ))
+
+
+class TokenBucket:
+    """Allows `burst` calls at once, refilled with `rate` calls per second."""
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated_at = time.monotonic()
+
+    def refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    @property
+    def retry_after(self) -> float:
+        return max(0.0, (1 - self.tokens) / self.rate)
+
+    def available(self) -> bool:
+        self.refill()
+
+        return self.tokens >= 1
+
+    def consume(self):
+        self.tokens -= 1
+
+
+class FairScheduler:
+    """
+    Limits the number of concurrent tool calls. When all slots are taken, waiting sessions are served
+    round-robin, so one busy session can't push everybody else to the back of the queue.
+    """
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.active = 0
+        self.__queues: OrderedDict[str, deque[asyncio.Future]] = OrderedDict()
+
+    @property
+    def waiting(self) -> int:
+        return sum(len(queue) for queue in self.__queues.values())
+
+    async def acquire(self, key: str):
+        if self.active < self.limit and not self.__queues:
+            self.active += 1
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        self.__queues.setdefault(key, deque()).append(future)
+
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # The slot was handed over just before the cancellation, pass it on
+                self.release()
+            else:
+                self.__discard(key, future)
+            raise
+
+    def release(self):
+        # Hand the slot to the first waiting session, which then moves to the back of the line
+        while self.__queues:
+            key, queue = next(iter(self.__queues.items()))
+            future = queue.popleft()
+
+            if queue:
+                self.__queues.move_to_end(key)
+            else:
+                del self.__queues[key]
+
+            if not future.done():
+                future.set_result(None)
+                return
+
+        self.active -= 1
+
+    def __discard(self, key: str, future: asyncio.Future):
+        queue = self.__queues.get(key)
+
+        if queue is not None and future in queue:
+            queue.remove(future)
+            if not queue:
+                del self.__queues[key]
+
+
+class RateLimitingMiddleware(Middleware):
+    """
+    Limits how fast each MCP session and each client may call tools, and how many tool calls run at once.
+
+    Calls over the limit of their session or client are rejected with a retry-after error right away, instead
+    of waiting on the event loop. A rate of 0 disables that limit.
+    """
+
+    def __init__(self, session_rate: float, session_burst: int, client_rate: float, client_burst: int, concurrency: int):
+        self.session_rate = session_rate
+        self.session_burst = session_burst
+        self.client_rate = client_rate
+        self.client_burst = client_burst
+        self.scheduler = FairScheduler(concurrency)
+        self.__session_buckets: OrderedDict[str, TokenBucket] = OrderedDict()
+        self.__client_buckets: OrderedDict[str, TokenBucket] = OrderedDict()
+
+    async def on_call_tool(self, context: MiddlewareContext, call_next: CallNext):
+        session_key, client_key = self.identify(context.fastmcp_context)
+        limits = [
+            ("session", self.__bucket(self.__session_buckets, session_key, self.session_rate, self.session_burst)),
+            ("client", self.__bucket(self.__client_buckets, client_key, self.client_rate, self.client_burst)),
+        ]
+
+        # Both limits are checked before either is charged, so a rejected call costs nothing
+        for scope, bucket in limits:
+            if bucket is not None and not bucket.available():
+                raise RateLimitExceededError(scope, round(bucket.retry_after, 2))
+
+        for _, bucket in limits:
+            if bucket is not None:
+                bucket.consume()
+
+        await self.scheduler.acquire(session_key)
+        try:
+            return await call_next(context)
+        finally:
+            self.scheduler.release()
+
+    @staticmethod
+    def identify(fastmcp_context: Context | None) -> tuple[str, str]:
+        """
+        The session and the client a call belongs to, clients are identified by who they authenticated as or by address.
+
+        The client id in the request metadata is not used, a client could pick a new one for every call.
+        """
+        if fastmcp_context is None:
+            return "local", "local"
+
+        try:
+            request_context = fastmcp_context.request_context
+        except ValueError:
+            return "local", "local"
+
+        session_id = fastmcp_context.session_id
+        request = request_context.request
+
+        access_token = get_access_token()
+
+        if access_token is not None:
+            return session_id, access_token.subject or access_token.client_id
+
+        if request is not None and getattr(request, 'client', None):
+            return session_id, request.client.host
+
+        return session_id, session_id
+
+    def __bucket(self, buckets: OrderedDict[str, TokenBucket], key: str, rate: float, burst: int) -> TokenBucket | None:
+        if rate <= 0:
+            return None
+
+        bucket = buckets.get(key)
+        if bucket is not None:
+            buckets.move_to_end(key)
+            return bucket
+
+        if len(buckets) >= MAX_BUCKETS:
+            self.__prune(buckets)
+
+        bucket = buckets[key] = TokenBucket(rate, burst)
+
+        return bucket
+
+    @staticmethod
+    def __prune(buckets: OrderedDict[str, TokenBucket]):
+        """
+        Drop the buckets that refilled completely, their sessions or clients have been idle for a while.
+
+        With that many sessions or clients active at once, the least recently used buckets are dropped too.
+        """
+        for key, bucket in list(buckets.items()):
+            bucket.refill()
+            if bucket.tokens >= bucket.burst:
+                del buckets[key]
+
+        while len(buckets) >= MAX_BUCKETS:
+            buckets.popitem(last=False)
@@ -0,0 +1,63 @@
+# Copyright 2025, OpenRemote Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+
+import asyncio
+import logging
+import weakref
+
+from fastmcp.server.middleware import Middleware, MiddlewareContext, CallNext
+from mcp.server.session import ServerSession
+
+logger = logging.getLogger("uvicorn")
+
+
+class SessionTrackingMiddleware(Middleware):
+    """Remembers the sessions of connected MCP clients, so they can be notified outside a request."""
+
+    def __init__(self):
+        self.sessions: weakref.WeakSet[ServerSession] = weakref.WeakSet()
+        # The event loop only keeps weak references to tasks, so a pending notification could be collected
+        self.__notifications: set[asyncio.Task] = set()
+
+    async def on_request(self, context: MiddlewareContext, call_next: CallNext):
+        if context.fastmcp_context is not None:
+            try:
+                self.sessions.add(context.fastmcp_context.session)
+            except ValueError:
+                pass  # No request context available
+
+        return await call_next(context)
+
+    async def notify_tool_list_changed(self):
+        """Send a 'notifications/tools/list_changed' to every connected client."""
+        for session in list(self.sessions):
+            try:
+                await session.send_tool_list_changed()
+            except Exception as e:
+                # The client went away, it will list the tools again when it reconnects
+                logger.debug(e)
+                self.sessions.discard(session)
+
+    def on_tool_registry_changed(self):
+        try:
+            task = asyncio.get_running_loop().create_task(self.notify_tool_list_changed())
+        except RuntimeError:
+            return  # No event loop running, so no clients to notify either
+
+        self.__notifications.add(task)
+        task.add_done_callback(self.__notifications.discard)
@@ -0,0 +1,71 @@
+# Copyright 2025, OpenRemote Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+
+import dataclasses
+import time
+from typing import Any
+
+from fastmcp.server.dependencies import get_http_headers
+from fastmcp.server.middleware import Middleware, MiddlewareContext, CallNext
+
+from services.upstream import CallNext as UpstreamCallNext, UpstreamCall, UpstreamInterceptor
+from app.utils.tracing import tracer, current_tool_timing, ToolTiming
+
+
+class TracingMiddleware(Middleware):
+    """
+    Runs every tool call in a span, continuing the trace of the client when it sends a `traceparent` header.
+
+    The 'validate arguments' and 'serialize result' spans are derived from when the tool function started
+    and finished, see `instrument_tools`.
+    """
+
+    async def on_call_tool(self, context: MiddlewareContext, call_next: CallNext):
+        if not tracer.enabled:
+            return await call_next(context)
+
+        tool = context.message.name
+        traceparent = get_http_headers(include_all=True).get('traceparent')
+
+        with tracer.span(f"tool {tool}", traceparent=traceparent, tool=tool) as span:
+            timing = ToolTiming(started=time.time())
+            token = current_tool_timing.set(timing)
+
+            try:
+                return await call_next(context)
+            finally:
+                current_tool_timing.reset(token)
+                finished = time.time()
+
+                if timing.fn_started is not None:
+                    tracer.record(span, "validate arguments", timing.started, timing.fn_started)
+                if timing.fn_finished is not None:
+                    tracer.record(span, "serialize result", timing.fn_finished, finished)
+
+
+class UpstreamTracing(UpstreamInterceptor):
+    """Runs every call to OpenRemote in a span and passes the trace on with a `traceparent` header."""
+
+    async def __call__(self, call: UpstreamCall, call_next: UpstreamCallNext) -> Any:
+        if not tracer.enabled:
+            return await call_next(call)
+
+        with tracer.span(f"openremote {call.endpoint}", endpoint=call.endpoint) as span:
+            headers = {**(call.kwargs.get('headers') or {}), 'traceparent': span.traceparent}
+
+            return await call_next(dataclasses.replace(call, kwargs={**call.kwargs, 'headers': headers}))
@@ -17,14 +17,34 @@
 
 from fastmcp import FastMCP
 
-from .asset import init_asset_service
-from .asset_model import asset_model_mcp
-from .realm import realm_mcp
-#from .rule import rule_mcp
+from app.startup import startup_profiler
+from app.utils import tool_registry_changed, tracer, instrument_tools
 
 
 async def init_services(mcp_app: FastMCP):
+    # The tool modules build their tools and schemas on import, so they are only imported once the server starts
+    with startup_profiler.phase('service imports'):
+        from .asset import asset_mcp, init_asset_service
+        from .asset_model import asset_model_mcp
+        from .realm import realm_mcp
+        #from .rule import rule_mcp
+
+    if tracer.enabled:
+        # Before importing, imported tools are copies
+        for server in (asset_mcp, asset_model_mcp, realm_mcp):
+            await instrument_tools(server)
+
     await init_asset_service(mcp_app)
-    await mcp_app.import_server(asset_model_mcp, prefix="asset_model")
-    await mcp_app.import_server(realm_mcp, prefix="realm")
-    #await mcp_app.import_server(rule_mcp, prefix="rule")
+
+    with startup_profiler.phase('tool registration'):
+        await mcp_app.import_server(asset_model_mcp, prefix="asset_model")
+        await mcp_app.import_server(realm_mcp, prefix="realm")
+        #await mcp_app.import_server(rule_mcp, prefix="rule")
+
+    tool_registry_changed()
+
+
+async def stop_services():
+    from .asset import stop_asset_service
+
+    await stop_asset_service()
@@ -15,17 +15,27 @@
 #
 # SPDX-License-Identifier: AGPL-3.0-or-later
 
+import asyncio
 import logging
+from typing import Annotated
 
 from fastmcp import FastMCP
 from fastmcp.tools import Tool
 from fastmcp.tools.tool_transform import ArgTransform
 from httpx import HTTPStatusError
-from openremote_client.schemas import AssetQuerySchema, RealmPredicateSchema, AssetObjectSchema
+from openremote_client.schemas import AssetQuerySchema, RealmPredicateSchema, AssetObjectSchema, OrderBySchema, \
+    SelectSchema, ParentPredicateSchema
 from pydantic import Field, BaseModel
 
+from services.attribute_events import get_attribute_value_cache
 from services.openremote_service import get_openremote_service
-from app.utils import asset_attribute_model_factory
+from app.config import config
+from app.startup import startup_profiler
+from app.utils import asset_attribute_model_factory, LazyTool, tool_registry_changed, asset_info_digest, \
+    save_asset_infos_snapshot, load_asset_infos_snapshot, encode_cursor, decode_cursor, AssetProjection, \
+    parse_projection, PROJECTION_DESCRIPTION, AssetIndex, build_asset_tree
+from app.utils.metrics import cache_requests_total, cache_hit_ratio
+from .asset_model import fetch_asset_infos, invalidate_asset_model_cache
 
 logger = logging.getLogger("uvicorn")
 
@@ -36,31 +46,418 @@ class AssetQuerySchemaDescription(AssetQuerySchema):
     types: list[str] | None = Field(default=None, description="Asset types to query, (Make sure to use the 'get_all_asset_types' tool to gather which types there are)")
     realm: RealmPredicateSchema | None = Field(default=None, description="Realm to query (Make sure to use the 'get_all_realms' tool to now which realms to query)")
 
+ProjectionFields = Annotated[list[str] | None, Field(description=PROJECTION_DESCRIPTION)]
+
+
+def projected_query(asset_query_schema: AssetQuerySchema, projection: AssetProjection | None) -> AssetQuerySchema:
+    """Let OpenRemote leave out the attributes when the projection doesn't need them."""
+    if projection is None or projection.needs_attributes or asset_query_schema.select is not None:
+        return asset_query_schema
+
+    return asset_query_schema.model_copy(update={"select": SelectSchema(basic=True)})
+
+
+__asset_index: AssetIndex | None = None
+__index_sync_task: asyncio.Task | None = None
+
+
+def indexed_query(asset_query_schema: AssetQuerySchema, projection: AssetProjection | None) -> list[dict] | None:
+    """
+    Answer a query from the asset index, None when it has to go to OpenRemote.
+
+    The index has no attributes, so full assets always come from OpenRemote. Projected attribute values
+    are taken from the attribute value cache, as long as it holds every asset that matched.
+    """
+    if __asset_index is None or projection is None or not __asset_index.supports(asset_query_schema):
+        return None
+
+    assets = __asset_index.evaluate(asset_query_schema)
+
+    if not projection.needs_attributes:
+        return [projection.apply(asset) for asset in assets]
+
+    cache = get_attribute_value_cache()
+    if cache is None:
+        return None
+
+    attribute_names = None if projection.all_attributes else list(projection.attributes)
+    projected = []
+
+    for asset in assets:
+        values = cache.lookup(asset.id, attribute_names)
+
+        if values is None:
+            return None
+
+        attributes = {name: {"value": value.value} for name, value in values.items()}
+        projected.append(projection.apply({**dict(asset), "attributes": attributes}))
+
+    return projected
+
+
+def index_created_asset(response):
+    """Add a created asset to the index right away, rather than on the next sync."""
+    if __asset_index is not None:
+        __asset_index.put(response.content)
+
+
+
 @asset_mcp.tool
-async def query(asset_query_schema: AssetQuerySchemaDescription):
+async def query(asset_query_schema: AssetQuerySchemaDescription, fields: ProjectionFields = None):
     """
     Lists all assets available.
 
     If 403 is returned, that either means you don't have to correct access rights or the realms you specified do not exist.
     Try calling the 'get_all_realms' tool to see which realms are available.
+    Use 'fields' (e.g. ['summary']) when you don't need every attribute of every asset.
     """
     openremote_service = get_openremote_service()
 
     try:
-        return await openremote_service.client.asset.query_assets(asset_query_schema)
+        projection = parse_projection(fields)
+    except ValueError as e:
+        return {
+            "detail": str(e)
+        }
+
+    indexed = indexed_query(asset_query_schema, projection)
+    if indexed is not None:
+        return indexed
+
+    try:
+        response = await openremote_service.client.asset.query_assets(projected_query(asset_query_schema, projection))
     except HTTPStatusError as e:
         return {
             "status_code": e.response.status_code,
             "detail": e.response.text,
         }
 
+    if projection is None:
+        return response
+
+    return [projection.apply(asset) for asset in response.content]
+
 
 @asset_mcp.tool
-async def get_by_id(asset_id: str):
+async def query_page(
+        asset_query_schema: AssetQuerySchemaDescription,
+        limit: int = 100,
+        cursor: str | None = None,
+        fields: ProjectionFields = None,
+):
+    """
+    Lists assets one page at a time, use this instead of 'query' when a realm has many assets.
+
+    Returns the assets of the page and a 'next_cursor'. To get the next page, call this tool again with the
+    same query and the 'next_cursor', until 'next_cursor' is null.
+    """
+    openremote_service = get_openremote_service()
+
+    try:
+        offset = decode_cursor(asset_query_schema, cursor) if cursor else 0
+        projection = parse_projection(fields)
+    except ValueError as e:
+        return {
+            "detail": str(e)
+        }
+
+    limit = max(1, min(limit, config.app_query_page_max_limit))
+
+    # Fetch one extra asset to know whether there is a next page, and keep the order stable between pages
+    page_query = projected_query(asset_query_schema, projection).model_copy(update={
+        "limit": limit + 1,
+        "offset": offset,
+        "orderBy": asset_query_schema.orderBy or OrderBySchema(property='CREATED_ON'),
+    })
+
+    assets = indexed_query(page_query, projection)
+
+    if assets is None:
+        try:
+            assets = (await openremote_service.client.asset.query_assets(page_query)).content
+        except HTTPStatusError as e:
+            return {
+                "status_code": e.response.status_code,
+                "detail": e.response.text,
+            }
+
+        if projection is not None:
+            assets = [projection.apply(asset) for asset in assets]
+
+    return {
+        "assets": assets[:limit],
+        "next_cursor": encode_cursor(asset_query_schema, offset + limit) if len(assets) > limit else None,
+    }
+
+
+@asset_mcp.tool
+async def get_by_id(asset_id: str, fields: ProjectionFields = None):
     """Retrieve a single asset by ID."""
     openremote_service = get_openremote_service()
 
-    return await openremote_service.client.asset.get_asset(asset_id)
+    try:
+        projection = parse_projection(fields)
+    except ValueError as e:
+        return {
+            "detail": str(e)
+        }
+
+    response = await openremote_service.client.asset.get_asset(asset_id)
+
+    if projection is None:
+        return response
+
+    return projection.apply(response.content)
+
+
+@asset_mcp.tool
+async def get_by_ids(asset_ids: list[str], fields: ProjectionFields = None):
+    """
+    Retrieve multiple assets by ID in one call, use this instead of calling 'get_by_id' for every asset.
+
+    Returns the found assets in the requested order, and an error for every ID that could not be retrieved.
+    """
+    openremote_service = get_openremote_service()
+
+    try:
+        projection = parse_projection(fields)
+    except ValueError as e:
+        return {
+            "detail": str(e)
+        }
+
+    asset_ids = list(dict.fromkeys(asset_ids))
+
+    if len(asset_ids) > config.app_get_by_ids_query_threshold:
+        found, errors = await _query_assets_by_ids(openremote_service.client, asset_ids, projection)
+    else:
+        found, errors = await _get_assets_by_ids(openremote_service.client, asset_ids)
+
+    assets = [found[asset_id] for asset_id in asset_ids if asset_id in found]
+
+    return {
+        "assets": assets if projection is None else [projection.apply(asset) for asset in assets],
+        "errors": errors,
+    }
+
+
+@asset_mcp.tool
+async def tree(realm: str | None = None, root_id: str | None = None, max_depth: int | None = None):
+    """
+    Get the asset hierarchy below an asset, or of a whole realm, in one call instead of walking it with 'query'.
+
+    Returns nested nodes with the id, name, type and children of every asset. Below 'max_depth' (the top is at
+    depth 0), nodes only have a 'children_count'. 'truncated' is true when the hierarchy has more assets than
+    are returned at most.
+    """
+    if realm is None and root_id is None:
+        return {
+            "detail": "Either 'realm' or 'root_id' is required"
+        }
+
+    openremote_service = get_openremote_service()
+    max_assets = config.app_asset_tree_max_assets
+    truncated = False
+
+    try:
+        if root_id is not None:
+            assets, truncated = await _fetch_subtree(openremote_service.client, root_id, max_assets)
+        elif __asset_index is not None and realm in __asset_index.synced_at:
+            assets = __asset_index.evaluate(AssetQuerySchema(realm=RealmPredicateSchema(name=realm)))
+        else:
+            assets, truncated = await fetch_all_assets(
+                openremote_service.client,
+                AssetQuerySchema(realm=RealmPredicateSchema(name=realm), select=SelectSchema(basic=True)),
+                page_size=config.app_query_page_max_limit,
+                max_assets=max_assets,
+            )
+    except HTTPStatusError as e:
+        return {
+            "status_code": e.response.status_code,
+            "detail": e.response.text,
+        }
+
+    if len(assets) > max_assets:
+        assets, truncated = assets[:max_assets], True
+
+    return {
+        "roots": build_asset_tree(assets, [root_id] if root_id is not None else None, max_depth),
+        "assets": len(assets),
+        "truncated": truncated,
+    }
+
+
+async def _fetch_subtree(client, root_id: str, max_assets: int) -> tuple[list, bool]:
+    """The root and all of its descendants, from the asset index when it has the realm of the root."""
+    root = __asset_index.get(root_id) if __asset_index is not None else None
+
+    if root is not None and root.realm in __asset_index.synced_at:
+        assets = __asset_index.evaluate(AssetQuerySchema(realm=RealmPredicateSchema(name=root.realm)))
+        return [root, *_descendants(assets, root_id)], False
+
+    # The root is fetched alongside the descendants, so it doesn't add a round trip
+    root_response, (descendants, truncated) = await asyncio.gather(
+        client.asset.get_asset(root_id),
+        fetch_all_assets(
+            client,
+            AssetQuerySchema(parents=[ParentPredicateSchema(id=root_id)], recursive=True, select=SelectSchema(basic=True)),
+            page_size=config.app_query_page_max_limit,
+            max_assets=max_assets,
+        ),
+    )
+
+    return [root_response.content, *(asset for asset in descendants if asset.id != root_id)], truncated
+
+
+def _descendants(assets: list, root_id: str) -> list:
+    """The assets below the root, in the order of `assets`."""
+    children = {}
+    for asset in assets:
+        children.setdefault(asset.parentId, []).append(asset)
+
+    below = set()
+    pending = [root_id]
+
+    while pending:
+        for child in children.get(pending.pop(), []):
+            below.add(child.id)
+            pending.append(child.id)
+
+    return [asset for asset in assets if asset.id in below]
+
+
+async def fetch_all_assets(client, query: AssetQuerySchema, page_size: int, max_assets: int | None = None) -> tuple[list, bool]:
+    """
+    Page through every asset matching the query, in the order they were created.
+
+    Stops after `max_assets`, and returns whether more assets matched than were fetched.
+    """
+    page_size = max(1, page_size)
+    assets = []
+
+    while True:
+        limit = page_size if max_assets is None else min(page_size, max_assets + 1 - len(assets))
+        page = (await client.asset.query_assets(query.model_copy(update={
+            "limit": limit,
+            "offset": len(assets),
+            "orderBy": OrderBySchema(property='CREATED_ON'),
+        }))).content
+        assets.extend(page)
+
+        if max_assets is not None and len(assets) > max_assets:
+            return assets[:max_assets], True
+
+        if len(page) < limit:
+            return assets, False
+
+
+async def _get_assets_by_ids(client, asset_ids: list[str]) -> tuple[dict, list[dict]]:
+    """Fetch every asset on its own, at most `app_get_by_ids_concurrency` at a time."""
+    semaphore = asyncio.Semaphore(max(1, config.app_get_by_ids_concurrency))
+    found = {}
+    errors = []
+
+    async def get(asset_id: str):
+        async with semaphore:
+            try:
+                found[asset_id] = (await client.asset.get_asset(asset_id)).content
+            except Exception as e:
+                # E.g. a timeout or an open circuit, the other assets are still fetched and reported
+                errors.append(_fetch_error(asset_id, e))
+
+    await asyncio.gather(*(get(asset_id) for asset_id in asset_ids))
+    positions = {asset_id: position for position, asset_id in enumerate(asset_ids)}
+
+    return found, sorted(errors, key=lambda error: positions[error["asset_id"]])
+
+
+async def _query_assets_by_ids(client, asset_ids: list[str], projection: AssetProjection | None) -> tuple[dict, list[dict]]:
+    """
+    Fetch the assets with a single query, IDs that are missing from the result are fetched on their own.
+
+    The query has no realm, so OpenRemote only searches the realm of the service user. Assets of other realms
+    are fetched by ID like in `_get_assets_by_ids`, so the result doesn't depend on how many IDs are asked for.
+    """
+    try:
+        response = await client.asset.query_assets(projected_query(AssetQuerySchema(ids=asset_ids), projection))
+    except Exception as e:
+        return {}, [_fetch_error(asset_id, e) for asset_id in asset_ids]
+
+    found = {asset.id: asset for asset in response.content}
+    unseen = [asset_id for asset_id in asset_ids if asset_id not in found]
+    errors = []
+
+    if unseen:
+        fetched, errors = await _get_assets_by_ids(client, unseen)
+        found.update(fetched)
+
+    return found, errors
+
+
+def _fetch_error(asset_id: str, e: Exception) -> dict:
+    if isinstance(e, HTTPStatusError):
+        return {"asset_id": asset_id, "status_code": e.response.status_code, "detail": e.response.text}
+
+    return {"asset_id": asset_id, "detail": str(e) or type(e).__name__}
+
+
+@asset_mcp.tool
+async def read_attribute_values(asset_ids: list[str], attribute_names: list[str] | None = None):
+    """
+    Read the current values of attributes of one or more assets, use this instead of 'get_by_id' when only the values are needed.
+
+    Returns the values and their timestamps per asset in the requested order, all attributes when no
+    'attribute_names' are given, and an error for every asset that could not be read.
+    """
+    cache = get_attribute_value_cache()
+    asset_ids = list(dict.fromkeys(asset_ids))
+    values: dict[str, dict] = {}
+
+    if cache is not None:
+        for asset_id in asset_ids:
+            cached = cache.lookup(asset_id, attribute_names)
+
+            if cached is not None:
+                values[asset_id] = {
+                    name: {"value": value.value, "timestamp": value.timestamp} for name, value in cached.items()
+                }
+
+        cache_requests_total.inc(len(values), cache='attribute_values', result='hit')
+        cache_requests_total.inc(len(asset_ids) - len(values), cache='attribute_values', result='miss')
+        if cache.hits + cache.misses:
+            cache_hit_ratio.set(cache.hits / (cache.hits + cache.misses), cache='attribute_values')
+
+    missing = [asset_id for asset_id in asset_ids if asset_id not in values]
+    errors = []
+
+    if missing:
+        client = get_openremote_service().client
+        # Assets fetched while the event stream reconnected may be outdated already, and are not cached
+        generation = cache.generation if cache is not None else None
+
+        if len(missing) > config.app_get_by_ids_query_threshold:
+            found, errors = await _query_assets_by_ids(client, missing, None)
+        else:
+            found, errors = await _get_assets_by_ids(client, missing)
+
+        for asset_id, asset in found.items():
+            asset = asset.model_dump()
+
+            if cache is not None:
+                cache.put_asset(asset, generation)
+
+            values[asset_id] = {
+                name: {"value": attribute.get("value"), "timestamp": attribute.get("timestamp")}
+                for name, attribute in (asset.get("attributes") or {}).items()
+                if attribute_names is None or name in attribute_names
+            }
+
+    return {
+        "assets": [
+            {"asset_id": asset_id, "attributes": values[asset_id]} for asset_id in asset_ids if asset_id in values
+        ],
+        "errors": errors,
+    }
 
 
 class AssetAttributeSchema(BaseModel):
@@ -105,7 +502,9 @@ async def create(name: str, attributes: dict, type: str | None = None, parentId:
     # attributes_convert = {key: AssetAttributeSchema(name=key) for key, attribute in attributes.values() }
 
     try:
-        return await openremote_service.client.asset.create_asset(AssetObjectSchema(name=name, type=type, parentId=parentId, realm=realm, attributes=attributes))
+        response = await openremote_service.client.asset.create_asset(AssetObjectSchema(name=name, type=type, parentId=parentId, realm=realm, attributes=attributes))
+        index_created_asset(response)
+        return response
     except HTTPStatusError as e:
         return {
             "status_code": e.response.status_code,
@@ -117,33 +516,364 @@ async def create(name: str, attributes: dict, type: str | None = None, parentId:
         }
 
 
-async def init_asset_service(mcp: FastMCP):
+class AssetDefinition(BaseModel):
+    name: str = Field(description="Name of the asset.")
+    type: str = Field(description="Asset type, (Make sure to use the 'get_all_asset_types' tool to gather which types there are)")
+    attributes: dict = Field(default_factory=dict, description="Attribute values of the asset, keyed by attribute name.")
+    id: str | None = Field(default=None, description="Optional ID of the new asset, so other assets in the same batch can use it as their parentId.")
+    parentId: str | None = Field(default=None, description="ID of an existing asset, or of an asset in the same batch.")
+    realm: str | None = None
+
+
+@asset_mcp.tool
+async def create_many(assets: list[AssetDefinition]):
+    """
+    Create many assets at once, use this instead of calling a 'create' tool for every asset.
+
+    All assets are validated against their asset type before anything is created. Parents in the same batch are
+    created before their children. Returns the created assets and an error for every asset that was not created,
+    both referring to the position of the asset in the list.
+    """
     openremote_service = get_openremote_service()
+    asset_models = {
+        asset_model.assetDescriptor['name']: asset_model for asset_model in (await fetch_asset_infos()).content
+    }
+
+    attribute_models = {}
+    errors: dict[int, dict] = {}
+    assets_to_create: dict[int, AssetObjectSchema] = {}
+
+    for index, definition in enumerate(assets):
+        try:
+            assets_to_create[index] = _validate_asset_definition(definition, asset_models, attribute_models)
+        except ValueError as e:
+            errors[index] = {"detail": str(e)}
+
+    levels, cycle = _creation_levels(assets)
+    for index in cycle:
+        errors.setdefault(index, {"detail": "parentId is part of a cycle in this batch"})
+
+    semaphore = asyncio.Semaphore(max(1, config.app_bulk_create_concurrency))
+    batch_ids = {definition.id: index for index, definition in enumerate(assets) if definition.id}
+    created: dict[int, dict] = {}
+
+    async def create_one(index: int):
+        parent_index = batch_ids.get(assets[index].parentId)
+
+        if index in errors:
+            return
+        if parent_index is not None and parent_index not in created:
+            errors[index] = {"detail": f"Parent at index {parent_index} was not created"}
+            return
+
+        async with semaphore:
+            try:
+                response = await openremote_service.client.asset.create_asset(assets_to_create[index])
+            except HTTPStatusError as e:
+                errors[index] = {"status_code": e.response.status_code, "detail": e.response.text}
+                return
+            except Exception as e:
+                # E.g. a timeout, the other assets are still created and reported
+                errors[index] = {"detail": str(e) or type(e).__name__}
+                return
+
+        index_created_asset(response)
+        created[index] = {"index": index, "id": response.content.id, "name": response.content.name}
+
+    for level in levels:
+        await asyncio.gather(*(create_one(index) for index in level))
+
+    return {
+        "created": [created[index] for index in sorted(created)],
+        "errors": [{"index": index, "name": assets[index].name, **errors[index]} for index in sorted(errors)],
+    }
+
+
+def _validate_asset_definition(definition: AssetDefinition, asset_models: dict, attribute_models: dict) -> AssetObjectSchema:
+    """Check the attributes against the attribute model of the asset type, raises ValueError when they don't fit."""
+    asset_model = asset_models.get(definition.type)
+
+    if asset_model is None:
+        raise ValueError(f"Unknown asset type '{definition.type}'")
+
+    if definition.type not in attribute_models:
+        try:
+            attribute_models[definition.type] = asset_attribute_model_factory(definition.type, asset_model.attributeDescriptors)
+        except KeyError as e:
+            # The attribute model only knows the value types of OpenRemote that map to a Python type
+            raise ValueError(f"Asset type '{definition.type}' has an attribute of unsupported type {e}") from e
+
+    attribute_model = attribute_models[definition.type]
+    unknown = set(definition.attributes) - set(attribute_model.model_fields)
+
+    if unknown:
+        raise ValueError(f"Unknown attributes for '{definition.type}': {', '.join(sorted(unknown))}")
+
+    # Pydantic's ValidationError is a ValueError, so invalid values end up as an error of the item as well
+    values = attribute_model.model_validate(definition.attributes).model_dump(exclude_none=True)
+    attribute_types = {descriptor['name']: descriptor.get('type') for descriptor in asset_model.attributeDescriptors}
+
+    # Constructed without validation, OpenRemote fills in the realm of the caller when none is given
+    return AssetObjectSchema.model_construct(
+        id=definition.id,
+        name=definition.name,
+        type=definition.type,
+        parentId=definition.parentId,
+        realm=definition.realm,
+        attributes={
+            name: {"name": name, "type": attribute_types[name], "value": value} for name, value in values.items()
+        },
+    )
+
+
+def _creation_levels(assets: list[AssetDefinition]) -> tuple[list[list[int]], set[int]]:
+    """
+    Group the assets by their depth within the batch, so every level only depends on the levels before it.
+
+    Assets whose parentId chain loops within the batch can't be created and are returned separately.
+    """
+    batch_ids = {definition.id: index for index, definition in enumerate(assets) if definition.id}
+    depths: dict[int, int] = {}
+    cycle: set[int] = set()
+
+    for start in range(len(assets)):
+        chain = []
+        index = start
+
+        # Walk up to the first asset with a known depth, or one whose parent is outside the batch
+        while index is not None and index not in depths and index not in cycle:
+            if index in chain:
+                cycle.update(chain[chain.index(index):])
+                break
+
+            chain.append(index)
+            index = batch_ids.get(assets[index].parentId)
+
+        depth = depths.get(index, -1) if index is not None else -1
+
+        for index in reversed(chain):
+            if index in cycle:
+                continue
+
+            depth += 1
+            depths[index] = depth
+
+    levels = [[] for _ in range(max(depths.values(), default=-1) + 1)]
+    for index in sorted(depths):
+        levels[depths[index]].append(index)
+
+    return levels, cycle
+
+
+def compile_create_tool(asset_model) -> Tool:
+    """Build the specialized 'create_<type>' tool of an asset type, including its attribute model."""
+    asset_model_name = asset_model.assetDescriptor['name']
+
+    return Tool.from_tool(
+        create,
+        name=f"create_{asset_model_name}",
+        description=f"Create a new '{asset_model_name}' in the OpenRemote platform.",
+        transform_args={
+            'attributes': ArgTransform(
+                name='attributes',
+                description='Attributes of the asset to create.',
+                type=asset_attribute_model_factory(asset_model_name, asset_model.attributeDescriptors),
+                required=True,
+            )
+        }
+    )
+
+
+def lazy_create_tool(asset_model) -> LazyTool:
+    """Register the 'create_<type>' tool of an asset type by name only, it is compiled on first use."""
+    asset_model_name = asset_model.assetDescriptor['name']
+    compiled: Tool | None = None
+
+    def compile_tool() -> Tool:
+        nonlocal compiled
+
+        if compiled is None:
+            compiled = compile_create_tool(asset_model)
+            logger.debug(f"Compiled asset tool 'create_{asset_model_name}'")
+
+        return compiled
+
+    return LazyTool(
+        name=f"create_{asset_model_name}",
+        description=f"Create a new '{asset_model_name}' in the OpenRemote platform.",
+        compile_fn=compile_tool,
+    )
+
+
+def build_create_tool(asset_model) -> Tool:
+    if config.app_lazy_tool_compilation:
+        return lazy_create_tool(asset_model)
+
+    return compile_create_tool(asset_model)
+
+
+# Descriptor digest of every asset type that currently has a 'create_<type>' tool
+__asset_tool_digests: dict[str, str] = {}
+__reconcile_task: asyncio.Task | None = None
+
+
+def sync_asset_tools(asset_models: list) -> bool:
+    """
+    Bring the 'create_<type>' tools in line with the given asset types.
+
+    Only asset types that are new, removed or have changed descriptors are touched. Returns whether
+    any tool was added, replaced or removed.
+    """
+    latest = {asset_model.assetDescriptor['name']: asset_model for asset_model in asset_models}
+    changed = 0
+
+    for asset_model_name in set(__asset_tool_digests) - set(latest):
+        asset_mcp.remove_tool(f"create_{asset_model_name}")
+        del __asset_tool_digests[asset_model_name]
+        invalidate_asset_model_cache(asset_model_name)
+        changed += 1
+
+    for asset_model_name, asset_model in latest.items():
+        digest = asset_info_digest(asset_model)
+
+        if __asset_tool_digests.get(asset_model_name) == digest:
+            continue
+
+        with startup_profiler.phase('model generation'):
+            tool = build_create_tool(asset_model)
+
+        with startup_profiler.phase('tool registration'):
+            if asset_model_name in __asset_tool_digests:
+                asset_mcp.remove_tool(f"create_{asset_model_name}")
+
+            asset_mcp.add_tool(tool)
+
+        __asset_tool_digests[asset_model_name] = digest
+        invalidate_asset_model_cache(asset_model_name)
+        changed += 1
+
+    if changed:
+        logger.info(f"Updated {changed} of {len(latest)} asset tools.")
+        tool_registry_changed()
+
+    return changed > 0
+
+
+async def refresh_asset_tools(refresh: bool = False) -> bool:
+    """
+    Fetch the asset types from OpenRemote, update the tools that changed and snapshot the result.
+
+    With `refresh` the asset model cache is bypassed, so changes on OpenRemote show up immediately.
+    """
+    with startup_profiler.phase('asset info fetch'):
+        asset_models = await fetch_asset_infos(refresh=refresh)
+
+    changed = sync_asset_tools(asset_models.content)
+
+    if changed and config.app_asset_snapshot_path:
+        try:
+            save_asset_infos_snapshot(config.app_asset_snapshot_path, asset_models.content)
+        except OSError as e:
+            logger.warning(f"Failed to write asset model snapshot '{config.app_asset_snapshot_path}'")
+            logger.debug(e)
+
+    return changed
+
+
+async def __reconcile_loop(delay: float):
+    """Periodically check OpenRemote for new, changed or removed asset types."""
+    await asyncio.sleep(delay)
+
+    while True:
+        try:
+            await refresh_asset_tools(refresh=True)
+        except Exception as e:
+            logger.warning("Failed to reconcile asset tools with OpenRemote, keeping the current tools")
+            logger.debug(e)
+
+        if config.app_asset_reconcile_interval <= 0:
+            return
+
+        await asyncio.sleep(config.app_asset_reconcile_interval)
+
+
+async def sync_asset_index():
+    """Page through the assets of every indexed realm and apply what changed since the last sync."""
+    client = get_openremote_service().client
+
+    for realm in sorted(__asset_index.realms):
+        assets, _ = await fetch_all_assets(
+            client,
+            AssetQuerySchema(realm=RealmPredicateSchema(name=realm), select=SelectSchema(basic=True)),
+            page_size=config.app_asset_index_page_size,
+        )
+        delta = __asset_index.sync_realm(realm, assets)
+
+        if delta:
+            logger.debug(f"Asset index of realm '{realm}': {delta.added} added, {delta.changed} changed, {delta.removed} removed")
+
+
+async def __index_sync_loop():
+    """Fill the asset index and keep it in sync, queries go to OpenRemote until a realm is synced."""
+    while True:
+        try:
+            await sync_asset_index()
+        except Exception as e:
+            logger.warning("Failed to sync the asset index with OpenRemote, keeping the current index")
+            logger.debug(e)
+
+        if config.app_asset_index_sync_interval <= 0:
+            return
+
+        await asyncio.sleep(config.app_asset_index_sync_interval)
+
+
+def get_asset_index() -> AssetIndex | None:
+    return __asset_index
+
+
+async def init_asset_service(mcp: FastMCP):
+    global __reconcile_task, __asset_index, __index_sync_task
+
+    if config.app_asset_index_realms:
+        __asset_index = AssetIndex(config.app_asset_index_realms)
+        __index_sync_task = asyncio.create_task(__index_sync_loop())
 
     logger.debug("Compiling asset tools...")
 
-    # Fetch all asset types and create specialized tools for each one
-    asset_models = await openremote_service.client.asset_model.get_asset_infos()
-
-    for asset_model in asset_models.content:
-        asset_model_name = asset_model.assetDescriptor['name']
-
-        asset_mcp.add_tool(Tool.from_tool(
-            create,
-            name=f"create_{asset_model_name}",
-            description=f"Create a new '{asset_model_name}' in the OpenRemote platform.",
-            transform_args={
-                'attributes': ArgTransform(
-                    name='attributes',
-                    description='Attributes of the asset to create.',
-                    type=asset_attribute_model_factory(asset_model_name, asset_model.attributeDescriptors),
-                    required=True,
-                )
-            }
-        ))
-    logger.info(f"Compiled {len(asset_models.content)} asset tools.")
+    with startup_profiler.phase('asset info snapshot'):
+        snapshot = load_asset_infos_snapshot(config.app_asset_snapshot_path) if config.app_asset_snapshot_path else None
+
+    if snapshot is not None:
+        # Start with the asset types of the previous run and check OpenRemote for changes right away
+        sync_asset_tools(snapshot)
+        __reconcile_task = asyncio.create_task(__reconcile_loop(delay=0))
+    else:
+        # Fetch all asset types and create specialized tools for each one, this also warms the asset model cache
+        await refresh_asset_tools()
+
+        if config.app_asset_reconcile_interval > 0:
+            __reconcile_task = asyncio.create_task(__reconcile_loop(delay=config.app_asset_reconcile_interval))
+
+    # Mounted rather than imported, so tools updated later on are picked up by the app
+    with startup_profiler.phase('tool registration'):
+        mcp.mount(asset_mcp, prefix="asset")
 
-    await mcp.import_server(asset_mcp, prefix="asset")
+
+async def stop_asset_service():
+    global __reconcile_task, __asset_index, __index_sync_task
+
+    for task in (__reconcile_task, __index_sync_task):
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+    __reconcile_task = None
+    __index_sync_task = None
+    __asset_index = None
 #
 # @asset_mcp.tool
 # async def update_asset(asset_id: str, asset_object_schema: AssetObjectSchema):
@@ -170,9 +900,52 @@ async def write_attribute_value(asset_id: str, attribute_name: str, value: str |
     return await openremote_service.client.asset.write_attribute_value(asset_id, attribute_name, value)
 
 
-# @asset_mcp.tool
-# async def write_attribute_values(attribute_state_schema: AttributeStateSchema):
-#     """Write/update multiple attribute values at once. More efficient than writing individually."""
-#     openremote_service = get_openremote_service()
-#
-#     return await openremote_service.client.asset.write_attribute_values(attribute_state_schema)
+class AttributeWrite(BaseModel):
+    asset_id: str = Field(description="ID of the asset to write to.")
+    attribute_name: str = Field(description="Name of the attribute to write.")
+    value: str | int | float | bool | list | dict | None = Field(description="New value of the attribute.")
+
+
+@asset_mcp.tool
+async def write_attribute_values(writes: list[AttributeWrite]):
+    """
+    Write/update multiple attribute values at once. More efficient than writing individually.
+
+    Returns the result of every write in the same order, a write that failed has 'success' false and the reason in 'failure'.
+    """
+    openremote_service = get_openremote_service()
+    batch_size = max(1, config.app_attribute_write_batch_size)
+    results = []
+
+    for start in range(0, len(writes), batch_size):
+        batch = writes[start:start + batch_size]
+        attribute_states = [
+            {"ref": {"id": write.asset_id, "name": write.attribute_name}, "value": write.value} for write in batch
+        ]
+
+        try:
+            response = await openremote_service.client.put('/asset/attributes', json=attribute_states)
+            response.raise_for_status()
+            failures = [result.get("failure") for result in response.json()]
+        except HTTPStatusError as e:
+            failures = [f"HTTP {e.response.status_code}: {e.response.text}"] * len(batch)
+        except Exception as e:
+            # E.g. a timeout, the results of the batches before are still returned
+            failures = [str(e) or type(e).__name__] * len(batch)
+
+        # OpenRemote answers with one result per attribute state, in the order they were sent
+        if len(failures) != len(batch):
+            failures = [
+                f"Unexpected response from OpenRemote with {len(failures)} results for {len(batch)} writes, "
+                "the write may or may not have been applied"
+            ] * len(batch)
+
+        for write, failure in zip(batch, failures, strict=True):
+            results.append({
+                "asset_id": write.asset_id,
+                "attribute_name": write.attribute_name,
+                "success": failure is None,
+                "failure": failure,
+            })
+
+    return results
@@ -18,21 +18,54 @@
 from fastmcp import FastMCP
 
 from services.openremote_service import get_openremote_service
+from app.config import config
+from app.utils import StaleWhileRevalidateCache
 
 asset_model_mcp = FastMCP("Asset Model Service")
 
+# Asset models only change when the OpenRemote deployment changes, so serve them from memory
+asset_model_cache = StaleWhileRevalidateCache(
+    ttl=config.app_cache_ttl,
+    stale_ttl=config.app_cache_stale_ttl,
+    name='asset_model'
+)
+
+
+async def fetch_asset_infos(refresh: bool = False):
+    """Retrieve the asset infos of all asset types through the asset model cache."""
+    openremote_service = get_openremote_service()
+
+    if refresh:
+        asset_model_cache.invalidate("asset_infos")
+
+    return await asset_model_cache.get("asset_infos", openremote_service.client.asset_model.get_asset_infos)
+
+
+async def fetch_asset_info(asset_type: str):
+    """Retrieve the asset info of a single asset type through the asset model cache."""
+    openremote_service = get_openremote_service()
+
+    return await asset_model_cache.get(
+        ("asset_info", asset_type),
+        lambda: openremote_service.client.asset_model.get_asset_info(asset_type)
+    )
+
+
+def invalidate_asset_model_cache(asset_type: str | None = None):
+    """Drop the cached asset model responses of a single asset type, or all of them when no type is given."""
+    if asset_type is None:
+        asset_model_cache.invalidate()
+    else:
+        asset_model_cache.invalidate(("asset_info", asset_type))
+
 
 @asset_model_mcp.tool
 async def get_all_types():
     """Retrieve the asset type information of each available asset type"""
-    openremote_service = get_openremote_service()
-
-    return await openremote_service.client.asset_model.get_asset_infos()
+    return await fetch_asset_infos()
 
 
 @asset_model_mcp.tool
 async def get_type(asset_type: str):
     """Retrieve the asset type information of an asset type"""
-    openremote_service = get_openremote_service()
-
-    return await openremote_service.client.asset_model.get_asset_info(asset_type)
\ No newline at end of file
+    return await fetch_asset_info(asset_type)
@@ -0,0 +1,131 @@
+# Copyright 2025, OpenRemote Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+import asyncio
+import logging
+import signal
+from contextlib import asynccontextmanager
+from typing import Any, Callable
+
+from sse_starlette.sse import AppStatus
+
+from .config import config
+
+logger = logging.getLogger("uvicorn")
+
+
+class GracefulShutdown:
+    """
+    Drains the server before it stops.
+
+    Once draining, new MCP sessions are turned away and requests in flight get up to `timeout` seconds
+    to finish. After that, the streams that are still open are closed, so uvicorn doesn't wait on them.
+    """
+
+    def __init__(self, timeout: float):
+        self.timeout = timeout
+        self.in_flight = 0
+        self.draining = False
+        self.__idle = asyncio.Event()
+        self.__idle.set()
+        self.__listeners: list[Callable[[], Any]] = []
+        self.__drain_task: asyncio.Task | None = None
+
+    def add_listener(self, listener: Callable[[], Any]):
+        """Call `listener` as soon as draining begins."""
+        self.__listeners.append(listener)
+
+    @asynccontextmanager
+    async def request(self):
+        """Count a request as in flight for as long as the context is open."""
+        self.in_flight += 1
+        self.__idle.clear()
+
+        try:
+            yield
+        finally:
+            self.in_flight -= 1
+            if self.in_flight == 0:
+                self.__idle.set()
+
+    def begin(self):
+        if self.__drain_task is not None:
+            return
+
+        logger.info(f"Draining, waiting up to {self.timeout} seconds for {self.in_flight} requests in flight")
+
+        self.draining = True
+        self.__drain_task = asyncio.create_task(self.__drain())
+
+        for listener in self.__listeners:
+            listener()
+
+    async def drain(self) -> bool:
+        """Drain the server and return whether every request in flight finished in time."""
+        self.begin()
+
+        return await asyncio.shield(self.__drain_task)
+
+    async def __drain(self) -> bool:
+        try:
+            await asyncio.wait_for(self.__idle.wait(), self.timeout)
+            drained = True
+        except TimeoutError:
+            logger.warning(f"Closing {self.in_flight} requests still in flight after {self.timeout} seconds")
+            drained = False
+
+        # Closes every SSE stream, the notification streams as well as tool calls that didn't finish in time
+        AppStatus.should_exit = True
+
+        return drained
+
+    def install_signal_handlers(self):
+        """
+        Begin draining as soon as uvicorn is told to stop.
+
+        Uvicorn waits for all open connections before it shuts the app down, and by default every SSE stream
+        is closed right away on the signal, including the responses of tool calls still running. Here the
+        streams are closed once draining is over instead.
+        """
+        loop = asyncio.get_running_loop()
+        installed = False
+
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            previous = signal.getsignal(sig)
+
+            # Only chain onto a handler of uvicorn, never replace the default behaviour
+            if not callable(previous):
+                continue
+
+            def handle(signum, frame, previous=previous):
+                loop.call_soon_threadsafe(self.begin)
+                previous(signum, frame)
+
+            try:
+                signal.signal(sig, handle)
+            except ValueError:
+                # Not the main thread, e.g. when uvicorn runs in a thread of its own
+                return
+
+            installed = True
+
+        if installed:
+            AppStatus.disable_automatic_graceful_drain()
+            AppStatus.should_exit = False
+
+
+graceful_shutdown = GracefulShutdown(timeout=config.app_shutdown_drain_timeout)
@@ -0,0 +1,96 @@
+# Copyright 2025, OpenRemote Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+# Only the standard library, this module is imported before anything else to time the other imports
+import json
+import logging
+import os
+import time
+from contextlib import contextmanager
+
+logger = logging.getLogger("uvicorn")
+
+
+class StartupProfiler:
+    """
+    Phase-by-phase timing of the server startup.
+
+    Phases are timed with `phase()`, which can be entered multiple times to add up, e.g. once per asset
+    type. `mark()` attributes the time since the previous mark, minus the phases timed in between, to a
+    phase, which is how the imports are timed. Nothing is recorded after `finish()`.
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.finished: float | None = None
+        self.phases: dict[str, float] = {}
+        self.__checkpoint = self.started
+        self.__timed_since_checkpoint = 0.0
+
+    @contextmanager
+    def phase(self, name: str):
+        if self.finished is not None:
+            yield
+            return
+
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            duration = time.perf_counter() - started
+            self.phases[name] = self.phases.get(name, 0.0) + duration
+            self.__timed_since_checkpoint += duration
+
+    def mark(self, name: str):
+        if self.finished is not None:
+            return
+
+        now = time.perf_counter()
+        self.phases[name] = self.phases.get(name, 0.0) + now - self.__checkpoint - self.__timed_since_checkpoint
+        self.__checkpoint = now
+        self.__timed_since_checkpoint = 0.0
+
+    def finish(self):
+        if self.finished is None:
+            self.finished = time.perf_counter()
+
+    def report(self) -> dict:
+        total = (self.finished or time.perf_counter()) - self.started
+
+        return {
+            "total_ms": round(total * 1000, 2),
+            "phases": {name: round(duration * 1000, 2) for name, duration in self.phases.items()},
+        }
+
+    def log_report(self, path: str | None = None):
+        """Log the phase timings and, with a path, write them to a JSON file as well."""
+        report = self.report()
+
+        lines = [f"  {name:<24}{duration:>10.1f} ms" for name, duration in report["phases"].items()]
+        logger.info("Startup profile:\n" + "\n".join(lines) + f"\n  {'total':<24}{report['total_ms']:>10.1f} ms")
+
+        if path:
+            try:
+                os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+                with open(path, "w", encoding="utf-8") as f:
+                    json.dump(report, f, indent=2)
+            except OSError as e:
+                logger.warning(f"Failed to write startup profile '{path}'")
+                logger.debug(e)
+
+
+startup_profiler = StartupProfiler()
@@ -0,0 +1,41 @@
+# Copyright 2025, OpenRemote Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+
+import logging
+
+from fastmcp import FastMCP
+
+from .config import config
+from .middleware import TracingMiddleware
+from .utils.tracing import tracer, load_exporter
+
+logger = logging.getLogger("uvicorn")
+
+
+def init_tracing(mcp: FastMCP):
+    if not config.app_tracing_exporter:
+        return
+
+    try:
+        tracer.add_exporter(load_exporter(config.app_tracing_exporter, config.app_tracing_jsonl_path))
+    except Exception as e:
+        logger.error(f"Failed to load span exporter '{config.app_tracing_exporter}', tracing is disabled")
+        logger.debug(e)
+        return
+
+    mcp.add_middleware(TracingMiddleware())
@@ -16,3 +16,13 @@
 # SPDX-License-Identifier: AGPL-3.0-or-later
 
 from .asset_attribute_model import asset_attribute_model_factory
+from .cache import StaleWhileRevalidateCache
+from .tool_registry import get_tool_registry_version, tool_registry_changed, add_tool_registry_listener
+from .lazy_tool import LazyTool
+from .asset_snapshot import asset_info_digest, asset_infos_digest, save_asset_infos_snapshot, load_asset_infos_snapshot
+from .pagination import encode_cursor, decode_cursor
+from .projection import AssetProjection, parse_projection, PROJECTION_DESCRIPTION
+from .asset_index import AssetIndex, AssetIndexDelta
+from .asset_tree import build_asset_tree
+from .metrics import metrics_registry, MetricsRegistry, Counter, Gauge, Histogram
+from .tracing import tracer, Span, SpanExporter, JsonLinesExporter, instrument_tools
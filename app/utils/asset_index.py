@@ -0,0 +1,193 @@
+# Copyright 2025, OpenRemote Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+import itertools
+import time
+from dataclasses import dataclass
+
+from openremote_client.schemas import AssetObjectSchema, AssetQuerySchema, StringPredicateSchema
+
+# Fields of an asset query the index evaluates itself, besides paging
+INDEXED_PREDICATES = frozenset({'ids', 'types', 'realm', 'parents', 'names'})
+
+# Fields that don't change which assets match
+NEUTRAL_FIELDS = frozenset({'select', 'orderBy', 'limit', 'offset'})
+
+
+@dataclass(frozen=True)
+class AssetIndexDelta:
+    added: int = 0
+    changed: int = 0
+    removed: int = 0
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.changed or self.removed)
+
+
+class AssetIndex:
+    """
+    In-memory index of the assets of some realms, without their attributes.
+
+    Assets are looked up by id, type, realm and parent, so queries that only filter on those (and on names)
+    are answered without OpenRemote. Results are in the order the assets were created, like the queries
+    ordered by 'CREATED_ON'. A realm is only used once it has been synced.
+    """
+
+    def __init__(self, realms: list[str]):
+        self.realms = frozenset(realms)
+        self.synced_at: dict[str, float] = {}
+        self.__assets: dict[str, AssetObjectSchema] = {}
+        self.__order: dict[str, int] = {}
+        self.__sequence = itertools.count()
+        self.__by_type: dict[str | None, set[str]] = {}
+        self.__by_realm: dict[str, set[str]] = {}
+        self.__by_parent: dict[str | None, set[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self.__assets)
+
+    def get(self, asset_id: str) -> AssetObjectSchema | None:
+        return self.__assets.get(asset_id)
+
+    def put(self, asset: AssetObjectSchema):
+        """Add or replace a single asset, e.g. one that was just created."""
+        if asset.realm not in self.realms or asset.id is None:
+            return
+
+        if asset.id in self.__assets:
+            self.__unlink(self.__assets[asset.id])
+        else:
+            self.__order[asset.id] = next(self.__sequence)
+
+        asset = asset.model_copy(update={'attributes': None}) if asset.attributes is not None else asset
+        self.__assets[asset.id] = asset
+        self.__by_type.setdefault(asset.type, set()).add(asset.id)
+        self.__by_realm.setdefault(asset.realm, set()).add(asset.id)
+        self.__by_parent.setdefault(asset.parentId, set()).add(asset.id)
+
+    def remove(self, asset_id: str):
+        asset = self.__assets.pop(asset_id, None)
+
+        if asset is not None:
+            self.__unlink(asset)
+            del self.__order[asset_id]
+
+    def sync_realm(self, realm: str, assets: list[AssetObjectSchema]) -> AssetIndexDelta:
+        """Bring a realm in line with a complete listing of its assets, only touching assets that differ."""
+        listed = {asset.id for asset in assets}
+        removed = self.__by_realm.get(realm, set()) - listed
+        added = changed = 0
+
+        for asset_id in removed:
+            self.remove(asset_id)
+
+        for asset in assets:
+            current = self.__assets.get(asset.id)
+
+            if current is None:
+                added += 1
+            elif _same_version(current, asset):
+                continue
+            else:
+                changed += 1
+
+            self.put(asset)
+
+        self.synced_at[realm] = time.time()
+
+        return AssetIndexDelta(added=added, changed=changed, removed=len(removed))
+
+    def supports(self, query: AssetQuerySchema) -> bool:
+        """Whether the index can answer the query, i.e. it only uses indexed predicates on a synced realm."""
+        used = {name for name in query.model_fields_set if getattr(query, name) is not None}
+
+        if used - INDEXED_PREDICATES - NEUTRAL_FIELDS:
+            return False
+
+        if query.realm is None or query.realm.name not in self.synced_at:
+            return False
+
+        if query.select is not None and query.select.basic is not True:
+            return False
+
+        if query.orderBy is not None and query.orderBy.property not in (None, 'CREATED_ON'):
+            return False
+
+        return all(_supported_name(predicate) for predicate in query.names or [])
+
+    def evaluate(self, query: AssetQuerySchema) -> list[AssetObjectSchema]:
+        """The assets matching a query the index supports, with its ordering, offset and limit applied."""
+        candidates = set(self.__by_realm.get(query.realm.name, set()))
+
+        if query.ids is not None:
+            candidates.intersection_update(query.ids)
+        if query.types is not None:
+            candidates.intersection_update(_union(self.__by_type, query.types))
+        if query.parents is not None:
+            candidates.intersection_update(_union(self.__by_parent, [parent.id for parent in query.parents]))
+
+        matches = [self.__assets[asset_id] for asset_id in candidates]
+
+        if query.names:
+            matches = [asset for asset in matches if any(_name_matches(p, asset.name) for p in query.names)]
+
+        matches.sort(key=lambda asset: self.__order[asset.id], reverse=bool(query.orderBy and query.orderBy.descending))
+
+        offset = query.offset or 0
+        return matches[offset:offset + query.limit] if query.limit else matches[offset:]
+
+    def stats(self) -> dict:
+        return {"assets": len(self.__assets), "synced_at": dict(self.synced_at)}
+
+    def __unlink(self, asset: AssetObjectSchema):
+        self.__by_type.get(asset.type, set()).discard(asset.id)
+        self.__by_realm.get(asset.realm, set()).discard(asset.id)
+        self.__by_parent.get(asset.parentId, set()).discard(asset.id)
+
+
+def _union(index: dict, keys: list) -> set[str]:
+    return set().union(*(index.get(key, set()) for key in keys))
+
+
+def _same_version(current: AssetObjectSchema, listed: AssetObjectSchema) -> bool:
+    if current.version is not None and listed.version is not None:
+        return current.version == listed.version
+
+    return current == listed
+
+
+def _supported_name(predicate: StringPredicateSchema) -> bool:
+    return predicate.value is not None and predicate.match_ in (None, 'EXACT', 'BEGIN', 'END', 'CONTAINS')
+
+
+def _name_matches(predicate: StringPredicateSchema, name: str) -> bool:
+    value = predicate.value
+
+    # OpenRemote compares case sensitive unless told otherwise
+    if predicate.caseSensitive is False:
+        value, name = value.lower(), name.lower()
+
+    if predicate.match_ == 'BEGIN':
+        matched = name.startswith(value)
+    elif predicate.match_ == 'END':
+        matched = name.endswith(value)
+    elif predicate.match_ == 'CONTAINS':
+        matched = value in name
+    else:
+        matched = name == value
+
+    return matched != bool(predicate.negate)
@@ -0,0 +1,101 @@
+# Copyright 2025, OpenRemote Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+
+import hashlib
+import json
+import logging
+import os
+import time
+from pathlib import Path
+from typing import Any
+
+from openremote_client.schemas import AssetTypeInfoSchema
+from pydantic import BaseModel
+
+logger = logging.getLogger("uvicorn")
+
+# Bump when the layout of the snapshot file changes, older snapshots are ignored
+SNAPSHOT_FORMAT_VERSION = 1
+
+
+def dump_asset_info(asset_info: AssetTypeInfoSchema | dict) -> dict:
+    if isinstance(asset_info, BaseModel):
+        return asset_info.model_dump(mode='json', warnings=False, exclude_unset=True)
+
+    return asset_info
+
+
+def asset_info_digest(asset_info: AssetTypeInfoSchema | dict) -> str:
+    """Content hash of a single asset type, changes whenever its descriptors change."""
+    return _digest(dump_asset_info(asset_info))
+
+
+def asset_infos_digest(asset_infos: list[AssetTypeInfoSchema | dict]) -> str:
+    """Content hash of all asset types."""
+    return _digest([dump_asset_info(asset_info) for asset_info in asset_infos])
+
+
+def _digest(value: Any) -> str:
+    return hashlib.sha256(json.dumps(value, sort_keys=True, separators=(',', ':')).encode()).hexdigest()
+
+
+def save_asset_infos_snapshot(path: str | Path, asset_infos: list[AssetTypeInfoSchema | dict]) -> str:
+    """Persist the asset infos so the next start can build its tools without waiting for OpenRemote."""
+    path = Path(path)
+    dumped = [dump_asset_info(asset_info) for asset_info in asset_infos]
+    digest = _digest(dumped)
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    # Write to a temporary file first so a crash never leaves a half written snapshot behind, one per
+    # process as every worker of `uvicorn --workers` writes the snapshot
+    temporary_path = path.with_suffix(f'{path.suffix}.{os.getpid()}.tmp')
+    temporary_path.write_text(json.dumps({
+        "format_version": SNAPSHOT_FORMAT_VERSION,
+        "digest": digest,
+        "created_at": time.time(),
+        "asset_infos": dumped,
+    }))
+    os.replace(temporary_path, path)
+
+    return digest
+
+
+def load_asset_infos_snapshot(path: str | Path) -> list[AssetTypeInfoSchema] | None:
+    """Load a snapshot written by `save_asset_infos_snapshot`, returns None if it is missing or unusable."""
+    path = Path(path)
+
+    if not path.is_file():
+        return None
+
+    try:
+        snapshot = json.loads(path.read_text())
+
+        if snapshot.get("format_version") != SNAPSHOT_FORMAT_VERSION:
+            logger.info(f"Ignoring asset model snapshot '{path}' with an outdated format")
+            return None
+
+        if _digest(snapshot["asset_infos"]) != snapshot["digest"]:
+            logger.warning(f"Ignoring corrupt asset model snapshot '{path}'")
+            return None
+
+        return [AssetTypeInfoSchema.model_construct(**asset_info) for asset_info in snapshot["asset_infos"]]
+    except (OSError, ValueError, KeyError, TypeError) as e:
+        logger.warning(f"Failed to load asset model snapshot '{path}'")
+        logger.debug(e)
+        return None
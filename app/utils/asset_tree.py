@@ -0,0 +1,61 @@
+# Copyright 2025, OpenRemote Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+from collections import deque
+
+from openremote_client.schemas import AssetObjectSchema
+
+
+def build_asset_tree(
+        assets: list[AssetObjectSchema],
+        root_ids: list[str] | None = None,
+        max_depth: int | None = None,
+) -> list[dict]:
+    """
+    Nest assets under their parents, in a single pass over the assets.
+
+    Without `root_ids`, every asset whose parent isn't among the assets is a root. Children keep the order of
+    `assets`. Nodes at `max_depth` (the roots are at depth 0) list how many children they have, instead of
+    the children themselves.
+    """
+    nodes = {asset.id: {"id": asset.id, "name": asset.name, "type": asset.type} for asset in assets}
+    children: dict[str | None, list[str]] = {}
+
+    for asset in assets:
+        children.setdefault(asset.parentId, []).append(asset.id)
+
+    if root_ids is None:
+        root_ids = [asset.id for asset in assets if asset.parentId is None or asset.parentId not in nodes]
+
+    queue = deque((root_id, 0) for root_id in root_ids)
+
+    # Breadth first rather than recursive, so deep hierarchies don't hit the recursion limit
+    while queue:
+        asset_id, depth = queue.popleft()
+        child_ids = children.get(asset_id)
+
+        if not child_ids:
+            continue
+
+        if max_depth is not None and depth >= max_depth:
+            nodes[asset_id]["children_count"] = len(child_ids)
+            continue
+
+        nodes[asset_id]["children"] = [nodes[child_id] for child_id in child_ids]
+        queue.extend((child_id, depth + 1) for child_id in child_ids)
+
+    return [nodes[root_id] for root_id in root_ids if root_id in nodes]
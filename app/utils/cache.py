@@ -0,0 +1,121 @@
+# Copyright 2025, OpenRemote Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Hashable
+
+from .metrics import cache_requests_total, cache_hit_ratio
+
+logger = logging.getLogger("uvicorn")
+
+
+@dataclass
+class CacheEntry:
+    value: Any
+    fetched_at: float
+
+
+class StaleWhileRevalidateCache:
+    """
+    Keyed async cache in front of slow upstream calls.
+
+    Entries are served as-is for `ttl` seconds. After that they are still served for up to
+    `stale_ttl` more seconds while a single background task refreshes them. Only entries older
+    than `ttl + stale_ttl` (or missing ones) make the caller wait for the loader.
+
+    Lookups are counted in the cache metrics under `name`.
+    """
+
+    def __init__(self, ttl: float, stale_ttl: float = 0, name: str = 'default'):
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.name = name
+        self.__lookups = {'hit': 0, 'stale': 0, 'miss': 0}
+        self.__entries: dict[Hashable, CacheEntry] = {}
+        self.__loading: dict[Hashable, asyncio.Task] = {}
+
+    async def get(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> Any:
+        entry = self.__entries.get(key)
+
+        if entry is not None:
+            age = time.monotonic() - entry.fetched_at
+
+            if age < self.ttl:
+                self.__record('hit')
+                return entry.value
+
+            if age < self.ttl + self.stale_ttl:
+                self.__record('stale')
+                self.__load(key, loader)
+                return entry.value
+
+        self.__record('miss')
+
+        # Concurrent misses for the same key share a single load
+        return await asyncio.shield(self.__load(key, loader))
+
+    def invalidate(self, key: Hashable | None = None):
+        """Drop a single entry, or every entry when no key is given, and detach loads that are in flight."""
+        # A detached load still answers its waiting callers, but the next miss starts a new load
+        if key is None:
+            self.__entries.clear()
+            self.__loading.clear()
+        else:
+            self.__entries.pop(key, None)
+            self.__loading.pop(key, None)
+
+    def __record(self, result: str):
+        self.__lookups[result] += 1
+        cache_requests_total.inc(cache=self.name, result=result)
+        cache_hit_ratio.set(1 - self.__lookups['miss'] / sum(self.__lookups.values()), cache=self.name)
+
+    def __load(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> asyncio.Task:
+        task = self.__loading.get(key)
+
+        if task is None:
+            task = asyncio.create_task(self.__run_loader(key, loader))
+            self.__loading[key] = task
+
+        return task
+
+    async def __run_loader(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> Any:
+        task = asyncio.current_task()
+        stale = self.__entries.get(key)
+
+        try:
+            value = await loader()
+        except Exception as e:
+            if stale is not None:
+                # Keep serving the stale entry, the next request past the TTL retries
+                logger.warning(f"Failed to refresh cache entry {key!r}, serving stale value")
+                logger.debug(e)
+                return stale.value
+            raise
+        finally:
+            # An invalidation while loading detached this load, so its value may already be outdated
+            current = self.__loading.get(key) is task
+
+            if current:
+                del self.__loading[key]
+
+        if current:
+            self.__entries[key] = CacheEntry(value=value, fetched_at=time.monotonic())
+
+        return value
@@ -0,0 +1,51 @@
+# Copyright 2025, OpenRemote Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+
+import threading
+from typing import Annotated, Any, Callable
+
+from fastmcp.tools import Tool
+from fastmcp.tools.tool import ToolResult
+from mcp.types import Tool as MCPTool
+from pydantic import Field
+
+# Compiled one at a time, so a compile off the event loop (e.g. in `asyncio.to_thread`) can't race one on it
+# and build the same tool twice
+_compile_lock = threading.RLock()
+
+
+class LazyTool(Tool):
+    """
+    Tool that is registered with only its name and description.
+
+    The real tool (and with it the parameter schema) is built by `compile_fn` the first time a client
+    lists the tool details or calls it. `compile_fn` is expected to memoize its result, copies of this
+    tool (e.g. when a server is imported with a prefix) share it.
+    """
+    parameters: dict[str, Any] = Field(default_factory=lambda: {"type": "object", "properties": {}})
+    compile_fn: Annotated[Callable[[], Tool], Field(exclude=True)]
+
+    def compile(self) -> Tool:
+        with _compile_lock:
+            return self.compile_fn()
+
+    def to_mcp_tool(self, *, include_fastmcp_meta: bool | None = None, **overrides: Any) -> MCPTool:
+        return self.compile().to_mcp_tool(include_fastmcp_meta=include_fastmcp_meta, **{"name": self.name, **overrides})
+
+    async def run(self, arguments: dict[str, Any]) -> ToolResult:
+        return await self.compile().run(arguments)
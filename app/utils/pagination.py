@@ -0,0 +1,49 @@
+# Copyright 2025, OpenRemote Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+import base64
+import hashlib
+import json
+
+from pydantic import BaseModel
+
+
+def query_fingerprint(query: BaseModel) -> str:
+    """Hash of a query without its paging fields, so a cursor can only continue the query it came from."""
+    dumped = query.model_dump(mode='json', exclude={'limit', 'offset'})
+
+    return hashlib.sha256(json.dumps(dumped, sort_keys=True).encode()).hexdigest()[:16]
+
+
+def encode_cursor(query: BaseModel, offset: int) -> str:
+    payload = json.dumps({"q": query_fingerprint(query), "o": offset}, separators=(',', ':'))
+
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+def decode_cursor(query: BaseModel, cursor: str) -> int:
+    """Returns the offset stored in the cursor, raises ValueError if it is invalid or belongs to another query."""
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+        fingerprint, offset = payload["q"], int(payload["o"])
+    except (ValueError, KeyError, TypeError) as e:
+        raise ValueError("Invalid cursor") from e
+
+    if fingerprint != query_fingerprint(query) or offset < 0:
+        raise ValueError("Cursor does not belong to this query")
+
+    return offset
@@ -0,0 +1,98 @@
+# Copyright 2025, OpenRemote Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+
+from dataclasses import dataclass
+from typing import Any
+
+from openremote_client.schemas import AssetObjectSchema
+from pydantic import BaseModel
+
+ASSET_FIELDS = frozenset(AssetObjectSchema.model_fields)
+
+# Enough to identify assets and walk the hierarchy, without any attributes
+SUMMARY_FIELDS = ('id', 'name', 'type', 'parentId', 'realm')
+
+PROJECTION_DESCRIPTION = (
+    "Only return these fields of each asset, e.g. ['id', 'name', 'attributes.temperature']. "
+    f"Top-level fields are {', '.join(sorted(ASSET_FIELDS))}. "
+    "Use 'attributes.<name>' for the value of a single attribute, or 'attributes' for all attribute values. "
+    f"'summary' is short for {', '.join(SUMMARY_FIELDS)}. Leave empty to get the full assets."
+)
+
+
+@dataclass(frozen=True)
+class AssetProjection:
+    """Selection of asset fields, attributes are reduced to their value."""
+    fields: tuple[str, ...]
+    attributes: tuple[str, ...] = ()
+    all_attributes: bool = False
+
+    @property
+    def needs_attributes(self) -> bool:
+        return self.all_attributes or bool(self.attributes)
+
+    def apply(self, asset: AssetObjectSchema | dict) -> dict:
+        data = asset if isinstance(asset, dict) else dict(asset)
+        projected = {name: data.get(name) for name in self.fields}
+
+        if self.needs_attributes:
+            attributes = data.get('attributes') or {}
+            names = attributes.keys() if self.all_attributes else self.attributes
+            projected['attributes'] = {
+                name: _attribute_value(attributes[name]) for name in names if name in attributes
+            }
+
+        return projected
+
+
+def _attribute_value(attribute: Any) -> Any:
+    if isinstance(attribute, BaseModel):
+        return getattr(attribute, 'value', None)
+
+    if isinstance(attribute, dict):
+        return attribute.get('value')
+
+    return attribute
+
+
+def parse_projection(fields: list[str] | None) -> AssetProjection | None:
+    """Returns None when the full assets are wanted, raises ValueError on unknown fields."""
+    if not fields:
+        return None
+
+    selected: list[str] = []
+    attributes: list[str] = []
+    all_attributes = False
+
+    for field in fields:
+        if field == 'summary':
+            selected.extend(SUMMARY_FIELDS)
+        elif field == 'attributes':
+            all_attributes = True
+        elif field.startswith('attributes.'):
+            attributes.append(field.removeprefix('attributes.'))
+        elif field in ASSET_FIELDS:
+            selected.append(field)
+        else:
+            raise ValueError(f"Unknown asset field '{field}'")
+
+    return AssetProjection(
+        fields=tuple(dict.fromkeys(selected)),
+        attributes=tuple(dict.fromkeys(attributes)),
+        all_attributes=all_attributes,
+    )
@@ -0,0 +1,44 @@
+# Copyright 2025, OpenRemote Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+
+from typing import Callable
+
+__tool_registry_version: int = 0
+__tool_registry_listeners: list[Callable[[], None]] = []
+
+
+def get_tool_registry_version() -> int:
+    """Version of the registered tool set, changes every time tools are added, replaced or removed."""
+    return __tool_registry_version
+
+
+def tool_registry_changed() -> int:
+    """Mark the registered tool set as changed so everything derived from it gets rebuilt."""
+    global __tool_registry_version
+
+    __tool_registry_version += 1
+
+    for listener in __tool_registry_listeners:
+        listener()
+
+    return __tool_registry_version
+
+
+def add_tool_registry_listener(listener: Callable[[], None]):
+    """Call `listener` every time the registered tool set changes."""
+    __tool_registry_listeners.append(listener)
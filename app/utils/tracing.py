@@ -0,0 +1,269 @@
+# Copyright 2025, OpenRemote Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+
+import contextvars
+import functools
+import importlib
+import inspect
+import json
+import logging
+import os
+import queue
+import re
+import secrets
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field, asdict
+from typing import Any, Iterator
+
+from fastmcp import FastMCP
+from fastmcp.tools import FunctionTool
+
+logger = logging.getLogger("uvicorn")
+
+TRACEPARENT_PATTERN = re.compile(r'^00-([0-9a-f]{32})-([0-9a-f]{16})-([0-9a-f]{2})$')
+
+
+@dataclass
+class Span:
+    name: str
+    trace_id: str
+    span_id: str = field(default_factory=lambda: secrets.token_hex(8))
+    parent_id: str | None = None
+    start_time: float = field(default_factory=time.time)
+    end_time: float | None = None
+    attributes: dict[str, Any] = field(default_factory=dict)
+    status: str = 'ok'
+    error: str | None = None
+
+    @property
+    def traceparent(self) -> str:
+        """W3C trace context header, so the next service continues this trace."""
+        return f"00-{self.trace_id}-{self.span_id}-01"
+
+    def child(self, name: str, **attributes) -> 'Span':
+        return Span(name=name, trace_id=self.trace_id, parent_id=self.span_id, attributes=attributes)
+
+    def to_dict(self) -> dict[str, Any]:
+        data = asdict(self)
+        data["duration_ms"] = round(((self.end_time or self.start_time) - self.start_time) * 1000, 3)
+
+        return data
+
+
+def parse_traceparent(traceparent: str | None) -> tuple[str, str] | None:
+    """Returns the trace id and parent span id of a W3C `traceparent` header, or None if it is invalid."""
+    match = TRACEPARENT_PATTERN.match((traceparent or '').strip().lower())
+
+    if match is None or match.group(1) == '0' * 32 or match.group(2) == '0' * 16:
+        return None
+
+    return match.group(1), match.group(2)
+
+
+class SpanExporter:
+    """Receives every finished span, subclass it to send spans elsewhere."""
+
+    def export(self, span: Span):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+class JsonLinesExporter(SpanExporter):
+    """
+    Appends every span as a line of JSON to a file, for analysis after the fact.
+
+    Spans are written by a background thread, in batches of whatever finished since its last write, so
+    requests never wait for the disk. `close` writes the spans that are still waiting.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self.__file = open(path, 'a', encoding='utf-8')
+        self.__pending: queue.SimpleQueue[dict | None] = queue.SimpleQueue()
+        self.__writer = threading.Thread(target=self.__write, name='span-writer', daemon=True)
+        self.__writer.start()
+
+    def export(self, span: Span):
+        self.__pending.put(span.to_dict())
+
+    def close(self):
+        self.__pending.put(None)
+        self.__writer.join()
+        self.__file.close()
+
+    def __write(self):
+        closing = False
+
+        while not closing:
+            batch = [self.__pending.get()]
+
+            try:
+                while batch[-1] is not None:
+                    batch.append(self.__pending.get_nowait())
+            except queue.Empty:
+                pass
+
+            if batch[-1] is None:
+                closing = True
+                batch.pop()
+
+            try:
+                self.__file.writelines(json.dumps(span, default=repr) + "\n" for span in batch)
+                self.__file.flush()
+            except Exception as e:
+                logger.debug(f"Failed to write {len(batch)} spans to '{self.path}': {e}")
+
+
+class Tracer:
+    """Creates spans and hands finished spans to the exporters, spans are skipped without any exporter."""
+
+    def __init__(self):
+        self.exporters: list[SpanExporter] = []
+        self.__current: contextvars.ContextVar[Span | None] = contextvars.ContextVar('current_span', default=None)
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.exporters)
+
+    @property
+    def current_span(self) -> Span | None:
+        return self.__current.get()
+
+    def add_exporter(self, exporter: SpanExporter):
+        self.exporters.append(exporter)
+
+    def shutdown(self):
+        for exporter in self.exporters:
+            exporter.close()
+        self.exporters.clear()
+
+    @contextmanager
+    def span(self, name: str, traceparent: str | None = None, **attributes) -> Iterator[Span | None]:
+        """
+        Runs the block in a new span, a child of the current span. Without a current span a new trace
+        is started, or the trace of the given `traceparent` header is continued.
+        """
+        if not self.enabled:
+            yield None
+            return
+
+        parent = self.current_span
+        if parent is not None:
+            span = parent.child(name, **attributes)
+        elif (remote := parse_traceparent(traceparent)) is not None:
+            span = Span(name=name, trace_id=remote[0], parent_id=remote[1], attributes=attributes)
+        else:
+            span = Span(name=name, trace_id=secrets.token_hex(16), attributes=attributes)
+
+        token = self.__current.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.status = 'error'
+            span.error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            self.__current.reset(token)
+            self.export(span)
+
+    def record(self, parent: Span, name: str, start_time: float, end_time: float, **attributes):
+        """Export a span of something that was measured without running it in a span."""
+        span = parent.child(name, **attributes)
+        span.start_time = start_time
+        span.end_time = end_time
+        self.export(span)
+
+    def export(self, span: Span):
+        if span.end_time is None:
+            span.end_time = time.time()
+
+        for exporter in self.exporters:
+            try:
+                exporter.export(span)
+            except Exception as e:
+                logger.debug(f"Failed to export span '{span.name}': {e}")
+
+
+tracer = Tracer()
+
+
+def load_exporter(name: str, jsonl_path: str) -> SpanExporter:
+    """The built-in 'jsonl' exporter, or the SpanExporter class at an import path like 'package.module:Exporter'."""
+    if name == 'jsonl':
+        return JsonLinesExporter(jsonl_path)
+
+    module_name, _, attribute = name.partition(':')
+    if not attribute:
+        raise ValueError(f"Unknown span exporter '{name}', use 'jsonl' or 'package.module:Exporter'")
+
+    return getattr(importlib.import_module(module_name), attribute)()
+
+
+@dataclass
+class ToolTiming:
+    """Moments within a tool call, to tell argument validation and result serialization apart from the tool itself."""
+    started: float
+    fn_started: float | None = None
+    fn_finished: float | None = None
+
+
+current_tool_timing: contextvars.ContextVar[ToolTiming | None] = contextvars.ContextVar('current_tool_timing', default=None)
+
+
+async def instrument_tools(server: FastMCP):
+    """Run the functions of the tools of a server in an 'execute' span, marking where validation ends."""
+    for tool in (await server.get_tools()).values():
+        if isinstance(tool, FunctionTool) and not getattr(tool.fn, '__traced__', False):
+            tool.fn = _traced_function(tool.fn)
+
+
+def _traced_function(fn):
+    if inspect.iscoroutinefunction(fn):
+        @functools.wraps(fn)
+        async def traced(*args, **kwargs):
+            timing = current_tool_timing.get()
+            if timing is not None:
+                timing.fn_started = time.time()
+
+            try:
+                with tracer.span("execute"):
+                    return await fn(*args, **kwargs)
+            finally:
+                if timing is not None:
+                    timing.fn_finished = time.time()
+    else:
+        @functools.wraps(fn)
+        def traced(*args, **kwargs):
+            timing = current_tool_timing.get()
+            if timing is not None:
+                timing.fn_started = time.time()
+
+            try:
+                with tracer.span("execute"):
+                    return fn(*args, **kwargs)
+            finally:
+                if timing is not None:
+                    timing.fn_finished = time.time()
+
+    traced.__traced__ = True
+    return traced
@@ -0,0 +1,361 @@
+# Copyright 2025, OpenRemote Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+import asyncio
+import json
+import logging
+import random
+import ssl
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Iterable
+from urllib.parse import urlencode, urlsplit
+
+import websockets
+from openremote_client.authenticator import Authenticator
+from openremote_client.url_builder import UrlBuilder
+
+logger = logging.getLogger("uvicorn")
+
+# Message prefixes of the OpenRemote event protocol, a prefix followed by a JSON body
+SUBSCRIBE_PREFIX = "SUBSCRIBE:"
+SUBSCRIBED_PREFIX = "SUBSCRIBED:"
+UNAUTHORIZED_PREFIX = "UNAUTHORIZED:"
+TRIGGERED_PREFIX = "TRIGGERED:"
+EVENT_PREFIX = "EVENT:"
+
+
+@dataclass(frozen=True)
+class AttributeValue:
+    value: Any
+    timestamp: int | None
+
+
+@dataclass
+class _CachedAsset:
+    realm: str
+    # Whether every attribute of the asset is known, rather than only those seen in events
+    complete: bool = False
+    attributes: dict[str, AttributeValue] = field(default_factory=dict)
+
+
+class AttributeValueCache:
+    """
+    Current attribute values of assets, kept up to date by the attribute events of OpenRemote.
+
+    Values are only replaced by values with the same or a newer timestamp, so a slow REST response never
+    overwrites a newer event. Only assets of `realms` are stored, the realms whose events are being received,
+    since nothing would keep the values of other realms up to date. `generation` changes whenever values may
+    have been missed, e.g. when an event stream disconnects; assets fetched before that are not stored. At
+    most `max_assets` assets are kept, the least recently used are dropped first.
+    """
+
+    def __init__(self, realms: Iterable[str] = (), max_assets: int = 10000):
+        self.realms = set(realms)
+        self.max_assets = max_assets
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.__assets: OrderedDict[str, _CachedAsset] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self.__assets)
+
+    def lookup(self, asset_id: str, attribute_names: list[str] | None = None) -> dict[str, AttributeValue] | None:
+        """
+        The cached values of an asset, all of them when no names are given.
+
+        Returns None on a miss. Names of attributes the asset doesn't have are left out, as long as every
+        attribute of the asset is known.
+        """
+        cached = self.__assets.get(asset_id)
+
+        if cached is None or not (cached.complete or (attribute_names and set(attribute_names) <= cached.attributes.keys())):
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self.__assets.move_to_end(asset_id)
+
+        if attribute_names is None:
+            return dict(cached.attributes)
+
+        return {name: cached.attributes[name] for name in attribute_names if name in cached.attributes}
+
+    def put_event(self, asset_id: str, attribute_name: str, value: Any, timestamp: int | None, realm: str):
+        if realm not in self.realms:
+            return
+
+        cached = self.__cached(asset_id, realm)
+        current = cached.attributes.get(attribute_name)
+
+        if current is None or _is_newer(timestamp, current.timestamp):
+            cached.attributes[attribute_name] = AttributeValue(value=value, timestamp=timestamp)
+
+    def put_asset(self, asset: dict, generation: int | None = None):
+        """Store every attribute of an asset, e.g. fetched over REST when `generation` was current."""
+        if generation is not None and generation != self.generation or asset.get("realm") not in self.realms:
+            return
+
+        cached = self.__cached(asset["id"], asset["realm"])
+        attributes = {}
+
+        for name, attribute in (asset.get("attributes") or {}).items():
+            current = cached.attributes.get(name)
+            fetched = AttributeValue(value=attribute.get("value"), timestamp=attribute.get("timestamp"))
+            attributes[name] = current if current is not None and not _is_newer(fetched.timestamp, current.timestamp) else fetched
+
+        # Attributes missing from the asset were removed from it
+        cached.attributes = attributes
+        cached.complete = True
+
+    def remove(self, asset_id: str):
+        self.__assets.pop(asset_id, None)
+
+    def subscribe(self, realm: str):
+        """Start storing the assets of a realm, its events are being received from now on."""
+        # Anything cached before the subscription may have changed unnoticed
+        self.clear(realm)
+        self.realms.add(realm)
+
+    def unsubscribe(self, realm: str):
+        """Stop storing the assets of a realm and forget them, its events may be missed from now on."""
+        self.realms.discard(realm)
+        self.clear(realm)
+
+    def clear(self, realm: str | None = None):
+        """Forget the assets of a realm, or every asset when no realm is given."""
+        self.generation += 1
+
+        if realm is None:
+            self.__assets.clear()
+            return
+
+        for asset_id in [asset_id for asset_id, cached in self.__assets.items() if cached.realm == realm]:
+            del self.__assets[asset_id]
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+
+        return {
+            "assets": len(self.__assets),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else None,
+        }
+
+    def __cached(self, asset_id: str, realm: str) -> _CachedAsset:
+        cached = self.__assets.get(asset_id)
+
+        if cached is None:
+            cached = self.__assets[asset_id] = _CachedAsset(realm=realm)
+
+            while len(self.__assets) > self.max_assets:
+                self.__assets.popitem(last=False)
+        else:
+            self.__assets.move_to_end(asset_id)
+            cached.realm = realm
+
+        return cached
+
+
+def _is_newer(timestamp: int | None, current: int | None) -> bool:
+    return timestamp is None or current is None or timestamp >= current
+
+
+class AttributeEventStream:
+    """
+    Subscribes to the attribute events of OpenRemote over its websocket, one connection per realm.
+
+    Every event updates the `cache`. A connection that drops is reconnected with exponential backoff, and
+    the assets of its realm are forgotten, since events may have been missed in the meantime.
+    """
+
+    def __init__(
+            self,
+            url: str,
+            realms: list[str],
+            cache: AttributeValueCache,
+            get_token: Callable[[], Awaitable[str]],
+            verify_ssl: bool = True,
+            reconnect_max_delay: float = 30,
+    ):
+        self.url = url
+        self.realms = realms
+        self.cache = cache
+        self.reconnect_max_delay = reconnect_max_delay
+        self.connected: dict[str, bool] = {realm: False for realm in realms}
+        self.events = 0
+        self.__get_token = get_token
+        self.__ssl = _ssl_context(url, verify_ssl)
+        self.__tasks: list[asyncio.Task] = []
+
+    def start(self):
+        if not self.__tasks:
+            self.__tasks = [asyncio.create_task(self.__run(realm)) for realm in self.realms]
+
+    async def stop(self):
+        for task in self.__tasks:
+            task.cancel()
+
+        await asyncio.gather(*self.__tasks, return_exceptions=True)
+        self.__tasks = []
+
+    def stats(self) -> dict:
+        return {"connected": dict(self.connected), "events": self.events, "cache": self.cache.stats()}
+
+    async def __run(self, realm: str):
+        failures = 0
+
+        while True:
+            try:
+                await self.__listen(realm)
+                failures = 0
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                failures += 1
+                logger.warning(f"Attribute event stream of realm '{realm}' failed, reconnecting")
+                logger.debug(e)
+            finally:
+                if self.connected[realm]:
+                    self.connected[realm] = False
+                    self.cache.unsubscribe(realm)
+
+            delay = min(self.reconnect_max_delay, 0.5 * 2 ** failures)
+            await asyncio.sleep(delay * random.uniform(0.5, 1))
+
+    async def __listen(self, realm: str):
+        token = await self.__get_token()
+        url = f"{self.url}?{urlencode({'Realm': realm, 'Authorization': f'Bearer {token}'})}"
+
+        async with websockets.connect(url, ssl=self.__ssl, max_size=None) as websocket:
+            for event_type in ("attribute", "asset"):
+                subscription = {"eventType": event_type, "subscriptionId": f"mcp-{event_type}"}
+                await websocket.send(SUBSCRIBE_PREFIX + json.dumps(subscription))
+
+            async for message in websocket:
+                self.handle_message(realm, message)
+
+    def handle_message(self, realm: str, message: str | bytes):
+        if isinstance(message, bytes):
+            message = message.decode()
+
+        if message.startswith(SUBSCRIBED_PREFIX):
+            if not self.connected[realm]:
+                logger.info(f"Subscribed to the attribute events of realm '{realm}'")
+                self.cache.subscribe(realm)
+                self.connected[realm] = True
+        elif message.startswith(UNAUTHORIZED_PREFIX):
+            raise PermissionError(f"Not allowed to subscribe to the events of realm '{realm}'")
+        elif message.startswith(TRIGGERED_PREFIX):
+            for event in json.loads(message[len(TRIGGERED_PREFIX):]).get("events") or []:
+                self.handle_event(realm, event)
+        elif message.startswith(EVENT_PREFIX):
+            self.handle_event(realm, json.loads(message[len(EVENT_PREFIX):]))
+
+    def handle_event(self, realm: str, event: dict):
+        if not self.connected[realm]:
+            return
+
+        self.events += 1
+
+        if event.get("eventType") == "attribute":
+            ref = event.get("ref") or {}
+
+            if event.get("deleted"):
+                self.cache.remove(ref.get("id"))
+            elif ref.get("id") and ref.get("name"):
+                self.cache.put_event(ref["id"], ref["name"], event.get("value"), event.get("timestamp"), event.get("realm") or realm)
+        elif event.get("eventType") == "asset" and event.get("asset"):
+            if event.get("cause") == "DELETE":
+                self.cache.remove(event["asset"]["id"])
+            elif event["asset"].get("attributes") is not None:
+                self.cache.put_asset(event["asset"])
+
+
+def _ssl_context(url: str, verify_ssl: bool) -> ssl.SSLContext | None:
+    if not url.startswith("wss:"):
+        return None
+
+    context = ssl.create_default_context()
+
+    if not verify_ssl:
+        context.check_hostname = False
+        context.verify_mode = ssl.CERT_NONE
+
+    return context
+
+
+def event_stream_url(host: str) -> str:
+    """The websocket URL of the events of an OpenRemote instance, e.g. 'wss://openremote.io/websocket/events'."""
+    base = urlsplit(str(host))
+    scheme = "wss" if base.scheme == "https" else "ws"
+
+    return f"{scheme}://{base.netloc}/websocket/events"
+
+
+__attribute_value_cache: AttributeValueCache | None = None
+__attribute_event_stream: AttributeEventStream | None = None
+
+
+def get_attribute_value_cache() -> AttributeValueCache | None:
+    """The attribute value cache, None when no realms are subscribed to."""
+    return __attribute_value_cache
+
+
+def get_attribute_event_stream() -> AttributeEventStream | None:
+    return __attribute_event_stream
+
+
+def init_attribute_events(
+        host: str,
+        client_id: str,
+        client_secret: str,
+        realms: list[str],
+        verify_SSL: bool = True,
+        max_assets: int = 10000,
+        reconnect_max_delay: float = 30,
+):
+    """Start caching the attribute values of the given realms, nothing is cached without realms."""
+    global __attribute_value_cache, __attribute_event_stream
+
+    if not realms:
+        return
+
+    authenticator = Authenticator(UrlBuilder(host), client_id, client_secret, verify_SSL)
+
+    __attribute_value_cache = AttributeValueCache(max_assets=max_assets)
+    __attribute_event_stream = AttributeEventStream(
+        url=event_stream_url(host),
+        realms=realms,
+        cache=__attribute_value_cache,
+        get_token=authenticator.get_token,
+        verify_ssl=verify_SSL,
+        reconnect_max_delay=reconnect_max_delay,
+    )
+    __attribute_event_stream.start()
+
+
+async def stop_attribute_events():
+    global __attribute_value_cache, __attribute_event_stream
+
+    if __attribute_event_stream is not None:
+        await __attribute_event_stream.stop()
+
+    __attribute_value_cache = None
+    __attribute_event_stream = None
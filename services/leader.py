@@ -0,0 +1,190 @@
+# Copyright 2025, OpenRemote Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+import asyncio
+import json
+import logging
+import os
+import time
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+logger = logging.getLogger("uvicorn")
+
+
+class FileLock:
+    """
+    Exclusive, non-blocking lock on a file, or a `shared` one that any number of processes hold at once.
+
+    The operating system releases the lock when the process holding it exits, also when it crashes. Shared
+    locks need `fcntl`, so they are not available on Windows.
+    """
+
+    def __init__(self, path: str | Path, shared: bool = False):
+        self.path = Path(path)
+        self.shared = shared
+        self.__fd: int | None = None
+
+    @property
+    def held(self) -> bool:
+        return self.__fd is not None
+
+    def try_acquire(self) -> bool:
+        if self.__fd is not None:
+            return True
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+
+        try:
+            if fcntl is not None:
+                fcntl.flock(fd, (fcntl.LOCK_SH if self.shared else fcntl.LOCK_EX) | fcntl.LOCK_NB)
+            else:
+                msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+        except OSError:
+            os.close(fd)
+            return False
+
+        self.__fd = fd
+        return True
+
+    def release(self):
+        if self.__fd is None:
+            return
+
+        try:
+            if fcntl is not None:
+                fcntl.flock(self.__fd, fcntl.LOCK_UN)
+            else:
+                msvcrt.locking(self.__fd, msvcrt.LK_UNLCK, 1)
+        finally:
+            os.close(self.__fd)
+            self.__fd = None
+
+
+class LeaderElection:
+    """
+    Elects a single leader among the worker processes of one server, e.g. `uvicorn app:app --workers 4`.
+
+    Whoever holds the lock file is the leader. The leader publishes shared state (like the registered
+    instance id) next to it, which the other workers read. State is tagged with the parent process and when
+    it started, so workers never pick up the state of an earlier run of the server, even when the parent
+    process got the same pid again, as it usually does in a container. The leader removes its state when
+    it resigns.
+
+    Every worker that joined holds a shared lock on a members file, so a stopping worker can tell whether
+    it is the last one.
+    """
+
+    def __init__(self, lock_path: str | Path, group: int | str | None = None):
+        self.lock = FileLock(lock_path)
+        self.members = FileLock(f"{lock_path}.members", shared=True)
+        self.state_path = Path(f"{lock_path}.json")
+        self.group = _run_group() if group is None else group
+
+    @property
+    def is_leader(self) -> bool:
+        return self.lock.held
+
+    def try_lead(self) -> bool:
+        return self.lock.try_acquire()
+
+    def join(self):
+        if fcntl is not None:
+            self.members.try_acquire()
+
+    def is_last_member(self) -> bool:
+        """
+        Leave the workers and tell whether no other worker is left, e.g. to deregister what they shared.
+
+        Without shared locks nothing is known about the other workers, so they are assumed to still run.
+        """
+        if fcntl is None:
+            return False
+
+        self.members.release()
+        alone = FileLock(self.members.path)
+
+        if not alone.try_acquire():
+            return False
+
+        alone.release()
+        return True
+
+    def resign(self):
+        if self.lock.held:
+            self.clear()
+
+        self.lock.release()
+        self.members.release()
+
+    def clear(self):
+        """Remove the published state, e.g. before the leader has registered anything."""
+        self.state_path.unlink(missing_ok=True)
+
+    def publish(self, state: dict):
+        # Written to a temporary file first, so other workers never read a half written state
+        temporary_path = self.state_path.with_suffix(f".{os.getpid()}.tmp")
+        temporary_path.write_text(json.dumps({"group": self.group, "state": state}))
+        os.replace(temporary_path, self.state_path)
+
+    def read(self) -> dict | None:
+        try:
+            published = json.loads(self.state_path.read_text())
+        except (OSError, ValueError):
+            return None
+
+        if not isinstance(published, dict) or published.get("group") != self.group:
+            return None
+
+        return published.get("state")
+
+    async def wait_for_state(self, timeout: float, poll_interval: float = 0.1) -> dict:
+        """Wait until the leader has published its state."""
+        deadline = time.monotonic() + timeout
+
+        while (state := self.read()) is None:
+            if time.monotonic() > deadline:
+                raise TimeoutError(f"No leader published its state within {timeout} seconds")
+
+            await asyncio.sleep(poll_interval)
+
+        return state
+
+    async def wait_for_leadership(self, poll_interval: float):
+        """Wait until this process becomes the leader, i.e. the previous leader exited."""
+        while not self.try_lead():
+            await asyncio.sleep(poll_interval)
+
+
+def _run_group() -> str:
+    """The parent process and, where available, the time it started, which tells apart runs with the same pid."""
+    parent = os.getppid()
+
+    try:
+        with open(f"/proc/{parent}/stat", encoding="utf-8") as f:
+            # The start time is the 22nd field, the name in parentheses before it may contain spaces
+            started = f.read().rsplit(")", 1)[1].split()[19]
+    except (OSError, IndexError):
+        return str(parent)
+
+    return f"{parent}-{started}"
@@ -17,30 +17,59 @@
 
 import asyncio
 import logging
+import random
+import time
+from dataclasses import dataclass
+from functools import partial
+from typing import Any, Callable
 
+from httpx import HTTPStatusError
 from openremote_client import OpenRemoteClient
 from openremote_client.schemas import ExternalServiceSchema
 
+from .leader import LeaderElection
+from .upstream import OpenRemoteUpstream, SingleFlight, UpstreamInterceptor
+
 logger = logging.getLogger("uvicorn")
 
+# Seconds until the next attempt after a failed heartbeat, unless the interval is shorter
+HEARTBEAT_RETRY_DELAY = 5
+
+
+@dataclass(frozen=True)
+class HeartbeatSchedule:
+    """
+    When heartbeats are sent: every `interval` seconds, minus up to `jitter` (a fraction of the interval).
+
+    The jitter only ever makes a heartbeat earlier, so OpenRemote never waits longer than the interval.
+    """
+    interval: float = 30
+    timeout: float = 10
+    jitter: float = 0.1
+
+    def delay(self) -> float:
+        return self.interval * (1 - random.uniform(0, self.jitter))
+
+    def retry_delay(self) -> float:
+        return min(HEARTBEAT_RETRY_DELAY, self.interval)
+
 
 class OpenRemoteService:
-    __heartbeat_interval: int
     client: OpenRemoteClient
     service_id: str
     instance_id: int
 
     @classmethod
-    async def register(cls, openremote_client: OpenRemoteClient, external_service_schema: ExternalServiceSchema, heartbeat_interval: int = 45):
+    async def register(cls, openremote_client: OpenRemoteClient, external_service_schema: ExternalServiceSchema, heartbeat_schedule: HeartbeatSchedule = HeartbeatSchedule()):
         try:
             service_registry = await openremote_client.services.register_service(
                 external_service_schema
             )
 
-            return cls(
+            service = cls(
                 client=openremote_client,
                 external_service_schema=service_registry.content,
-                heartbeat_interval=heartbeat_interval
+                heartbeat_schedule=heartbeat_schedule
             )
         except Exception as e:
             logger.error("Failed to connect to OpenRemote")
@@ -48,32 +77,127 @@ class OpenRemoteService:
 
             raise RuntimeError("Failed to connect to OpenRemote")
 
+        logger.info(f"Registered OpenRemote service with service_id '{service.service_id}' and instance_id '{service.instance_id}'")
 
-    async def __heartbeat_loop(self):
-        while True:
-            await asyncio.sleep(self.__heartbeat_interval)
-            await self.send_heartbeat()
+        return service
 
-    def __init__(self, client: OpenRemoteClient, external_service_schema: ExternalServiceSchema, heartbeat_interval: int = 45):
+    def __init__(self, client: OpenRemoteClient, external_service_schema: ExternalServiceSchema, heartbeat_schedule: HeartbeatSchedule = HeartbeatSchedule(), send_heartbeats: bool = True):
         self.client = client
         self.service_id = external_service_schema.serviceId
         self.instance_id = external_service_schema.instanceId
-        self.__heartbeat_interval = heartbeat_interval
+        self.heartbeat_schedule = heartbeat_schedule
+        self.registered_at = time.time()
+        self.last_heartbeat_at: float | None = None
+        self.last_heartbeat_error: str | None = None
+        self.heartbeat_failures = 0
+        self.__external_service_schema = external_service_schema
+        self.__registration_listeners: list[Callable[['OpenRemoteService'], Any]] = []
+        self.__heartbeat_task: asyncio.Task | None = None
+
+        if send_heartbeats:
+            self.start_heartbeat()
+
+    @property
+    def sends_heartbeats(self) -> bool:
+        return self.__heartbeat_task is not None
+
+    def add_registration_listener(self, listener: Callable[['OpenRemoteService'], Any]):
+        """Call `listener` whenever the service was registered again under a new instance id."""
+        self.__registration_listeners.append(listener)
 
-        asyncio.run_coroutine_threadsafe(self.__heartbeat_loop(), asyncio.get_event_loop())
+    def heartbeat_stats(self) -> dict[str, Any]:
+        return {
+            "sending": self.sends_heartbeats,
+            "interval": self.heartbeat_schedule.interval,
+            "instance_id": self.instance_id,
+            "registered_at": self.registered_at,
+            "last_success_at": self.last_heartbeat_at,
+            "consecutive_failures": self.heartbeat_failures,
+            "last_error": self.last_heartbeat_error,
+        }
 
-        logger.info(f"Registered OpenRemote service with service_id '{self.service_id}' and instance_id '{self.instance_id}'")
+    def start_heartbeat(self):
+        if self.__heartbeat_task is None:
+            self.__heartbeat_task = asyncio.create_task(self.__heartbeat_loop())
+
+    async def stop_heartbeat(self):
+        if self.__heartbeat_task is not None:
+            self.__heartbeat_task.cancel()
+            try:
+                await self.__heartbeat_task
+            except asyncio.CancelledError:
+                pass
+            self.__heartbeat_task = None
+
+    async def __heartbeat_loop(self):
+        delay = self.heartbeat_schedule.delay()
+
+        while True:
+            await asyncio.sleep(delay)
+
+            if await self.beat():
+                delay = self.heartbeat_schedule.delay()
+            else:
+                delay = self.heartbeat_schedule.retry_delay()
+
+    async def beat(self) -> bool:
+        """
+        Send a single heartbeat and return whether it succeeded, failures are recorded but never raised.
+
+        When OpenRemote no longer knows this instance, e.g. after a restart of the manager, the service
+        is registered again.
+        """
+        timeout = self.heartbeat_schedule.timeout
+
+        try:
+            try:
+                await asyncio.wait_for(self.send_heartbeat(), timeout)
+            except HTTPStatusError as e:
+                if e.response.status_code != 404:
+                    raise
+
+                logger.warning(f"OpenRemote no longer knows instance_id '{self.instance_id}', registering again")
+                await asyncio.wait_for(self.register_again(), timeout)
+        except Exception as e:
+            self.heartbeat_failures += 1
+            self.last_heartbeat_error = str(e) or type(e).__name__
+            logger.warning(f"Failed to send heartbeat to OpenRemote ({self.heartbeat_failures} in a row)")
+            logger.debug(e)
+
+            return False
+
+        self.heartbeat_failures = 0
+        self.last_heartbeat_error = None
+        self.last_heartbeat_at = time.time()
+
+        return True
 
     async def send_heartbeat(self):
         await self.client.services.heartbeat(self.service_id, self.instance_id)
         logger.info("Sent heartbeat to OpenRemote")
 
+    async def register_again(self):
+        service_registry = await self.client.services.register_service(
+            self.__external_service_schema.model_copy(update={"instanceId": None})
+        )
+
+        self.__external_service_schema = service_registry.content
+        self.instance_id = service_registry.content.instanceId
+        self.registered_at = time.time()
+
+        logger.info(f"Registered OpenRemote service again with instance_id '{self.instance_id}'")
+
+        for listener in self.__registration_listeners:
+            listener(self)
+
     async def deregister(self):
         await self.client.services.deregister_service(self.service_id, self.instance_id)
         logger.info("Deregistered OpenRemote service")
 
 
 __openremote_service: OpenRemoteService | None = None
+__election: LeaderElection | None = None
+__takeover_task: asyncio.Task | None = None
 
 
 def get_openremote_service() -> OpenRemoteService:
@@ -85,8 +209,24 @@ def get_openremote_service() -> OpenRemoteService:
     return __openremote_service
 
 
-async def init_openremote_service(service_schema: ExternalServiceSchema, host: str, client_id: str, client_secret: str, verify_SSL: bool = True):
-    global __openremote_service
+async def init_openremote_service(
+        service_schema: ExternalServiceSchema,
+        host: str,
+        client_id: str,
+        client_secret: str,
+        verify_SSL: bool = True,
+        interceptors: list[UpstreamInterceptor] | None = None,
+        election: LeaderElection | None = None,
+        leader_timeout: float = 30,
+        heartbeat_schedule: HeartbeatSchedule = HeartbeatSchedule(),
+):
+    """
+    Connect to OpenRemote and register the service.
+
+    With an `election`, only the leading worker process registers the service and sends heartbeats. The
+    other workers share its instance id, and one of them takes over the heartbeats when the leader exits.
+    """
+    global __openremote_service, __election, __takeover_task
 
     openremote_client = OpenRemoteClient(
         host=host,
@@ -95,7 +235,108 @@ async def init_openremote_service(service_schema: ExternalServiceSchema, host: s
         verify_SSL=verify_SSL
     )
 
-    __openremote_service = await OpenRemoteService.register(
-        openremote_client,
-        service_schema
+    # Identical concurrent reads from different MCP sessions share a single request to OpenRemote
+    upstream = OpenRemoteUpstream(openremote_client, interceptors=[SingleFlight(), *(interceptors or [])])
+
+    __election = election
+
+    if election is not None:
+        election.join()
+
+    if election is None or election.try_lead():
+        if election is not None:
+            # Whatever is published is left over from a leader that crashed, its instance may be gone
+            election.clear()
+
+        __openremote_service = await OpenRemoteService.register(
+            upstream,
+            service_schema,
+            heartbeat_schedule
+        )
+
+        if election is not None:
+            __publish_instance(election, __openremote_service)
+            __openremote_service.add_registration_listener(partial(__publish_instance, election))
+
+        return
+
+    try:
+        state = await election.wait_for_state(leader_timeout)
+    except TimeoutError as e:
+        logger.error("No other worker registered the OpenRemote service")
+        logger.debug(e)
+
+        raise RuntimeError("Failed to connect to OpenRemote")
+
+    __openremote_service = OpenRemoteService(
+        client=upstream,
+        external_service_schema=service_schema.model_copy(update=state),
+        heartbeat_schedule=heartbeat_schedule,
+        send_heartbeats=False
     )
+    __openremote_service.add_registration_listener(partial(__publish_instance, election))
+    __takeover_task = asyncio.create_task(__take_over_heartbeat(election, __openremote_service))
+
+    logger.info(f"Sharing OpenRemote service instance_id '{__openremote_service.instance_id}' of the leading worker")
+
+
+def __publish_instance(election: LeaderElection, openremote_service: OpenRemoteService):
+    election.publish({"serviceId": openremote_service.service_id, "instanceId": openremote_service.instance_id})
+
+
+async def __take_over_heartbeat(election: LeaderElection, openremote_service: OpenRemoteService, poll_interval: float = 1):
+    await election.wait_for_leadership(poll_interval)
+
+    # The leader may have registered again since this worker started
+    state = election.read()
+    if state is not None:
+        openremote_service.instance_id = state["instanceId"]
+    else:
+        # The previous leader resigned and removed its state, workers started from now on need it again
+        __publish_instance(election, openremote_service)
+
+    logger.info(f"Leading worker exited, taking over the heartbeats of instance_id '{openremote_service.instance_id}'")
+
+    # The last heartbeat of the previous leader may have been a while ago
+    await openremote_service.beat()
+    openremote_service.start_heartbeat()
+
+
+def stop_heartbeat_takeover():
+    """Stop waiting to take over the heartbeats, a worker that is shutting down must not register again."""
+    if __takeover_task is not None:
+        __takeover_task.cancel()
+
+
+async def stop_openremote_service(deregister: bool = True):
+    """
+    Stop the heartbeats and, unless another worker still sends them or may take them over, deregister the service.
+
+    Deregistration is best effort, OpenRemote marks the instance unavailable once the heartbeats stop anyway.
+    """
+    global __election, __takeover_task
+
+    if __takeover_task is not None:
+        __takeover_task.cancel()
+        try:
+            await __takeover_task
+        except asyncio.CancelledError:
+            pass
+        __takeover_task = None
+
+    if __openremote_service is not None:
+        sends_heartbeats = __openremote_service.sends_heartbeats
+        await __openremote_service.stop_heartbeat()
+
+        # Deregistered before resigning, so no other worker takes over in between. Workers that keep running
+        # keep using the instance, it is only deregistered together with the last of them
+        if deregister and sends_heartbeats and (__election is None or __election.is_last_member()):
+            try:
+                await asyncio.wait_for(__openremote_service.deregister(), __openremote_service.heartbeat_schedule.timeout)
+            except Exception as e:
+                logger.warning("Failed to deregister the OpenRemote service")
+                logger.debug(e)
+
+    if __election is not None:
+        __election.resign()
+        __election = None
@@ -0,0 +1,164 @@
+# Copyright 2025, OpenRemote Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+
+import asyncio
+import logging
+import random
+import time
+from typing import Any
+
+import httpx
+
+from .upstream import RESERVED_GROUPS, CallNext, UpstreamCall, UpstreamInterceptor
+
+logger = logging.getLogger("uvicorn")
+
+# Responses OpenRemote (or the proxy in front of it) gives while it is restarting or overloaded
+TRANSIENT_STATUS_CODES = frozenset({502, 503, 504})
+
+
+def is_transient_error(error: BaseException) -> bool:
+    """Whether the same call could succeed when tried again a little later."""
+    if isinstance(error, httpx.HTTPStatusError):
+        return error.response.status_code in TRANSIENT_STATUS_CODES
+
+    return isinstance(error, httpx.TransportError)
+
+
+class Retry(UpstreamInterceptor):
+    """
+    Retries reads that failed with a transient error, with capped exponential backoff and full jitter.
+
+    Writes are never retried, as OpenRemote may have applied them before the connection failed.
+    """
+
+    def __init__(self, attempts: int, base_delay: float, max_delay: float):
+        self.attempts = max(1, attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def delay(self, attempt: int) -> float:
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+    async def __call__(self, call: UpstreamCall, call_next: CallNext) -> Any:
+        if not call.is_read:
+            return await call_next(call)
+
+        for attempt in range(self.attempts):
+            try:
+                return await call_next(call)
+            except Exception as e:
+                if attempt + 1 >= self.attempts or not is_transient_error(e):
+                    raise
+
+                delay = self.delay(attempt)
+                logger.debug(f"Retrying {call.endpoint} in {delay:.2f}s after {type(e).__name__}")
+                await asyncio.sleep(delay)
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised without calling OpenRemote while the circuit breaker is open."""
+
+    def __init__(self, retry_after: float):
+        self.retry_after = retry_after
+        super().__init__(f"OpenRemote is unavailable, retry after {retry_after:.0f} seconds")
+
+
+class CircuitBreaker(UpstreamInterceptor):
+    """
+    Stops calling OpenRemote after `failure_threshold` transient failures in a row.
+
+    While open, calls fail right away with a `CircuitOpenError`. After `reset_timeout` seconds a single
+    trial call is let through (half-open), which closes the circuit again when it succeeds. Calls of the
+    services and status groups are never blocked.
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, failure_threshold: int, reset_timeout: float):
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: float | None = None
+        self.__trial_running = False
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return self.CLOSED
+
+        if time.monotonic() - self.opened_at < self.reset_timeout:
+            return self.OPEN
+
+        return self.HALF_OPEN
+
+    @property
+    def retry_after(self) -> float:
+        if self.opened_at is None:
+            return 0
+
+        return max(0.0, self.reset_timeout - (time.monotonic() - self.opened_at))
+
+    def stats(self) -> dict[str, Any]:
+        return {"state": self.state, "failures": self.failures, "retry_after": round(self.retry_after, 2)}
+
+    async def __call__(self, call: UpstreamCall, call_next: CallNext) -> Any:
+        # An open circuit must not stop the heartbeats, OpenRemote would mark the service unavailable
+        if call.api_group in RESERVED_GROUPS:
+            return await call_next(call)
+
+        state = self.state
+        trial = state == self.HALF_OPEN
+
+        if state == self.OPEN or (trial and self.__trial_running):
+            raise CircuitOpenError(self.retry_after)
+
+        self.__trial_running = self.__trial_running or trial
+
+        try:
+            result = await call_next(call)
+        except Exception as e:
+            if is_transient_error(e):
+                self.__record_failure(call)
+            elif trial or isinstance(e, httpx.HTTPStatusError):
+                # OpenRemote answered, so it is reachable again and the failures are no longer in a row
+                self.__reset()
+            raise
+        finally:
+            if trial:
+                self.__trial_running = False
+
+        self.__reset()
+        return result
+
+    def __record_failure(self, call: UpstreamCall):
+        self.failures += 1
+
+        if self.opened_at is not None or self.failures >= self.failure_threshold:
+            if self.opened_at is None:
+                logger.warning(f"Circuit breaker opened after {self.failures} failed calls to OpenRemote ({call.endpoint})")
+            self.opened_at = time.monotonic()
+
+    def __reset(self):
+        if self.opened_at is not None:
+            logger.info("Circuit breaker closed, OpenRemote is reachable again")
+
+        self.failures = 0
+        self.opened_at = None
@@ -0,0 +1,241 @@
+# Copyright 2025, OpenRemote Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+import asyncio
+import json
+from dataclasses import dataclass, field
+from functools import partial
+from typing import Any, Awaitable, Callable
+
+from openremote_client import OpenRemoteClient
+from pydantic import BaseModel
+
+# Public API groups of the OpenRemote client, e.g. `client.asset` or `client.realm`
+API_GROUPS = frozenset(name for name in OpenRemoteClient.__annotations__ if not name.startswith('_'))
+
+# Generic HTTP methods exposed on the client itself, routed through the interceptors as the 'http' group
+HTTP_METHODS = frozenset({'get', 'post', 'put', 'delete'})
+
+# API methods with these prefixes don't change anything on the manager
+READ_METHOD_PREFIXES = ('get_', 'query_')
+
+# Registration, heartbeats and health checks get a lane of their own, so other traffic can never starve them
+RESERVED_GROUPS = frozenset({'services', 'status'})
+
+
+@dataclass(frozen=True)
+class UpstreamCall:
+    """A single call on the OpenRemote client, e.g. `client.asset.get_asset('id')`."""
+    group: str
+    method: str
+    args: tuple = ()
+    kwargs: dict = field(default_factory=dict)
+
+    @property
+    def endpoint(self) -> str:
+        return f"{self.group}.{self.method}"
+
+    @property
+    def api_group(self) -> str:
+        """The API group, generic HTTP calls are attributed to the group of their path, e.g. '/asset/...'."""
+        if self.group != 'http':
+            return self.group
+
+        path = self.kwargs.get('path', self.args[0] if self.args else '')
+        segment = path.strip('/').split('/', 1)[0].replace('-', '_')
+
+        return segment if segment in API_GROUPS else self.group
+
+    @property
+    def is_read(self) -> bool:
+        if self.group == 'http':
+            return self.method == 'get'
+
+        return self.method.startswith(READ_METHOD_PREFIXES)
+
+    def key(self) -> str:
+        """Stable key identifying calls with the same method and arguments."""
+        return json.dumps([self.group, self.method, self.args, self.kwargs], default=_encode_argument, sort_keys=True)
+
+
+def _encode_argument(value: Any) -> Any:
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode='json')
+
+    return repr(value)
+
+
+CallNext = Callable[[UpstreamCall], Awaitable[Any]]
+
+
+class UpstreamInterceptor:
+    """Base class for logic that wraps every call to OpenRemote, comparable to FastMCP middleware."""
+
+    async def __call__(self, call: UpstreamCall, call_next: CallNext) -> Any:
+        return await call_next(call)
+
+
+class SingleFlight(UpstreamInterceptor):
+    """
+    Coalesces identical in-flight read calls into a single upstream request.
+
+    Every caller receives the same result object, so callers must not mutate it.
+    """
+
+    def __init__(self):
+        self.__in_flight: dict[str, asyncio.Future] = {}
+
+    @property
+    def in_flight(self) -> int:
+        return len(self.__in_flight)
+
+    async def __call__(self, call: UpstreamCall, call_next: CallNext) -> Any:
+        if not call.is_read:
+            return await call_next(call)
+
+        key = call.key()
+        future = self.__in_flight.get(key)
+
+        if future is None:
+            future = asyncio.ensure_future(call_next(call))
+            self.__in_flight[key] = future
+            future.add_done_callback(partial(self.__forget, key))
+
+        # Shielded so a cancelled caller doesn't cancel the request for everyone else
+        return await asyncio.shield(future)
+
+    def __forget(self, key: str, future: asyncio.Future):
+        if self.__in_flight.get(key) is future:
+            del self.__in_flight[key]
+
+
+class _Lane:
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.active = 0
+        self.waiting = 0
+        self.semaphore = asyncio.Semaphore(limit)
+
+
+class Bulkhead(UpstreamInterceptor):
+    """
+    Limits the number of concurrent calls per API group, so a burst on one group can't hold up the others.
+
+    Groups without a limit of their own share the default lane. The services and status groups always use
+    the reserved lane.
+    """
+
+    def __init__(self, limits: dict[str, int], default_limit: int, reserved_limit: int):
+        self.__lanes = {group: _Lane(limit) for group, limit in limits.items()}
+        self.__lanes['default'] = _Lane(default_limit)
+        self.__lanes['reserved'] = _Lane(reserved_limit)
+
+    def lane(self, call: UpstreamCall) -> str:
+        group = call.api_group
+
+        if group in RESERVED_GROUPS:
+            return 'reserved'
+
+        return group if group in self.__lanes else 'default'
+
+    @property
+    def waiting(self) -> int:
+        return sum(lane.waiting for lane in self.__lanes.values())
+
+    def stats(self) -> dict[str, dict[str, int]]:
+        return {
+            name: {"limit": lane.limit, "active": lane.active, "waiting": lane.waiting}
+            for name, lane in self.__lanes.items()
+        }
+
+    async def __call__(self, call: UpstreamCall, call_next: CallNext) -> Any:
+        lane = self.__lanes[self.lane(call)]
+
+        lane.waiting += 1
+        try:
+            await lane.semaphore.acquire()
+        finally:
+            lane.waiting -= 1
+
+        lane.active += 1
+        try:
+            return await call_next(call)
+        finally:
+            lane.active -= 1
+            lane.semaphore.release()
+
+
+class OpenRemoteUpstream:
+    """
+    Drop-in proxy for `OpenRemoteClient` that routes every API call through a chain of interceptors.
+
+    `upstream.asset.get_asset('id')` behaves like the same call on the client, but interceptors can
+    coalesce, limit, retry or measure it on the way.
+    """
+
+    def __init__(self, client: OpenRemoteClient, interceptors: list[UpstreamInterceptor] | None = None):
+        self.client = client
+        self.interceptors = list(interceptors or [])
+
+    def add_interceptor(self, interceptor: UpstreamInterceptor):
+        self.interceptors.append(interceptor)
+
+    def get_interceptor(self, interceptor_type: type[UpstreamInterceptor]) -> UpstreamInterceptor | None:
+        return next((i for i in self.interceptors if isinstance(i, interceptor_type)), None)
+
+    async def execute(self, call: UpstreamCall, fn: Callable[..., Awaitable[Any]]) -> Any:
+        async def invoke(final_call: UpstreamCall):
+            return await fn(*final_call.args, **final_call.kwargs)
+
+        chain = invoke
+        for interceptor in reversed(self.interceptors):
+            chain = partial(interceptor, call_next=chain)
+
+        return await chain(call)
+
+    def __getattr__(self, name: str):
+        attribute = getattr(self.client, name)
+
+        if name in API_GROUPS:
+            return _UpstreamApi(self, name, attribute)
+
+        if name in HTTP_METHODS:
+            return _bind(self, 'http', name, attribute)
+
+        return attribute
+
+
+class _UpstreamApi:
+    def __init__(self, upstream: OpenRemoteUpstream, group: str, api: Any):
+        self.__upstream = upstream
+        self.__group = group
+        self.__api = api
+
+    def __getattr__(self, name: str):
+        attribute = getattr(self.__api, name)
+
+        if name.startswith('_') or not callable(attribute):
+            return attribute
+
+        return _bind(self.__upstream, self.__group, name, attribute)
+
+
+def _bind(upstream: OpenRemoteUpstream, group: str, method: str, fn: Callable[..., Awaitable[Any]]):
+    async def call(*args, **kwargs):
+        return await upstream.execute(UpstreamCall(group, method, args, kwargs), fn)
+
+    return call
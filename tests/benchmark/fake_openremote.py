@@ -0,0 +1,207 @@
+# Copyright 2025, OpenRemote Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+
+"""In-process stand-in for the OpenRemote manager, serving synthetic data with configurable latency."""
+import asyncio
+import random
+import string
+from dataclasses import dataclass
+
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response
+from starlette.routing import Route
+
+ATTRIBUTE_TYPES = ("text", "number", "integer", "boolean", "positiveInteger")
+
+
+@dataclass
+class FakeOpenRemoteConfig:
+    realms: int = 5
+    asset_types: int = 200
+    assets: int = 5000
+    attributes_per_asset: int = 8
+    latency: float = 0.01
+    jitter: float = 0.005
+    seed: int = 42
+
+
+def asset_id(rng: random.Random) -> str:
+    return ''.join(rng.choices(string.ascii_letters + string.digits, k=22))
+
+
+class FakeOpenRemote:
+    """Synthetic realms, asset types and assets, with just enough of the REST API for the MCP server."""
+
+    def __init__(self, config: FakeOpenRemoteConfig):
+        self.config = config
+        self.requests = 0
+        rng = random.Random(config.seed)
+
+        self.realms = ["master", *(f"realm{i}" for i in range(1, config.realms))]
+        self.asset_infos = [
+            {
+                "assetDescriptor": {"name": f"Benchmark{i}Asset", "icon": "cube", "colour": "000000"},
+                "attributeDescriptors": [
+                    {"name": f"attribute{j}", "type": ATTRIBUTE_TYPES[j % len(ATTRIBUTE_TYPES)], "optional": j > 0}
+                    for j in range(config.attributes_per_asset)
+                ],
+                "metaItemDescriptors": [],
+                "valueDescriptors": [],
+            }
+            for i in range(config.asset_types)
+        ]
+
+        self.assets = []
+        for i in range(config.assets):
+            asset_type = rng.choice(self.asset_infos)
+            # Roughly one in ten assets is a root, the others are children of an earlier asset
+            parent = rng.choice(self.assets) if self.assets and rng.random() > 0.1 else None
+
+            self.assets.append({
+                "id": asset_id(rng),
+                "version": 1,
+                "createdOn": 1700000000000 + i,
+                "name": f"Asset {i}",
+                "accessPublicRead": False,
+                "parentId": parent["id"] if parent else None,
+                "realm": parent["realm"] if parent else rng.choice(self.realms),
+                "type": asset_type["assetDescriptor"]["name"],
+                "path": None,
+                "attributes": {
+                    descriptor["name"]: {
+                        "name": descriptor["name"],
+                        "type": descriptor["type"],
+                        "value": rng.random() * 100 if descriptor["type"] == "number" else None,
+                        "timestamp": 1700000000000,
+                        "meta": {"label": descriptor["name"].title(), "readOnly": False},
+                    }
+                    for descriptor in asset_type["attributeDescriptors"]
+                },
+            })
+
+        self.assets_by_id = {asset["id"]: asset for asset in self.assets}
+
+    async def delay(self):
+        self.requests += 1
+        await asyncio.sleep(max(0.0, self.config.latency + random.uniform(-self.config.jitter, self.config.jitter)))
+
+    async def token(self, request: Request):
+        return JSONResponse({"access_token": "benchmark", "expires_in": 3600, "token_type": "Bearer"})
+
+    async def register_service(self, request: Request):
+        await self.delay()
+        service = await request.json()
+
+        return JSONResponse({**service, "instanceId": 1, "status": "AVAILABLE"})
+
+    async def service_instance(self, request: Request):
+        await self.delay()
+        return Response(status_code=204)
+
+    async def health(self, request: Request):
+        await self.delay()
+        return JSONResponse({"status": "UP"})
+
+    async def realms_list(self, request: Request):
+        await self.delay()
+        return JSONResponse([{"name": realm, "displayName": realm.title(), "enabled": True} for realm in self.realms])
+
+    async def realm(self, request: Request):
+        await self.delay()
+        name = request.path_params["name"]
+
+        if name not in self.realms:
+            return Response(status_code=404)
+
+        return JSONResponse({"name": name, "displayName": name.title(), "enabled": True})
+
+    async def asset_infos_list(self, request: Request):
+        await self.delay()
+        return JSONResponse(self.asset_infos)
+
+    async def asset_info(self, request: Request):
+        await self.delay()
+        asset_type = request.path_params["asset_type"]
+        info = next((info for info in self.asset_infos if info["assetDescriptor"]["name"] == asset_type), None)
+
+        return JSONResponse(info) if info else Response(status_code=404)
+
+    async def asset(self, request: Request):
+        await self.delay()
+        asset = self.assets_by_id.get(request.path_params["asset_id"])
+
+        return JSONResponse(asset) if asset else Response(status_code=404)
+
+    async def create_asset(self, request: Request):
+        await self.delay()
+        asset = await request.json()
+        asset["id"] = asset.get("id") or asset_id(random.Random())
+
+        return JSONResponse(asset)
+
+    async def write_attributes(self, request: Request):
+        await self.delay()
+        states = await request.json()
+
+        return JSONResponse([
+            {"ref": state["ref"], "failure": None if state["ref"]["id"] in self.assets_by_id else "ASSET_NOT_FOUND"}
+            for state in states
+        ])
+
+    async def query(self, request: Request):
+        await self.delay()
+        query = await request.json()
+        assets = self.assets
+
+        if query.get("ids"):
+            ids = set(query["ids"])
+            assets = [asset for asset in assets if asset["id"] in ids]
+        if query.get("types"):
+            types = set(query["types"])
+            assets = [asset for asset in assets if asset["type"] in types]
+        if (query.get("realm") or {}).get("name"):
+            assets = [asset for asset in assets if asset["realm"] == query["realm"]["name"]]
+        if query.get("parents"):
+            parents = {parent.get("id") for parent in query["parents"]}
+            assets = [asset for asset in assets if asset["parentId"] in parents]
+
+        offset = query.get("offset") or 0
+        limit = query.get("limit")
+        assets = assets[offset:offset + limit if limit else None]
+
+        if (query.get("select") or {}).get("basic"):
+            assets = [{**asset, "attributes": {}} for asset in assets]
+
+        return JSONResponse(assets)
+
+    def app(self) -> Starlette:
+        return Starlette(routes=[
+            Route("/auth/realms/master/protocol/openid-connect/token", self.token, methods=["POST"]),
+            Route("/api/master/service", self.register_service, methods=["POST"]),
+            Route("/api/master/service/{service_id}/{instance_id}", self.service_instance, methods=["PUT", "DELETE"]),
+            Route("/api/master/health", self.health, methods=["GET"]),
+            Route("/api/master/realm", self.realms_list, methods=["GET"]),
+            Route("/api/master/realm/{name}", self.realm, methods=["GET"]),
+            Route("/api/master/model/assetInfos", self.asset_infos_list, methods=["GET"]),
+            Route("/api/master/model/assetInfo/{asset_type}", self.asset_info, methods=["GET"]),
+            Route("/api/master/asset", self.create_asset, methods=["POST"]),
+            Route("/api/master/asset/query", self.query, methods=["POST"]),
+            Route("/api/master/asset/attributes", self.write_attributes, methods=["PUT"]),
+            Route("/api/master/asset/{asset_id}", self.asset, methods=["GET"]),
+        ])
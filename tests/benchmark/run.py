@@ -0,0 +1,243 @@
+# Copyright 2025, OpenRemote Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+
+"""
+Load and latency benchmark of the MCP server against a fake OpenRemote.
+
+Starts the fake OpenRemote and `app.app` in this process, drives the server with concurrent MCP clients
+and writes p50/p95/p99 latency and calls/sec per tool to a JSON file:
+
+    python -m tests.benchmark.run --clients 20 --rounds 10 --output .cache/benchmark.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from dataclasses import asdict
+from datetime import datetime, timezone
+from typing import Callable
+
+import uvicorn
+from fastmcp import Client
+
+from .fake_openremote import FakeOpenRemote, FakeOpenRemoteConfig
+
+RESULT_FORMAT_VERSION = 1
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+async def start_server(app, port: int) -> tuple[uvicorn.Server, asyncio.Task]:
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning", lifespan="on"))
+    task = asyncio.create_task(server.serve())
+
+    while not server.started:
+        if task.done():
+            task.result()
+        await asyncio.sleep(0.05)
+
+    return server, task
+
+
+async def stop_server(server: uvicorn.Server, task: asyncio.Task):
+    server.should_exit = True
+    await task
+
+
+def percentile(latencies: list[float], percent: int) -> float:
+    if len(latencies) == 1:
+        return latencies[0]
+
+    return statistics.quantiles(latencies, n=100, method='inclusive')[percent - 1]
+
+
+def summarize(latencies: list[float], errors: int, duration: float) -> dict:
+    """Latency percentiles in milliseconds and throughput of a single tool."""
+    calls = len(latencies) + errors
+    summary = {"calls": calls, "errors": errors, "calls_per_sec": round(calls / duration, 2) if duration else 0}
+
+    if latencies:
+        summary.update({
+            "mean_ms": round(statistics.fmean(latencies) * 1000, 2),
+            "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+            "p95_ms": round(percentile(latencies, 95) * 1000, 2),
+            "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+            "max_ms": round(max(latencies) * 1000, 2),
+        })
+
+    return summary
+
+
+def scenarios(fake: FakeOpenRemote) -> dict[str, Callable[[random.Random], dict]]:
+    """
+    Tool calls of a typical agent session, with random arguments that exist in the fake data.
+
+    Arguments differ per call, so concurrent clients don't simply share each other's upstream requests.
+    """
+    asset_ids = [asset["id"] for asset in fake.assets]
+    asset_types = [info["assetDescriptor"]["name"] for info in fake.asset_infos]
+
+    return {
+        "tools/list": lambda rng: {},
+        "asset_model_get_all_types": lambda rng: {},
+        "asset_model_get_type": lambda rng: {"asset_type": rng.choice(asset_types)},
+        "realm_get_all": lambda rng: {},
+        "realm_get_by_name": lambda rng: {"realm_name": rng.choice(fake.realms)},
+        "asset_query": lambda rng: {
+            "asset_query_schema": {"types": rng.sample(asset_types, min(5, len(asset_types))), "limit": 50},
+            "fields": ["summary"],
+        },
+        "asset_query_page": lambda rng: {"asset_query_schema": {"realm": {"name": rng.choice(fake.realms)}}, "limit": 100},
+        "asset_get_by_id": lambda rng: {"asset_id": rng.choice(asset_ids)},
+        "asset_get_by_ids": lambda rng: {"asset_ids": rng.sample(asset_ids, min(50, len(asset_ids))), "fields": ["summary"]},
+    }
+
+
+async def run_client(url: str, calls: dict[str, Callable[[random.Random], dict]], rounds: int, results: dict[str, dict], seed: int):
+    rng = random.Random(seed)
+
+    async with Client(url) as client:
+        for _ in range(rounds):
+            for tool, arguments in calls.items():
+                result = results[tool]
+                started = time.perf_counter()
+
+                try:
+                    if tool == "tools/list":
+                        await client.list_tools()
+                    else:
+                        await client.call_tool(tool, arguments(rng))
+                except Exception:
+                    result["errors"] += 1
+                else:
+                    result["latencies"].append(time.perf_counter() - started)
+
+
+async def benchmark(clients: int, rounds: int, fake_config: FakeOpenRemoteConfig) -> dict:
+    fake = FakeOpenRemote(fake_config)
+    fake_port, app_port = free_port(), free_port()
+
+    # The app reads its configuration on import, so point it at the fake first
+    os.environ.update({
+        "OPENREMOTE_URL": f"http://127.0.0.1:{fake_port}",
+        "OPENREMOTE_CLIENT_ID": "benchmark",
+        "OPENREMOTE_CLIENT_SECRET": "benchmark",
+        "OPENREMOTE_VERIFY_SSL": "false",
+        "APP_ASSET_SNAPSHOT_PATH": "",
+        "APP_ASSET_RECONCILE_INTERVAL": "0",
+        "APP_RATE_LIMIT_SESSION_RATE": "0",
+        "APP_RATE_LIMIT_CLIENT_RATE": "0",
+    })
+    from app import app
+
+    fake_server = await start_server(fake.app(), fake_port)
+    app_server = await start_server(app, app_port)
+
+    try:
+        url = f"http://127.0.0.1:{app_port}/mcp"
+        calls = scenarios(fake)
+        results = {tool: {"latencies": [], "errors": 0} for tool in calls}
+
+        # One client first, so connection setup and caches don't end up in the numbers
+        await run_client(url, calls, 1, {tool: {"latencies": [], "errors": 0} for tool in calls}, seed=0)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(run_client(url, calls, rounds, results, seed=i + 1) for i in range(clients)))
+        duration = time.perf_counter() - started
+    finally:
+        await stop_server(*app_server)
+        await stop_server(*fake_server)
+
+    total_calls = sum(len(r["latencies"]) + r["errors"] for r in results.values())
+
+    return {
+        "format_version": RESULT_FORMAT_VERSION,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "version": git_revision(),
+        "python": platform.python_version(),
+        "parameters": {"clients": clients, "rounds": rounds, "fake_openremote": asdict(fake_config)},
+        "duration_sec": round(duration, 3),
+        "calls_per_sec": round(total_calls / duration, 2),
+        "upstream_requests": fake.requests,
+        "tools": {tool: summarize(r["latencies"], r["errors"], duration) for tool, r in results.items()},
+    }
+
+
+def git_revision() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_report(report: dict):
+    print(f"{'tool':<28}{'calls':>8}{'errors':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'calls/s':>10}")
+
+    for tool, summary in report["tools"].items():
+        print(
+            f"{tool:<28}{summary['calls']:>8}{summary['errors']:>8}{summary.get('p50_ms', '-'):>10}"
+            f"{summary.get('p95_ms', '-'):>10}{summary.get('p99_ms', '-'):>10}{summary['calls_per_sec']:>10}"
+        )
+
+    print(f"\n{report['calls_per_sec']} calls/s in total, {report['upstream_requests']} requests to OpenRemote")
+
+
+def main(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--clients", type=int, default=20, help="Concurrent MCP clients")
+    parser.add_argument("--rounds", type=int, default=10, help="Times every client calls every tool")
+    parser.add_argument("--latency", type=float, default=0.01, help="Seconds the fake OpenRemote takes per request")
+    parser.add_argument("--jitter", type=float, default=0.005, help="Random deviation of the latency in seconds")
+    parser.add_argument("--realms", type=int, default=5)
+    parser.add_argument("--asset-types", type=int, default=200)
+    parser.add_argument("--assets", type=int, default=5000)
+    parser.add_argument("--output", default=".cache/benchmark.json", help="File the results are written to")
+    args = parser.parse_args(argv)
+
+    fake_config = FakeOpenRemoteConfig(
+        realms=args.realms,
+        asset_types=args.asset_types,
+        assets=args.assets,
+        latency=args.latency,
+        jitter=args.jitter,
+    )
+    report = asyncio.run(benchmark(args.clients, args.rounds, fake_config))
+
+    os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+
+    print_report(report)
+    print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,164 @@
+# Copyright 2025, OpenRemote Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+"""
+Startup benchmark of the MCP server against a fake OpenRemote.
+
+Starts the server in a new process, so imports are included, and measures the time until the first
+tools/list succeeds. The startup profile of every run is included in the JSON results:
+
+    python -m tests.benchmark.startup --runs 5 --output .cache/benchmark_startup.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import asdict
+from datetime import datetime, timezone
+from pathlib import Path
+
+from fastmcp import Client
+
+from .fake_openremote import FakeOpenRemote, FakeOpenRemoteConfig
+from .run import free_port, start_server, stop_server, git_revision
+
+RESULT_FORMAT_VERSION = 1
+
+ROOT = Path(__file__).resolve().parents[2]
+
+
+async def first_tools_list(url: str, process: subprocess.Popen, timeout: float) -> int:
+    """Wait until the server answers tools/list and return the number of tools."""
+    deadline = time.perf_counter() + timeout
+
+    while True:
+        if process.poll() is not None:
+            raise RuntimeError(f"Server exited with code {process.returncode} before listing its tools")
+
+        try:
+            async with Client(url) as client:
+                return len(await client.list_tools())
+        except Exception:
+            if time.perf_counter() > deadline:
+                raise TimeoutError(f"Server didn't list its tools within {timeout} seconds")
+
+            await asyncio.sleep(0.02)
+
+
+async def run_once(fake_port: int, snapshot_path: str, profile_path: str, timeout: float) -> dict:
+    app_port = free_port()
+    env = {
+        **os.environ,
+        "OPENREMOTE_URL": f"http://127.0.0.1:{fake_port}",
+        "OPENREMOTE_CLIENT_ID": "benchmark",
+        "OPENREMOTE_CLIENT_SECRET": "benchmark",
+        "OPENREMOTE_VERIFY_SSL": "false",
+        "APP_ASSET_SNAPSHOT_PATH": snapshot_path,
+        "APP_ASSET_RECONCILE_INTERVAL": "0",
+        "APP_STARTUP_PROFILE": "true",
+        "APP_STARTUP_PROFILE_PATH": profile_path,
+    }
+
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app:app", "--host", "127.0.0.1", "--port", str(app_port), "--log-level", "warning"],
+        cwd=ROOT,
+        env=env,
+    )
+
+    try:
+        tools = await first_tools_list(f"http://127.0.0.1:{app_port}/mcp", process, timeout)
+        duration = time.perf_counter() - started
+    finally:
+        process.terminate()
+        process.wait()
+
+    with open(profile_path, encoding="utf-8") as f:
+        profile = json.load(f)
+
+    return {"time_to_first_tools_list_ms": round(duration * 1000, 2), "tools": tools, "profile": profile}
+
+
+async def benchmark(runs: int, snapshot: bool, timeout: float, fake_config: FakeOpenRemoteConfig) -> dict:
+    fake = FakeOpenRemote(fake_config)
+    fake_port = free_port()
+    fake_server = await start_server(fake.app(), fake_port)
+
+    try:
+        with tempfile.TemporaryDirectory() as directory:
+            # With a snapshot, the first run writes it and the other runs start from it
+            snapshot_path = os.path.join(directory, "asset_infos.json") if snapshot else ""
+            profile_path = os.path.join(directory, "startup_profile.json")
+
+            results = [await run_once(fake_port, snapshot_path, profile_path, timeout) for _ in range(runs)]
+    finally:
+        await stop_server(*fake_server)
+
+    return {
+        "format_version": RESULT_FORMAT_VERSION,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "version": git_revision(),
+        "python": platform.python_version(),
+        "parameters": {"runs": runs, "snapshot": snapshot, "fake_openremote": asdict(fake_config)},
+        "median_ms": round(statistics.median(r["time_to_first_tools_list_ms"] for r in results), 2),
+        "runs": results,
+    }
+
+
+def print_report(report: dict):
+    phases = list(report["runs"][0]["profile"]["phases"])
+    print(f"{'run':<6}{'first tools/list ms':>22}{'startup ms':>12}" + "".join(f"{phase[:18]:>20}" for phase in phases))
+
+    for i, run in enumerate(report["runs"], start=1):
+        profile = run["profile"]
+        print(
+            f"{i:<6}{run['time_to_first_tools_list_ms']:>22}{profile['total_ms']:>12}"
+            + "".join(f"{profile['phases'].get(phase, '-'):>20}" for phase in phases)
+        )
+
+    print(f"\nMedian time to first tools/list: {report['median_ms']} ms")
+
+
+def main(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5, help="Times the server is started")
+    parser.add_argument("--snapshot", action="store_true", help="Start from an asset model snapshot after the first run")
+    parser.add_argument("--timeout", type=float, default=60, help="Seconds a single startup may take")
+    parser.add_argument("--latency", type=float, default=0.01, help="Seconds the fake OpenRemote takes per request")
+    parser.add_argument("--asset-types", type=int, default=200)
+    parser.add_argument("--output", default=".cache/benchmark_startup.json", help="File the results are written to")
+    args = parser.parse_args(argv)
+
+    fake_config = FakeOpenRemoteConfig(asset_types=args.asset_types, latency=args.latency, jitter=0)
+    report = asyncio.run(benchmark(args.runs, args.snapshot, args.timeout, fake_config))
+
+    os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+
+    print_report(report)
+    print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
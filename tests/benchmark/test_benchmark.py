@@ -0,0 +1,60 @@
+# Copyright 2025, OpenRemote Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+"""Tests for the benchmark harness itself."""
+import httpx
+import pytest
+
+from .fake_openremote import FakeOpenRemote, FakeOpenRemoteConfig
+from .run import summarize
+
+
+class TestFakeOpenRemote:
+    """Test cases for the fake OpenRemote backend."""
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_query_filters_and_pages(self):
+        """Test asset queries are filtered, paged and slimmed like OpenRemote does."""
+        fake = FakeOpenRemote(FakeOpenRemoteConfig(asset_types=3, assets=100, latency=0, jitter=0))
+        transport = httpx.ASGITransport(app=fake.app())
+
+        async with httpx.AsyncClient(transport=transport, base_url="http://openremote") as client:
+            response = await client.post("/api/master/asset/query", json={
+                "realm": {"name": "master"}, "limit": 5, "offset": 1, "select": {"basic": True},
+            })
+            missing = await client.get("/api/master/asset/unknown")
+
+        expected = [asset["id"] for asset in fake.assets if asset["realm"] == "master"][1:6]
+        assert [asset["id"] for asset in response.json()] == expected
+        assert all(asset["attributes"] == {} for asset in response.json())
+        assert missing.status_code == 404
+        assert fake.requests == 2
+
+
+class TestSummary:
+    """Test cases for summarizing the measured latencies."""
+
+    @pytest.mark.unit
+    def test_percentiles(self):
+        """Test latencies are summarized in milliseconds with throughput over the whole run."""
+        summary = summarize([i / 1000 for i in range(1, 101)], errors=2, duration=2)
+
+        assert summary["calls"] == 102
+        assert summary["calls_per_sec"] == 51
+        assert summary["p50_ms"] == 50.5
+        assert summary["p99_ms"] == 99.01
@@ -18,6 +18,7 @@
 """Shared pytest fixtures for all tests."""
 import pytest
 import os
+import sys
 from unittest.mock import AsyncMock, MagicMock, patch
 from httpx import Response
 import json
@@ -118,6 +119,19 @@ def reset_singletons():
         # Shared module doesn't exist in this project structure
         pass
 
+    # Drop cached OpenRemote responses so tests don't see each other's data
+    asset_model = sys.modules.get("app.services.asset_model")
+    if asset_model is not None:
+        asset_model.invalidate_asset_model_cache()
+
+    health = sys.modules.get("app.health")
+    if health is not None:
+        health.health_prober.reset()
+
+    metrics = sys.modules.get("app.utils.metrics")
+    if metrics is not None:
+        metrics.metrics_registry.clear()
+
 
 @pytest.fixture
 def mock_env_vars(monkeypatch):
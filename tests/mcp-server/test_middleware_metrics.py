@@ -0,0 +1,88 @@
+# Copyright 2025, OpenRemote Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+"""Tests for the metrics middleware and the /metrics endpoint."""
+import httpx
+import pytest
+from fastmcp import FastMCP, Client
+from unittest.mock import AsyncMock
+
+from app.metrics import init_metrics
+from app.middleware.metrics import (
+    UpstreamMetrics,
+    mcp_tool_calls_total,
+    mcp_tool_duration_seconds,
+    mcp_tool_errors_total,
+    openremote_heartbeats_total,
+    openremote_requests_total,
+)
+from services.upstream import OpenRemoteUpstream
+
+
+class TestMetricsMiddleware:
+    """Test cases for measuring tool calls and upstream calls."""
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_tool_calls_are_measured(self):
+        """Test every tool call is counted and timed, and errors are counted by type."""
+        server = FastMCP("Test")
+        init_metrics(server)
+
+        @server.tool
+        def ping() -> str:
+            return "pong"
+
+        @server.tool
+        def fail() -> str:
+            raise ValueError("Broken")
+
+        async with Client(server) as client:
+            await client.call_tool("ping")
+            await client.call_tool("fail", raise_on_error=False)
+            for name in ("made_up_1", "made_up_2"):
+                await client.call_tool(name, raise_on_error=False)
+
+        assert mcp_tool_calls_total.value(tool="ping") == 1
+        # Names that are not tools of the server don't get a series of their own
+        assert mcp_tool_calls_total.value(tool="unknown") == 2
+        assert mcp_tool_calls_total.value(tool="made_up_1") == 0
+        assert mcp_tool_duration_seconds.count(tool="ping") == 1
+        assert mcp_tool_errors_total.value(tool="fail", error="ToolError") == 1
+
+        transport = httpx.ASGITransport(app=server.http_app())
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as http_client:
+            response = await http_client.get("/metrics")
+
+        assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+        assert 'mcp_tool_calls_total{tool="ping"} 1' in response.text
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_upstream_calls_and_heartbeats_are_measured(self, mock_openremote_client):
+        """Test upstream calls are counted per endpoint, and heartbeats by outcome."""
+        mock_openremote_client.services.heartbeat = AsyncMock(side_effect=[None, RuntimeError("Unavailable")])
+        upstream = OpenRemoteUpstream(mock_openremote_client, interceptors=[UpstreamMetrics()])
+
+        await upstream.realm.get_realm("master")
+        await upstream.services.heartbeat("MCP-Server", 1)
+        with pytest.raises(RuntimeError):
+            await upstream.services.heartbeat("MCP-Server", 1)
+
+        assert openremote_requests_total.value(endpoint="realm.get_realm", outcome="success") == 1
+        assert openremote_heartbeats_total.value(outcome="success") == 1
+        assert openremote_heartbeats_total.value(outcome="error") == 1
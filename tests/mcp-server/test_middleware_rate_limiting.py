@@ -0,0 +1,174 @@
+# Copyright 2025, OpenRemote Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+"""Tests for the rate limiting middleware."""
+import asyncio
+import pytest
+from fastmcp import FastMCP, Client
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from app.middleware import RateLimitingMiddleware, RateLimitExceededError
+from app.middleware.rate_limiting import FairScheduler
+
+
+class TestRateLimitingMiddleware:
+    """Test cases for limiting tool calls per session and client."""
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_session_over_limit_gets_retry_after(self):
+        """Test a session over its burst is rejected while other sessions can still call tools."""
+        middleware = RateLimitingMiddleware(session_rate=1, session_burst=2, client_rate=0, client_burst=0, concurrency=4)
+        call_next = AsyncMock(return_value="ok")
+
+        with patch.object(RateLimitingMiddleware, 'identify', side_effect=lambda ctx: (ctx, "client")):
+            assert await middleware.on_call_tool(MagicMock(fastmcp_context="a"), call_next) == "ok"
+            assert await middleware.on_call_tool(MagicMock(fastmcp_context="a"), call_next) == "ok"
+
+            with pytest.raises(RateLimitExceededError) as error:
+                await middleware.on_call_tool(MagicMock(fastmcp_context="a"), call_next)
+
+            assert await middleware.on_call_tool(MagicMock(fastmcp_context="b"), call_next) == "ok"
+
+        assert 0 < error.value.retry_after <= 1
+        assert error.value.error.data["scope"] == "session"
+        assert call_next.await_count == 3
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_client_limit_spans_sessions(self):
+        """Test the client limit counts the calls of all its sessions together."""
+        server = FastMCP("Test")
+        server.add_middleware(RateLimitingMiddleware(session_rate=0, session_burst=0, client_rate=1, client_burst=2, concurrency=4))
+
+        @server.tool
+        def ping() -> str:
+            return "pong"
+
+        with patch.object(RateLimitingMiddleware, 'identify', return_value=("session", "client")):
+            async with Client(server) as first, Client(server) as second:
+                await first.call_tool("ping")
+                await second.call_tool("ping")
+
+                with pytest.raises(Exception, match="retry after"):
+                    await first.call_tool("ping")
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_rejected_call_charges_neither_limit(self):
+        """Test a call rejected by the client limit doesn't use up tokens of its session."""
+        middleware = RateLimitingMiddleware(session_rate=0.01, session_burst=2, client_rate=0.01, client_burst=1, concurrency=4)
+        call_next = AsyncMock(return_value="ok")
+
+        with patch.object(RateLimitingMiddleware, 'identify', side_effect=lambda ctx: ("session", ctx)):
+            assert await middleware.on_call_tool(MagicMock(fastmcp_context="first"), call_next) == "ok"
+
+            for _ in range(3):
+                with pytest.raises(RateLimitExceededError) as error:
+                    await middleware.on_call_tool(MagicMock(fastmcp_context="first"), call_next)
+                assert error.value.error.data["scope"] == "client"
+
+            # The session still has the token the rejected calls didn't take
+            assert await middleware.on_call_tool(MagicMock(fastmcp_context="second"), call_next) == "ok"
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_buckets_of_active_sessions_are_bounded(self):
+        """Test the least recently used buckets are dropped when every session is still active."""
+        middleware = RateLimitingMiddleware(session_rate=0.01, session_burst=5, client_rate=0, client_burst=0, concurrency=4)
+        call_next = AsyncMock(return_value="ok")
+
+        with patch('app.middleware.rate_limiting.MAX_BUCKETS', 3), \
+                patch.object(RateLimitingMiddleware, 'identify', side_effect=lambda ctx: (ctx, "client")):
+            for session in ("a", "b", "c", "a", "d"):
+                await middleware.on_call_tool(MagicMock(fastmcp_context=session), call_next)
+
+        assert list(middleware._RateLimitingMiddleware__session_buckets) == ["c", "a", "d"]
+
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_changing_client_id_does_not_reset_the_client_limit(self):
+        """Test a client can't get a fresh bucket by sending another client id in the request metadata."""
+        middleware = RateLimitingMiddleware(session_rate=0, session_burst=0, client_rate=0.01, client_burst=1, concurrency=4)
+        call_next = AsyncMock(return_value="ok")
+
+        def context(client_id: str):
+            fastmcp_context = MagicMock(session_id=client_id, client_id=client_id)
+            fastmcp_context.request_context.request.client.host = "10.0.0.1"
+            return MagicMock(fastmcp_context=fastmcp_context)
+
+        assert await middleware.on_call_tool(context("first"), call_next) == "ok"
+
+        with pytest.raises(RateLimitExceededError):
+            await middleware.on_call_tool(context("second"), call_next)
+
+    @pytest.mark.unit
+    def test_authenticated_clients_are_identified_by_subject(self):
+        """Test the subject of the access token identifies the client, rather than its address."""
+        fastmcp_context = MagicMock(session_id="session", client_id="made-up")
+        fastmcp_context.request_context.request.client.host = "10.0.0.1"
+        access_token = MagicMock(subject="user-1", client_id="mcp-client")
+
+        with patch('app.middleware.rate_limiting.get_access_token', return_value=access_token):
+            assert RateLimitingMiddleware.identify(fastmcp_context) == ("session", "user-1")
+
+
+class TestFairScheduler:
+    """Test cases for round-robin scheduling of waiting sessions."""
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_waiting_sessions_are_served_round_robin(self):
+        """Test a session with many queued calls doesn't hold up a session that queued later."""
+        scheduler = FairScheduler(limit=1)
+        order = []
+
+        async def call(session: str, name: str):
+            await scheduler.acquire(session)
+            order.append(name)
+            await asyncio.sleep(0)
+            scheduler.release()
+
+        await scheduler.acquire("busy")
+        tasks = [asyncio.create_task(call("busy", f"busy-{i}")) for i in range(3)]
+        await asyncio.sleep(0)
+        tasks.append(asyncio.create_task(call("quiet", "quiet-0")))
+        await asyncio.sleep(0)
+
+        assert scheduler.waiting == 4
+        scheduler.release()
+        await asyncio.gather(*tasks)
+
+        assert order == ["busy-0", "quiet-0", "busy-1", "busy-2"]
+        assert scheduler.active == 0
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_leaves_the_queue(self):
+        """Test a cancelled call gives up its place in the queue."""
+        scheduler = FairScheduler(limit=1)
+        await scheduler.acquire("a")
+
+        waiter = asyncio.create_task(scheduler.acquire("b"))
+        await asyncio.sleep(0)
+        waiter.cancel()
+        await asyncio.gather(waiter, return_exceptions=True)
+
+        assert scheduler.waiting == 0
+        scheduler.release()
+        assert scheduler.active == 0
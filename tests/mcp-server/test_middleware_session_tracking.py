@@ -0,0 +1,89 @@
+# Copyright 2025, OpenRemote Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+
+"""Tests for the session tracking middleware."""
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from app.middleware import SessionTrackingMiddleware
+
+
+class FakeSession:
+    def __init__(self, fail: bool = False):
+        self.send_tool_list_changed = AsyncMock(side_effect=RuntimeError("Disconnected") if fail else None)
+
+
+class TestSessionTrackingMiddleware:
+    """Test cases for notifying connected clients."""
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_sessions_are_tracked_and_notified(self):
+        """Test sessions seen in requests receive tool list changed notifications."""
+        middleware = SessionTrackingMiddleware()
+        session = FakeSession()
+        context = MagicMock()
+        context.fastmcp_context.session = session
+
+        await middleware.on_request(context, AsyncMock())
+        await middleware.notify_tool_list_changed()
+
+        session.send_tool_list_changed.assert_called_once()
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_disconnected_sessions_are_dropped(self):
+        """Test sessions that fail to receive notifications are forgotten."""
+        middleware = SessionTrackingMiddleware()
+        session = FakeSession(fail=True)
+        middleware.sessions.add(session)
+
+        await middleware.notify_tool_list_changed()
+
+        assert session not in middleware.sessions
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_tool_registry_change_schedules_notification(self):
+        """Test a tool registry change notifies clients in the background."""
+        middleware = SessionTrackingMiddleware()
+        session = FakeSession()
+        middleware.sessions.add(session)
+
+        middleware.on_tool_registry_changed()
+        await asyncio.sleep(0)
+
+        session.send_tool_list_changed.assert_called_once()
+
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_pending_notifications_are_referenced_until_done(self):
+        """Test a scheduled notification is kept alive until it completes, then released."""
+        middleware = SessionTrackingMiddleware()
+        middleware.sessions.add(FakeSession())
+
+        middleware.on_tool_registry_changed()
+        pending = set(middleware._SessionTrackingMiddleware__notifications)
+
+        assert len(pending) == 1
+
+        await asyncio.gather(*pending)
+
+        assert not middleware._SessionTrackingMiddleware__notifications
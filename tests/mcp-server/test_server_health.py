@@ -78,3 +78,81 @@ class TestHealth:
             assert body["status"] == "unhealthy"
             assert body["service_id"] == config.openremote_service_id
             assert "error" in body
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_health_endpoint_serves_cached_result(self, mock_openremote_client):
+        """Test health requests are answered from the last probe result."""
+        with patch('app.health.get_openremote_service') as mock_get_service:
+            mock_service = MagicMock()
+            mock_service.client = mock_openremote_client
+            mock_get_service.return_value = mock_service
+
+            from app.health import health
+
+            await health(None)
+            await health(None)
+            response = await health(None)
+
+            import json
+            body = json.loads(response.body.decode())
+            assert body["status"] == "healthy"
+            assert "latency_ms" in body
+            mock_openremote_client.status.get_health_status.assert_called_once()
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_health_endpoint_reports_upstream_state(self, mock_openremote_client):
+        """Test the circuit breaker and bulkhead state of the upstream calls are part of the health."""
+        from services.resilience import CircuitBreaker
+        from services.upstream import Bulkhead, OpenRemoteUpstream
+
+        upstream = OpenRemoteUpstream(mock_openremote_client, interceptors=[
+            CircuitBreaker(failure_threshold=5, reset_timeout=30),
+            Bulkhead(limits={"asset": 4}, default_limit=4, reserved_limit=1),
+        ])
+
+        with patch('app.health.get_openremote_service') as mock_get_service:
+            mock_get_service.return_value = MagicMock(client=upstream)
+
+            from app.health import health
+
+            response = await health(None)
+
+        import json
+        body = json.loads(response.body.decode())
+        assert body["upstream"]["circuit_breaker"]["state"] == "closed"
+        assert body["upstream"]["bulkheads"]["reserved"] == {"limit": 1, "active": 0, "waiting": 0}
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_liveness(self):
+        """Test liveness does not depend on OpenRemote."""
+        from app.health import live
+
+        response = await live(None)
+
+        assert response.status_code == 200
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_readiness(self, mock_openremote_client):
+        """Test readiness requires compiled tools and a recent successful probe."""
+        with patch('app.health.get_openremote_service') as mock_get_service:
+            mock_service = MagicMock()
+            mock_service.client = mock_openremote_client
+            mock_get_service.return_value = mock_service
+
+            from app.health import ready, health_prober
+
+            with patch('app.health.get_tool_registry_version', return_value=1):
+                response = await ready(None)
+                assert response.status_code == 503
+
+                await health_prober.probe()
+                response = await ready(None)
+                assert response.status_code == 200
+
+            with patch('app.health.get_tool_registry_version', return_value=0):
+                response = await ready(None)
+                assert response.status_code == 503
@@ -0,0 +1,117 @@
+# Copyright 2025, OpenRemote Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+
+"""Tests for MCP server homepage."""
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from fastmcp.tools import Tool
+from starlette.requests import Request
+
+
+def make_request(headers: dict | None = None) -> Request:
+    return Request({
+        "type": "http",
+        "method": "GET",
+        "path": "/",
+        "headers": [(key.lower().encode(), value.encode()) for key, value in (headers or {}).items()],
+    })
+
+
+def make_mcp() -> MagicMock:
+    async def get_all():
+        """Retrieve all realms."""
+
+    mcp = MagicMock()
+    mcp.get_tools = AsyncMock(return_value={"realm_get_all": Tool.from_function(get_all, name="realm_get_all")})
+    return mcp
+
+
+class TestHomepage:
+    """Test cases for the pre-rendered homepage."""
+
+    @pytest.fixture(autouse=True)
+    def reset(self):
+        from app.homepage import reset_homepage
+        reset_homepage()
+        yield
+        reset_homepage()
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_homepage_is_rendered_once_per_registry_version(self):
+        """Test the homepage is only rendered again when the tool set changes."""
+        from app.homepage import render_homepage
+        from app.utils import tool_registry_changed
+
+        mcp = make_mcp()
+
+        first = await render_homepage(mcp)
+        second = await render_homepage(mcp)
+
+        assert first is second
+        assert b"realm_get_all" in first.body
+        mcp.get_tools.assert_called_once()
+
+        tool_registry_changed()
+        await render_homepage(mcp)
+
+        assert mcp.get_tools.call_count == 2
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_homepage_does_not_compile_lazy_tools(self):
+        """Test rendering the homepage leaves lazy tools uncompiled, their schema is only built on use."""
+        from app.homepage import render_homepage
+        from app.utils import LazyTool
+
+        compile_fn = MagicMock()
+        mcp = make_mcp()
+        mcp.get_tools.return_value["create_Thing"] = LazyTool(
+            name="create_Thing", description="Create a new 'Thing'.", compile_fn=compile_fn,
+        )
+
+        rendered = await render_homepage(mcp)
+
+        assert b"create_Thing" in rendered.body
+        compile_fn.assert_not_called()
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_homepage_not_modified(self):
+        """Test the homepage answers 304 when the ETag matches."""
+        from app.homepage import init_homepage
+
+        mcp = make_mcp()
+        routes = {}
+        mcp.custom_route = lambda path, methods: lambda fn: routes.setdefault(path, fn)
+        init_homepage(mcp)
+
+        response = await routes["/"](make_request())
+        etag = response.headers["etag"]
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/html")
+
+        not_modified = await routes["/"](make_request({"If-None-Match": etag}))
+
+        assert not_modified.status_code == 304
+        assert not_modified.body == b""
+
+        modified = await routes["/"](make_request({"If-None-Match": '"outdated"'}))
+
+        assert modified.status_code == 200
@@ -0,0 +1,105 @@
+# Copyright 2025, OpenRemote Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+"""Tests for draining the server before it stops."""
+import asyncio
+
+import httpx
+import pytest
+from sse_starlette.sse import AppStatus
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+from app.middleware import DrainingMiddleware
+from app.shutdown import GracefulShutdown
+
+
+@pytest.fixture(autouse=True)
+def restore_app_status():
+    yield
+    AppStatus.should_exit = False
+
+
+def mcp_app(shutdown: GracefulShutdown, started: asyncio.Event | None = None, release: asyncio.Event | None = None):
+    async def mcp(request):
+        if started is not None:
+            started.set()
+            await release.wait()
+        return JSONResponse({"jsonrpc": "2.0", "id": 1, "result": {}})
+
+    return DrainingMiddleware(Starlette(routes=[Route("/mcp", mcp, methods=["POST"])]), shutdown=shutdown)
+
+
+class TestGracefulShutdown:
+    """Test cases for draining requests in flight."""
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_drain_waits_for_requests_in_flight(self):
+        """Test draining waits until the requests in flight finished, then closes the streams."""
+        shutdown = GracefulShutdown(timeout=5)
+        started, release = asyncio.Event(), asyncio.Event()
+        transport = httpx.ASGITransport(app=mcp_app(shutdown, started, release))
+
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            call = asyncio.create_task(client.post("/mcp", headers={"mcp-session-id": "1"}))
+            await started.wait()
+
+            draining = asyncio.create_task(shutdown.drain())
+            await asyncio.sleep(0.05)
+            assert shutdown.draining and not draining.done()
+            assert not AppStatus.should_exit
+
+            release.set()
+            assert (await call).status_code == 200
+            assert await draining
+            assert AppStatus.should_exit
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_drain_gives_up_after_timeout(self):
+        """Test draining doesn't wait longer than the timeout."""
+        shutdown = GracefulShutdown(timeout=0.05)
+        listener_calls = []
+        shutdown.add_listener(lambda: listener_calls.append(True))
+
+        async with shutdown.request():
+            assert not await shutdown.drain()
+
+        assert listener_calls == [True]
+
+
+class TestDrainingMiddleware:
+    """Test cases for turning away new sessions while draining."""
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_new_sessions_are_rejected_while_draining(self):
+        """Test only requests to start a new session are answered with 503."""
+        shutdown = GracefulShutdown(timeout=1)
+        transport = httpx.ASGITransport(app=mcp_app(shutdown))
+
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            assert (await client.post("/mcp")).status_code == 200
+
+            shutdown.begin()
+
+            rejected = await client.post("/mcp")
+            assert rejected.status_code == 503
+            assert rejected.json()["error"]["message"] == "Server is shutting down"
+            assert (await client.post("/mcp", headers={"Mcp-Session-Id": "1"})).status_code == 200
@@ -0,0 +1,59 @@
+# Copyright 2025, OpenRemote Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+"""Tests for the startup profiler."""
+import json
+
+import pytest
+
+from app.startup import StartupProfiler
+
+
+class TestStartupProfiler:
+    """Test cases for timing the startup phases."""
+
+    @pytest.mark.unit
+    def test_phases_add_up_and_marks_exclude_them(self):
+        """Test repeated phases add up, and a mark doesn't count the phases timed since the previous mark."""
+        profiler = StartupProfiler()
+
+        for _ in range(2):
+            with profiler.phase("model generation"):
+                pass
+        profiler.mark("imports")
+
+        profiler.finish()
+        with profiler.phase("model generation"):
+            pass
+
+        report = profiler.report()
+        assert list(report["phases"]) == ["model generation", "imports"]
+        assert report["phases"]["imports"] >= 0
+        assert report["total_ms"] >= sum(report["phases"].values()) - 0.01
+
+    @pytest.mark.unit
+    def test_log_report_writes_json(self, tmp_path):
+        """Test the report is written to the given path."""
+        profiler = StartupProfiler()
+        with profiler.phase("registration"):
+            pass
+        profiler.finish()
+
+        path = tmp_path / "profile" / "startup.json"
+        profiler.log_report(str(path))
+
+        assert json.loads(path.read_text()) == profiler.report()
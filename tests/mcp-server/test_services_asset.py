@@ -16,6 +16,8 @@
 # SPDX-License-Identifier: AGPL-3.0-or-later
 
 """Tests for MCP server asset service."""
+import asyncio
+import httpx
 import pytest
 from unittest.mock import AsyncMock, MagicMock, patch
 from httpx import HTTPStatusError, Response
@@ -151,3 +153,745 @@ class TestAssetService:
             assert isinstance(result, dict)
             # Error can have status_code (HTTPStatusError) or just detail (generic Exception)
             assert "detail" in result or "status_code" in result
+
+
+class TestAssetProjection:
+    """Test cases for the 'fields' argument of the asset read tools."""
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_query_summary_skips_attributes_upstream(self, mock_openremote_client, sample_asset):
+        """Test a projection without attributes asks OpenRemote for basic assets only."""
+        asset = AssetObjectSchema.model_construct(**sample_asset)
+        mock_openremote_client.asset.query_assets = AsyncMock(return_value=MagicMock(content=[asset]))
+
+        with patch('app.services.asset.get_openremote_service') as mock_get_service:
+            mock_get_service.return_value = MagicMock(client=mock_openremote_client)
+
+            from app.services.asset import query, AssetQuerySchemaDescription
+
+            result = await query.fn(AssetQuerySchemaDescription(types=["ThingAsset"]), fields=["summary"])
+
+        assert result == [{
+            "id": asset.id, "name": asset.name, "type": asset.type, "parentId": asset.parentId, "realm": asset.realm,
+        }]
+        assert mock_openremote_client.asset.query_assets.call_args.args[0].select.basic is True
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_get_by_id_with_unknown_field(self, mock_openremote_client):
+        """Test unknown fields are reported without calling OpenRemote."""
+        mock_openremote_client.asset.get_asset = AsyncMock()
+
+        with patch('app.services.asset.get_openremote_service') as mock_get_service:
+            mock_get_service.return_value = MagicMock(client=mock_openremote_client)
+
+            from app.services.asset import get_by_id
+
+            result = await get_by_id.fn("asset-1", fields=["colour"])
+
+        assert "colour" in result["detail"]
+        mock_openremote_client.asset.get_asset.assert_not_called()
+
+
+class TestAssetIndexQueries:
+    """Test cases for answering queries from the asset index."""
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_supported_queries_skip_openremote(self, mock_openremote_client):
+        """Test projected queries are answered from the index, full assets still come from OpenRemote."""
+        from app.utils import AssetIndex
+
+        index = AssetIndex(["master"])
+        index.sync_realm("master", [AssetObjectSchema(id="room-1", name="Room", type="RoomAsset", realm="master")])
+        mock_openremote_client.asset.query_assets = AsyncMock(return_value=MagicMock(content=[]))
+
+        with patch('app.services.asset.get_openremote_service') as mock_get_service, \
+                patch('app.services.asset.__asset_index', index):
+            mock_get_service.return_value = MagicMock(client=mock_openremote_client)
+
+            from app.services.asset import query, AssetQuerySchemaDescription
+
+            query_params = AssetQuerySchemaDescription(types=["RoomAsset"], realm={"name": "master"})
+            result = await query.fn(query_params, fields=["summary"])
+            mock_openremote_client.asset.query_assets.assert_not_called()
+
+            await query.fn(query_params)
+            await query.fn(query_params, fields=["id", "attributes.temperature"])
+
+        assert result == [{"id": "room-1", "name": "Room", "type": "RoomAsset", "parentId": None, "realm": "master"}]
+        assert mock_openremote_client.asset.query_assets.await_count == 2
+
+
+class TestAssetTree:
+    """Test cases for the asset hierarchy tool."""
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_subtree_is_fetched_in_pages_with_one_query(self, mock_openremote_client):
+        """Test the descendants of the root are paged through with a single recursive query."""
+        descendants = [
+            AssetObjectSchema(id="room", name="Room", type="RoomAsset", parentId="site", realm="master"),
+            AssetObjectSchema(id="light", name="Light", type="LightAsset", parentId="room", realm="master"),
+            AssetObjectSchema(id="door", name="Door", type="ThingAsset", parentId="room", realm="master"),
+        ]
+
+        async def query_assets(query):
+            return MagicMock(content=descendants[query.offset:query.offset + query.limit])
+
+        mock_openremote_client.asset.query_assets = AsyncMock(side_effect=query_assets)
+        mock_openremote_client.asset.get_asset = AsyncMock(return_value=MagicMock(
+            content=AssetObjectSchema(id="site", name="Site", type="BuildingAsset", realm="master")
+        ))
+
+        with patch('app.services.asset.get_openremote_service') as mock_get_service, \
+                patch('app.services.asset.config.app_query_page_max_limit', 2):
+            mock_get_service.return_value = MagicMock(client=mock_openremote_client)
+
+            from app.services.asset import tree
+
+            result = await tree.fn(root_id="site", max_depth=1)
+
+        assert result == {
+            "roots": [{"id": "site", "name": "Site", "type": "BuildingAsset", "children": [
+                {"id": "room", "name": "Room", "type": "RoomAsset", "children_count": 2},
+            ]}],
+            "assets": 4,
+            "truncated": False,
+        }
+        queries = [call.args[0] for call in mock_openremote_client.asset.query_assets.call_args_list]
+        assert [(query.offset, query.limit) for query in queries] == [(0, 2), (2, 2)]
+        assert all(query.parents[0].id == "site" and query.recursive for query in queries)
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_realm_tree_stops_at_the_maximum(self, mock_openremote_client):
+        """Test a realm with more assets than the maximum is truncated."""
+        mock_openremote_client.asset.query_assets = AsyncMock(return_value=MagicMock(content=[
+            AssetObjectSchema(id=f"asset-{i}", name=f"Asset {i}", realm="master") for i in range(3)
+        ]))
+
+        with patch('app.services.asset.get_openremote_service') as mock_get_service, \
+                patch('app.services.asset.config.app_asset_tree_max_assets', 2):
+            mock_get_service.return_value = MagicMock(client=mock_openremote_client)
+
+            from app.services.asset import tree
+
+            result = await tree.fn(realm="master")
+
+        assert [root["id"] for root in result["roots"]] == ["asset-0", "asset-1"]
+        assert result["truncated"]
+        assert mock_openremote_client.asset.query_assets.call_args.args[0].limit == 3
+
+
+class TestAssetQueryPage:
+    """Test cases for the cursor-paginated asset query."""
+
+    @staticmethod
+    def assets(count, start=0):
+        return [AssetObjectSchema.model_construct(id=f"asset-{i}", name=f"Asset {i}") for i in range(start, start + count)]
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_pages_follow_cursor(self, mock_openremote_client):
+        """Test pages are fetched with a stable order and the cursor continues where the last page ended."""
+        mock_openremote_client.asset.query_assets = AsyncMock(side_effect=[
+            MagicMock(content=self.assets(3)),
+            MagicMock(content=self.assets(1, start=2)),
+        ])
+
+        with patch('app.services.asset.get_openremote_service') as mock_get_service:
+            mock_get_service.return_value = MagicMock(client=mock_openremote_client)
+
+            from app.services.asset import query_page, AssetQuerySchemaDescription
+
+            query_params = AssetQuerySchemaDescription(types=["ThingAsset"])
+            first = await query_page.fn(query_params, limit=2)
+            second = await query_page.fn(query_params, limit=2, cursor=first["next_cursor"])
+
+        assert [a.id for a in first["assets"]] == ["asset-0", "asset-1"]
+        assert [a.id for a in second["assets"]] == ["asset-2"]
+        assert second["next_cursor"] is None
+
+        sent = [c.args[0] for c in mock_openremote_client.asset.query_assets.call_args_list]
+        assert [(q.limit, q.offset) for q in sent] == [(3, 0), (3, 2)]
+        assert all(q.orderBy.property == "CREATED_ON" for q in sent)
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_cursor_of_other_query_is_rejected(self, mock_openremote_client):
+        """Test a cursor from a different query is rejected without calling OpenRemote."""
+        mock_openremote_client.asset.query_assets = AsyncMock(return_value=MagicMock(content=self.assets(3)))
+
+        with patch('app.services.asset.get_openremote_service') as mock_get_service:
+            mock_get_service.return_value = MagicMock(client=mock_openremote_client)
+
+            from app.services.asset import query_page, AssetQuerySchemaDescription
+
+            first = await query_page.fn(AssetQuerySchemaDescription(types=["ThingAsset"]), limit=2)
+            result = await query_page.fn(AssetQuerySchemaDescription(types=["RoomAsset"]), cursor=first["next_cursor"])
+
+        assert "detail" in result
+        assert mock_openremote_client.asset.query_assets.await_count == 1
+
+
+class TestGetByIds:
+    """Test cases for fetching many assets in one tool call."""
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_concurrent_fetch_reports_errors_per_id(self, mock_openremote_client):
+        """Test assets are fetched with bounded concurrency and failures don't fail the whole call."""
+        running = 0
+        max_running = 0
+
+        async def get_asset(asset_id):
+            nonlocal running, max_running
+            running += 1
+            max_running = max(max_running, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+
+            if asset_id == "forbidden":
+                response = MagicMock(status_code=403, text="Forbidden")
+                raise HTTPStatusError("Forbidden", request=MagicMock(), response=response)
+
+            return MagicMock(content=AssetObjectSchema.model_construct(id=asset_id, name=asset_id))
+
+        mock_openremote_client.asset.get_asset = AsyncMock(side_effect=get_asset)
+
+        with patch('app.services.asset.get_openremote_service') as mock_get_service, \
+                patch('app.services.asset.config.app_get_by_ids_concurrency', 2):
+            mock_get_service.return_value = MagicMock(client=mock_openremote_client)
+
+            from app.services.asset import get_by_ids
+
+            result = await get_by_ids.fn(["a", "forbidden", "b", "c", "a"])
+
+        assert [asset.id for asset in result["assets"]] == ["a", "b", "c"]
+        assert result["errors"] == [{"asset_id": "forbidden", "status_code": 403, "detail": "Forbidden"}]
+        assert mock_openremote_client.asset.get_asset.await_count == 4
+        assert max_running == 2
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_transport_errors_are_reported_per_id(self, mock_openremote_client):
+        """Test a timeout on one ID is reported for that ID, the other assets are still returned."""
+        async def get_asset(asset_id):
+            if asset_id == "slow":
+                raise httpx.ReadTimeout("Timed out")
+
+            return MagicMock(content=AssetObjectSchema.model_construct(id=asset_id, name=asset_id))
+
+        mock_openremote_client.asset.get_asset = AsyncMock(side_effect=get_asset)
+
+        with patch('app.services.asset.get_openremote_service') as mock_get_service:
+            mock_get_service.return_value = MagicMock(client=mock_openremote_client)
+
+            from app.services.asset import get_by_ids
+
+            result = await get_by_ids.fn(["a", "slow", "b"])
+
+        assert [asset.id for asset in result["assets"]] == ["a", "b"]
+        assert result["errors"] == [{"asset_id": "slow", "detail": "Timed out"}]
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_large_id_sets_use_a_single_query(self, mock_openremote_client):
+        """Test many IDs are fetched with one query, and only IDs missing from the result are fetched on their own."""
+        asset_ids = [f"asset-{i}" for i in range(5)]
+        mock_openremote_client.asset.get_asset = AsyncMock(side_effect=HTTPStatusError(
+            "Not found", request=MagicMock(), response=MagicMock(status_code=404, text="Not found"),
+        ))
+        mock_openremote_client.asset.query_assets = AsyncMock(return_value=MagicMock(content=[
+            AssetObjectSchema.model_construct(id=asset_id, name=asset_id) for asset_id in reversed(asset_ids[:4])
+        ]))
+
+        with patch('app.services.asset.get_openremote_service') as mock_get_service, \
+                patch('app.services.asset.config.app_get_by_ids_query_threshold', 3):
+            mock_get_service.return_value = MagicMock(client=mock_openremote_client)
+
+            from app.services.asset import get_by_ids
+
+            result = await get_by_ids.fn(asset_ids, fields=["id"])
+
+        assert result["assets"] == [{"id": asset_id} for asset_id in asset_ids[:4]]
+        assert result["errors"] == [{"asset_id": "asset-4", "status_code": 404, "detail": "Not found"}]
+        assert mock_openremote_client.asset.query_assets.call_args.args[0].ids == asset_ids
+        mock_openremote_client.asset.get_asset.assert_awaited_once_with("asset-4")
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_assets_of_other_realms_are_found_on_both_paths(self, mock_openremote_client):
+        """Test assets the realmless query can't see are still returned once the query threshold is passed."""
+        assets = {
+            asset_id: AssetObjectSchema.model_construct(id=asset_id, name=asset_id, realm=realm)
+            for asset_id, realm in [("a", "master"), ("b", "smartcity"), ("c", "master")]
+        }
+        mock_openremote_client.asset.get_asset = AsyncMock(side_effect=lambda asset_id: MagicMock(content=assets[asset_id]))
+        # The query only sees the realm of the service user
+        mock_openremote_client.asset.query_assets = AsyncMock(return_value=MagicMock(content=[
+            asset for asset in assets.values() if asset.realm == "master"
+        ]))
+        results = []
+
+        with patch('app.services.asset.get_openremote_service') as mock_get_service:
+            mock_get_service.return_value = MagicMock(client=mock_openremote_client)
+
+            from app.services.asset import get_by_ids
+
+            for threshold in (3, 2):
+                with patch('app.services.asset.config.app_get_by_ids_query_threshold', threshold):
+                    results.append(await get_by_ids.fn(list(assets), fields=["id"]))
+
+        assert results[0] == results[1] == {"assets": [{"id": "a"}, {"id": "b"}, {"id": "c"}], "errors": []}
+        mock_openremote_client.asset.query_assets.assert_awaited_once()
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_failed_query_is_reported_per_id(self, mock_openremote_client):
+        """Test an open circuit on the single query is reported for every ID instead of failing the call."""
+        from services.resilience import CircuitOpenError
+
+        mock_openremote_client.asset.query_assets = AsyncMock(side_effect=CircuitOpenError(retry_after=30))
+
+        with patch('app.services.asset.get_openremote_service') as mock_get_service, \
+                patch('app.services.asset.config.app_get_by_ids_query_threshold', 1):
+            mock_get_service.return_value = MagicMock(client=mock_openremote_client)
+
+            from app.services.asset import get_by_ids
+
+            result = await get_by_ids.fn(["a", "b"])
+
+        assert result == {"assets": [], "errors": [
+            {"asset_id": "a", "detail": "OpenRemote is unavailable, retry after 30 seconds"},
+            {"asset_id": "b", "detail": "OpenRemote is unavailable, retry after 30 seconds"},
+        ]}
+
+
+class TestReadAttributeValues:
+    """Test cases for reading attribute values from the event cache."""
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_cached_values_skip_openremote_and_misses_are_cached(self, mock_openremote_client):
+        """Test cached assets are answered from memory, others are fetched once and cached from then on."""
+        from services.attribute_events import AttributeValueCache
+
+        cache = AttributeValueCache(realms=["master"])
+        cache.put_asset({"id": "a", "realm": "master", "attributes": {"temperature": {"value": 21.5, "timestamp": 1}}})
+        mock_openremote_client.asset.get_asset = AsyncMock(return_value=MagicMock(content=AssetObjectSchema(
+            id="b", name="b", realm="master", attributes={
+                "temperature": {"name": "temperature", "value": 19, "timestamp": 2},
+                "humidity": {"name": "humidity", "value": 40, "timestamp": 2},
+            },
+        )))
+
+        with patch('app.services.asset.get_openremote_service') as mock_get_service, \
+                patch('app.services.asset.get_attribute_value_cache', return_value=cache):
+            mock_get_service.return_value = MagicMock(client=mock_openremote_client)
+
+            from app.services.asset import read_attribute_values
+
+            result = await read_attribute_values.fn(["a", "b"], attribute_names=["temperature"])
+            assert await read_attribute_values.fn(["b"], attribute_names=["temperature"]) == {
+                "assets": [{"asset_id": "b", "attributes": {"temperature": {"value": 19, "timestamp": 2}}}],
+                "errors": [],
+            }
+
+        assert result["assets"] == [
+            {"asset_id": "a", "attributes": {"temperature": {"value": 21.5, "timestamp": 1}}},
+            {"asset_id": "b", "attributes": {"temperature": {"value": 19, "timestamp": 2}}},
+        ]
+        mock_openremote_client.asset.get_asset.assert_awaited_once_with("b")
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_assets_of_unsubscribed_realms_are_not_cached(self, mock_openremote_client):
+        """Test an asset of a realm without event stream is read from OpenRemote every time."""
+        from services.attribute_events import AttributeValueCache
+
+        cache = AttributeValueCache(realms=["master"])
+        mock_openremote_client.asset.get_asset = AsyncMock(return_value=MagicMock(content=AssetObjectSchema(
+            id="a", name="a", realm="other", attributes={"temperature": {"name": "temperature", "value": 1, "timestamp": 1}},
+        )))
+
+        with patch('app.services.asset.get_openremote_service') as mock_get_service, \
+                patch('app.services.asset.get_attribute_value_cache', return_value=cache):
+            mock_get_service.return_value = MagicMock(client=mock_openremote_client)
+
+            from app.services.asset import read_attribute_values
+
+            await read_attribute_values.fn(["a"])
+            await read_attribute_values.fn(["a"])
+
+        assert mock_openremote_client.asset.get_asset.await_count == 2
+        assert len(cache) == 0
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_without_cache_values_are_read_from_openremote(self, mock_openremote_client):
+        """Test every asset is fetched when no realms are subscribed to, and failures are reported per asset."""
+        response = MagicMock(status_code=404, text="Not found")
+        mock_openremote_client.asset.get_asset = AsyncMock(
+            side_effect=HTTPStatusError("Not found", request=MagicMock(), response=response)
+        )
+
+        with patch('app.services.asset.get_openremote_service') as mock_get_service, \
+                patch('app.services.asset.get_attribute_value_cache', return_value=None):
+            mock_get_service.return_value = MagicMock(client=mock_openremote_client)
+
+            from app.services.asset import read_attribute_values
+
+            result = await read_attribute_values.fn(["missing"])
+
+        assert result == {"assets": [], "errors": [{"asset_id": "missing", "status_code": 404, "detail": "Not found"}]}
+
+
+class TestWriteAttributeValues:
+    """Test cases for the batched attribute write tool."""
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_writes_are_batched_with_per_entry_results(self, mock_openremote_client):
+        """Test writes are sent in batches and every write gets its own result."""
+        def respond(path, json):
+            return Response(200, json=[
+                {"ref": state["ref"], "failure": "ATTRIBUTE_NOT_FOUND" if state["ref"]["name"] == "missing" else None}
+                for state in json
+            ], request=MagicMock())
+
+        mock_openremote_client.put = AsyncMock(side_effect=respond)
+
+        with patch('app.services.asset.get_openremote_service') as mock_get_service, \
+                patch('app.services.asset.config.app_attribute_write_batch_size', 2):
+            mock_get_service.return_value = MagicMock(client=mock_openremote_client)
+
+            from app.services.asset import write_attribute_values, AttributeWrite
+
+            result = await write_attribute_values.fn([
+                AttributeWrite(asset_id="a", attribute_name="setpoint", value=20),
+                AttributeWrite(asset_id="b", attribute_name="missing", value=21),
+                AttributeWrite(asset_id="c", attribute_name="setpoint", value=22),
+            ])
+
+        assert mock_openremote_client.put.await_count == 2
+        assert mock_openremote_client.put.call_args_list[0].kwargs["json"][1] == {
+            "ref": {"id": "b", "name": "missing"}, "value": 21,
+        }
+        assert [r["success"] for r in result] == [True, False, True]
+        assert result[1]["failure"] == "ATTRIBUTE_NOT_FOUND"
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_http_error_fails_whole_batch(self, mock_openremote_client):
+        """Test an HTTP error is reported on every write of the batch."""
+        mock_response = MagicMock()
+        mock_response.status_code = 403
+        mock_response.text = "Forbidden"
+        mock_openremote_client.put = AsyncMock(
+            side_effect=HTTPStatusError("Forbidden", request=MagicMock(), response=mock_response)
+        )
+
+        with patch('app.services.asset.get_openremote_service') as mock_get_service:
+            mock_get_service.return_value = MagicMock(client=mock_openremote_client)
+
+            from app.services.asset import write_attribute_values, AttributeWrite
+
+            result = await write_attribute_values.fn([
+                AttributeWrite(asset_id="a", attribute_name="setpoint", value=20),
+                AttributeWrite(asset_id="b", attribute_name="setpoint", value=21),
+            ])
+
+        assert [r["success"] for r in result] == [False, False]
+        assert all("403" in r["failure"] for r in result)
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_transport_error_and_wrong_result_count_fail_only_their_batch(self, mock_openremote_client):
+        """Test a timeout or a result list of the wrong length fails its batch, and earlier batches are kept."""
+        responses = [
+            MagicMock(json=MagicMock(return_value=[{"failure": None}, {"failure": None}])),
+            MagicMock(json=MagicMock(return_value=[{"failure": None}])),
+            httpx.ReadTimeout("Read timed out"),
+        ]
+        mock_openremote_client.put = AsyncMock(side_effect=responses)
+
+        with patch('app.services.asset.get_openremote_service') as mock_get_service, \
+                patch('app.services.asset.config.app_attribute_write_batch_size', 2):
+            mock_get_service.return_value = MagicMock(client=mock_openremote_client)
+
+            from app.services.asset import write_attribute_values, AttributeWrite
+
+            result = await write_attribute_values.fn([
+                AttributeWrite(asset_id=f"asset-{i}", attribute_name="setpoint", value=i) for i in range(6)
+            ])
+
+        assert [r["success"] for r in result] == [True, True, False, False, False, False]
+        assert "2 writes" in result[2]["failure"]
+        assert result[5]["failure"] == "Read timed out"
+
+
+class TestCreateMany:
+    """Test cases for creating many assets in one tool call."""
+
+    ASSET_INFOS = [
+        MagicMock(
+            assetDescriptor={"name": "BuildingAsset"},
+            attributeDescriptors=[{"name": "notes", "type": "text", "optional": True}],
+        ),
+        MagicMock(
+            assetDescriptor={"name": "ThermometerAsset"},
+            attributeDescriptors=[{"name": "temperature", "type": "number", "optional": True}],
+        ),
+    ]
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_parents_are_created_first_and_errors_reported_per_item(self, mock_openremote_client):
+        """Test parents in the batch are created before their children, and failed items don't stop the rest."""
+        order = []
+
+        async def create_asset(asset):
+            order.append(asset.name)
+            return MagicMock(content=AssetObjectSchema.model_construct(id=asset.id or f"id-{asset.name}", name=asset.name))
+
+        mock_openremote_client.asset.create_asset = AsyncMock(side_effect=create_asset)
+
+        with patch('app.services.asset.get_openremote_service') as mock_get_service, \
+                patch('app.services.asset.fetch_asset_infos', AsyncMock(return_value=MagicMock(content=self.ASSET_INFOS))):
+            mock_get_service.return_value = MagicMock(client=mock_openremote_client)
+
+            from app.services.asset import create_many, AssetDefinition
+
+            result = await create_many.fn([
+                AssetDefinition(name="Sensor", type="ThermometerAsset", parentId="building", attributes={"temperature": 21}),
+                AssetDefinition(name="Building", type="BuildingAsset", id="building"),
+                AssetDefinition(name="Broken", type="ThermometerAsset", attributes={"temperature": "warm"}),
+                AssetDefinition(name="Orphan", type="ThermometerAsset", parentId="broken-parent"),
+                AssetDefinition(name="Unknown", type="SpaceshipAsset"),
+                AssetDefinition(name="Child", type="ThermometerAsset", parentId="invalid"),
+                AssetDefinition(name="Invalid", type="BuildingAsset", id="invalid", attributes={"colour": "red"}),
+            ])
+
+        assert order.index("Building") < order.index("Sensor")
+        assert [item["index"] for item in result["created"]] == [0, 1, 3]
+        assert [item["index"] for item in result["errors"]] == [2, 4, 5, 6]
+        assert "colour" in result["errors"][3]["detail"]
+
+        sensor = next(c.args[0] for c in mock_openremote_client.asset.create_asset.call_args_list if c.args[0].name == "Sensor")
+        assert sensor.attributes == {"temperature": {"name": "temperature", "type": "number", "value": 21.0}}
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_transport_errors_are_reported_per_item(self, mock_openremote_client):
+        """Test a timeout on one asset is reported, skips its children and keeps the assets already created."""
+        async def create_asset(asset):
+            if asset.name == "Timeout":
+                raise httpx.ReadTimeout("Read timed out")
+
+            return MagicMock(content=AssetObjectSchema.model_construct(id=asset.id or f"id-{asset.name}", name=asset.name))
+
+        mock_openremote_client.asset.create_asset = AsyncMock(side_effect=create_asset)
+
+        with patch('app.services.asset.get_openremote_service') as mock_get_service, \
+                patch('app.services.asset.fetch_asset_infos', AsyncMock(return_value=MagicMock(content=self.ASSET_INFOS))):
+            mock_get_service.return_value = MagicMock(client=mock_openremote_client)
+
+            from app.services.asset import create_many, AssetDefinition
+
+            result = await create_many.fn([
+                AssetDefinition(name="Building", type="BuildingAsset"),
+                AssetDefinition(name="Timeout", type="BuildingAsset", id="timeout"),
+                AssetDefinition(name="Sensor", type="ThermometerAsset", parentId="timeout"),
+            ])
+
+        assert result["created"] == [{"index": 0, "id": "id-Building", "name": "Building"}]
+        assert result["errors"] == [
+            {"index": 1, "name": "Timeout", "detail": "Read timed out"},
+            {"index": 2, "name": "Sensor", "detail": "Parent at index 1 was not created"},
+        ]
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_unsupported_attribute_types_are_reported_per_item(self, mock_openremote_client):
+        """Test an asset type with an attribute type that can't be validated only fails its own items."""
+        asset_infos = [*self.ASSET_INFOS, MagicMock(
+            assetDescriptor={"name": "RobotAsset"},
+            attributeDescriptors=[{"name": "pose", "type": "geoJSONPoint", "optional": True}],
+        )]
+        mock_openremote_client.asset.create_asset = AsyncMock(side_effect=lambda asset: MagicMock(
+            content=AssetObjectSchema.model_construct(id=f"id-{asset.name}", name=asset.name),
+        ))
+
+        with patch('app.services.asset.get_openremote_service') as mock_get_service, \
+                patch('app.services.asset.fetch_asset_infos', AsyncMock(return_value=MagicMock(content=asset_infos))):
+            mock_get_service.return_value = MagicMock(client=mock_openremote_client)
+
+            from app.services.asset import create_many, AssetDefinition
+
+            result = await create_many.fn([
+                AssetDefinition(name="Robot", type="RobotAsset"),
+                AssetDefinition(name="Building", type="BuildingAsset"),
+            ])
+
+        assert result["created"] == [{"index": 1, "id": "id-Building", "name": "Building"}]
+        assert result["errors"] == [
+            {"index": 0, "name": "Robot", "detail": "Asset type 'RobotAsset' has an attribute of unsupported type 'geoJSONPoint'"},
+        ]
+
+    @pytest.mark.unit
+    def test_parent_cycles_are_detected(self):
+        """Test assets are grouped by depth and parent cycles within the batch are reported."""
+        from app.services.asset import _creation_levels, AssetDefinition
+
+        levels, cycle = _creation_levels([
+            AssetDefinition(name="a", type="T", id="a", parentId="b"),
+            AssetDefinition(name="b", type="T", id="b", parentId="a"),
+            AssetDefinition(name="root", type="T", id="root"),
+            AssetDefinition(name="child", type="T", id="child", parentId="root"),
+            AssetDefinition(name="grandchild", type="T", parentId="child"),
+        ])
+
+        assert cycle == {0, 1}
+        assert levels == [[2], [3], [4]]
+
+
+class TestLazyAssetTools:
+    """Test cases for lazily compiled 'create_<type>' tools."""
+
+    @staticmethod
+    def make_asset_model():
+        from types import SimpleNamespace
+        return SimpleNamespace(
+            assetDescriptor={"name": "ThingAsset"},
+            attributeDescriptors=[{"name": "notes", "type": "text", "optional": True}],
+        )
+
+    @pytest.mark.unit
+    def test_lazy_tool_compiles_on_first_listing(self):
+        """Test the schema is only built when the tool details are requested, and only once."""
+        from app.services import asset
+
+        with patch.object(asset, 'compile_create_tool', wraps=asset.compile_create_tool) as compile_create_tool:
+            tool = asset.lazy_create_tool(self.make_asset_model())
+
+            assert tool.name == "create_ThingAsset"
+            compile_create_tool.assert_not_called()
+
+            # Copies made when importing the server share the compiled tool
+            copy = tool.model_copy(key="asset_create_ThingAsset")
+            mcp_tool = copy.to_mcp_tool(name=copy.key)
+            tool.to_mcp_tool()
+
+            assert mcp_tool.name == "asset_create_ThingAsset"
+            assert "attributes" in mcp_tool.inputSchema["properties"]
+            compile_create_tool.assert_called_once()
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_lazy_tool_compiles_on_first_call(self, mock_openremote_client):
+        """Test calling a lazy tool compiles it and creates the asset."""
+        mock_openremote_client.asset.create_asset = AsyncMock(return_value={"id": "new-asset-456"})
+
+        with patch('app.services.asset.get_openremote_service') as mock_get_service:
+            mock_service = MagicMock()
+            mock_service.client = mock_openremote_client
+            mock_get_service.return_value = mock_service
+
+            from app.services.asset import lazy_create_tool
+
+            tool = lazy_create_tool(self.make_asset_model())
+            await tool.run({"name": "New Asset", "realm": "master", "attributes": {"notes": "hello"}})
+
+            mock_openremote_client.asset.create_asset.assert_called_once()
+
+
+class TestAssetToolSync:
+    """Test cases for keeping the 'create_<type>' tools in line with OpenRemote."""
+
+    @pytest.fixture(autouse=True)
+    def clean_asset_tools(self):
+        from app.services.asset import sync_asset_tools
+        yield
+        sync_asset_tools([])
+
+    @staticmethod
+    def make_asset_model(name: str, optional: bool = True):
+        from openremote_client.schemas import AssetTypeInfoSchema
+        return AssetTypeInfoSchema.model_construct(
+            assetDescriptor={"name": name},
+            attributeDescriptors=[{"name": "notes", "type": "text", "optional": optional}],
+        )
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_only_changed_asset_types_are_rebuilt(self):
+        """Test unchanged asset types keep their tool, changed and removed ones are updated."""
+        from app.services.asset import sync_asset_tools, asset_mcp
+
+        assert sync_asset_tools([self.make_asset_model("ThingAsset"), self.make_asset_model("RoomAsset")])
+        thing_tool = await asset_mcp.get_tool("create_ThingAsset")
+        room_tool = await asset_mcp.get_tool("create_RoomAsset")
+
+        assert not sync_asset_tools([self.make_asset_model("ThingAsset"), self.make_asset_model("RoomAsset")])
+
+        assert sync_asset_tools([self.make_asset_model("ThingAsset"), self.make_asset_model("RoomAsset", optional=False)])
+        tools = await asset_mcp.get_tools()
+
+        assert tools["create_ThingAsset"] is thing_tool
+        assert tools["create_RoomAsset"] is not room_tool
+
+        assert sync_asset_tools([self.make_asset_model("ThingAsset")])
+        assert "create_RoomAsset" not in await asset_mcp.get_tools()
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_init_from_snapshot(self, mock_openremote_client, tmp_path):
+        """Test tools are registered from the snapshot before OpenRemote answers."""
+        from app.services import asset
+        from app.utils import save_asset_infos_snapshot
+
+        snapshot_path = tmp_path / "asset_infos.json"
+        save_asset_infos_snapshot(snapshot_path, [self.make_asset_model("ThingAsset")])
+
+        mcp = MagicMock()
+        with patch.object(asset.config, 'app_asset_snapshot_path', str(snapshot_path)), \
+                patch.object(asset, 'refresh_asset_tools', AsyncMock()) as refresh_asset_tools:
+            await asset.init_asset_service(mcp)
+
+            assert "create_ThingAsset" in await asset.asset_mcp.get_tools()
+            mcp.mount.assert_called_once_with(asset.asset_mcp, prefix="asset")
+
+            # OpenRemote is only consulted in the background
+            await asyncio.sleep(0.01)
+            refresh_asset_tools.assert_called_once_with(refresh=True)
+
+            await asset.stop_asset_service()
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_reconciler_picks_up_new_asset_types(self, mock_openremote_client):
+        """Test the background reconciler bypasses the cache and adds new asset types."""
+        from app.services import asset
+
+        mock_openremote_client.asset_model.get_asset_infos = AsyncMock(side_effect=[
+            MagicMock(content=[self.make_asset_model("ThingAsset")]),
+            MagicMock(content=[self.make_asset_model("ThingAsset"), self.make_asset_model("RoomAsset")]),
+        ])
+
+        with patch('app.services.asset_model.get_openremote_service') as mock_get_service, \
+                patch.object(asset.config, 'app_asset_snapshot_path', ''), \
+                patch.object(asset.config, 'app_asset_reconcile_interval', 0.01):
+            mock_service = MagicMock()
+            mock_service.client = mock_openremote_client
+            mock_get_service.return_value = mock_service
+
+            await asset.init_asset_service(MagicMock())
+            assert "create_RoomAsset" not in await asset.asset_mcp.get_tools()
+
+            await asyncio.sleep(0.05)
+            await asset.stop_asset_service()
+
+            assert "create_RoomAsset" in await asset.asset_mcp.get_tools()
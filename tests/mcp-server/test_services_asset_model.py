@@ -70,3 +70,24 @@ class TestAssetModelService:
             assert result["assetType"] == "ThingAsset"
             assert "attributeDescriptors" in result
             mock_openremote_client.asset_model.get_asset_info.assert_called_once_with("ThingAsset")
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_get_all_asset_types_is_cached(self, mock_openremote_client):
+        """Test repeated calls are served from the asset model cache."""
+        mock_openremote_client.asset_model.get_asset_infos = AsyncMock(return_value=[])
+
+        with patch('app.services.asset_model.get_openremote_service') as mock_get_service:
+            mock_service = MagicMock()
+            mock_service.client = mock_openremote_client
+            mock_get_service.return_value = mock_service
+
+            from app.services.asset_model import get_all_types, invalidate_asset_model_cache
+
+            await get_all_types.fn()
+            await get_all_types.fn()
+            mock_openremote_client.asset_model.get_asset_infos.assert_called_once()
+
+            invalidate_asset_model_cache()
+            await get_all_types.fn()
+            assert mock_openremote_client.asset_model.get_asset_infos.call_count == 2
@@ -0,0 +1,84 @@
+# Copyright 2025, OpenRemote Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+"""Tests for the in-memory asset index."""
+import pytest
+from openremote_client.schemas import AssetObjectSchema, AssetQuerySchema, ParentPredicateSchema, \
+    RealmPredicateSchema, StringPredicateSchema
+
+from app.utils.asset_index import AssetIndex
+
+MASTER = RealmPredicateSchema(name="master")
+
+
+def make_asset(asset_id: str, type: str = "ThingAsset", parent_id: str | None = None, version: int = 0) -> AssetObjectSchema:
+    return AssetObjectSchema(id=asset_id, name=asset_id.title(), type=type, parentId=parent_id, realm="master", version=version)
+
+
+@pytest.fixture
+def index() -> AssetIndex:
+    index = AssetIndex(["master"])
+    index.sync_realm("master", [
+        make_asset("building", type="BuildingAsset"),
+        make_asset("room-1", type="RoomAsset", parent_id="building"),
+        make_asset("room-2", type="RoomAsset", parent_id="building"),
+        make_asset("light", type="LightAsset", parent_id="room-1"),
+    ])
+    return index
+
+
+class TestAssetIndex:
+    """Test cases for answering asset queries from memory."""
+
+    @pytest.mark.unit
+    def test_indexed_predicates_are_evaluated(self, index):
+        """Test ids, types, parents and names are combined, in creation order with paging applied."""
+        rooms = AssetQuerySchema(realm=MASTER, types=["RoomAsset", "LightAsset"], parents=[ParentPredicateSchema(id="building")])
+        assert [asset.id for asset in index.evaluate(rooms)] == ["room-1", "room-2"]
+
+        roots = AssetQuerySchema(realm=MASTER, parents=[ParentPredicateSchema(id=None)])
+        assert [asset.id for asset in index.evaluate(roots)] == ["building"]
+
+        named = AssetQuerySchema(realm=MASTER, names=[StringPredicateSchema(match_="BEGIN", value="room", caseSensitive=False)], offset=1)
+        assert [asset.id for asset in index.evaluate(named)] == ["room-2"]
+
+        by_ids = AssetQuerySchema(realm=MASTER, ids=["light", "unknown", "building"], limit=1)
+        assert [asset.id for asset in index.evaluate(by_ids)] == ["building"]
+
+    @pytest.mark.unit
+    def test_only_supported_queries_are_answered(self, index):
+        """Test other predicates, unsynced realms and queries without a realm are left to OpenRemote."""
+        assert index.supports(AssetQuerySchema(realm=MASTER, types=["RoomAsset"]))
+        assert not index.supports(AssetQuerySchema(types=["RoomAsset"]))
+        assert not index.supports(AssetQuerySchema(realm=RealmPredicateSchema(name="other")))
+        assert not index.supports(AssetQuerySchema(realm=MASTER, recursive=True))
+        assert not index.supports(AssetQuerySchema(realm=MASTER, userIds=["user"]))
+
+    @pytest.mark.unit
+    def test_sync_only_applies_changes(self, index):
+        """Test a sync reports added, changed and removed assets, and moved assets are indexed by their new parent."""
+        delta = index.sync_realm("master", [
+            make_asset("building", type="BuildingAsset"),
+            make_asset("room-1", type="RoomAsset", parent_id="building"),
+            make_asset("light", type="LightAsset", parent_id="room-3", version=1),
+            make_asset("room-3", type="RoomAsset", parent_id="building"),
+        ])
+
+        assert (delta.added, delta.changed, delta.removed) == (1, 1, 1)
+        assert [asset.id for asset in index.evaluate(AssetQuerySchema(realm=MASTER, parents=[ParentPredicateSchema(id="room-3")]))] == ["light"]
+        assert index.get("room-2") is None
+        assert not index.sync_realm("master", [index.get(asset_id) for asset_id in ("building", "room-1", "light", "room-3")])
@@ -0,0 +1,90 @@
+# Copyright 2025, OpenRemote Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+
+"""Tests for the asset model snapshot."""
+import json
+import pytest
+from openremote_client.schemas import AssetTypeInfoSchema
+
+from app.utils.asset_snapshot import (
+    asset_info_digest,
+    load_asset_infos_snapshot,
+    save_asset_infos_snapshot,
+)
+
+ASSET_INFOS = [
+    AssetTypeInfoSchema.model_construct(
+        assetDescriptor={"name": "ThingAsset"},
+        attributeDescriptors=[{"name": "notes", "type": "text", "optional": True}],
+    )
+]
+
+
+class TestAssetSnapshot:
+    """Test cases for persisting asset infos between runs."""
+
+    @pytest.mark.unit
+    def test_save_and_load(self, tmp_path):
+        """Test a saved snapshot loads back the same asset infos."""
+        path = tmp_path / "snapshot" / "asset_infos.json"
+
+        digest = save_asset_infos_snapshot(path, ASSET_INFOS)
+        loaded = load_asset_infos_snapshot(path)
+
+        assert len(digest) == 64
+        assert loaded[0].assetDescriptor["name"] == "ThingAsset"
+        assert asset_info_digest(loaded[0]) == asset_info_digest(ASSET_INFOS[0])
+
+    @pytest.mark.unit
+    def test_missing_snapshot(self, tmp_path):
+        """Test a missing snapshot loads as None."""
+        assert load_asset_infos_snapshot(tmp_path / "missing.json") is None
+
+    @pytest.mark.unit
+    def test_corrupt_snapshot_is_ignored(self, tmp_path):
+        """Test a snapshot whose content doesn't match its digest is ignored."""
+        path = tmp_path / "asset_infos.json"
+        save_asset_infos_snapshot(path, ASSET_INFOS)
+
+        snapshot = json.loads(path.read_text())
+        snapshot["asset_infos"][0]["assetDescriptor"]["name"] = "Tampered"
+        path.write_text(json.dumps(snapshot))
+
+        assert load_asset_infos_snapshot(path) is None
+
+    @pytest.mark.unit
+    def test_outdated_format_is_ignored(self, tmp_path):
+        """Test a snapshot with another format version is ignored."""
+        path = tmp_path / "asset_infos.json"
+        save_asset_infos_snapshot(path, ASSET_INFOS)
+
+        snapshot = json.loads(path.read_text())
+        snapshot["format_version"] = 0
+        path.write_text(json.dumps(snapshot))
+
+        assert load_asset_infos_snapshot(path) is None
+
+    @pytest.mark.unit
+    def test_digest_changes_with_descriptors(self):
+        """Test the digest of an asset type changes when its descriptors change."""
+        changed = AssetTypeInfoSchema.model_construct(
+            assetDescriptor={"name": "ThingAsset"},
+            attributeDescriptors=[{"name": "notes", "type": "text", "optional": False}],
+        )
+
+        assert asset_info_digest(changed) != asset_info_digest(ASSET_INFOS[0])
@@ -0,0 +1,65 @@
+# Copyright 2025, OpenRemote Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+"""Tests for assembling the asset hierarchy."""
+import pytest
+from openremote_client.schemas import AssetObjectSchema
+
+from app.utils.asset_tree import build_asset_tree
+
+
+def make_asset(asset_id: str, parent_id: str | None = None) -> AssetObjectSchema:
+    return AssetObjectSchema.model_construct(id=asset_id, name=asset_id, type="ThingAsset", parentId=parent_id, realm="master")
+
+
+class TestBuildAssetTree:
+    """Test cases for nesting assets under their parents."""
+
+    @pytest.mark.unit
+    def test_children_are_nested_in_order(self):
+        """Test assets whose parent is missing become roots, and children keep the order of the assets."""
+        assets = [make_asset("site"), make_asset("room-2", "site"), make_asset("room-1", "site"), make_asset("orphan", "hidden")]
+
+        roots = build_asset_tree(assets)
+
+        assert [root["id"] for root in roots] == ["site", "orphan"]
+        assert [child["id"] for child in roots[0]["children"]] == ["room-2", "room-1"]
+        assert roots[0]["children"][0] == {"id": "room-2", "name": "room-2", "type": "ThingAsset"}
+
+    @pytest.mark.unit
+    def test_depth_limit_counts_the_children_left_out(self):
+        """Test nodes at the maximum depth list how many children they have instead."""
+        assets = [make_asset("site"), make_asset("room", "site"), make_asset("light-1", "room"), make_asset("light-2", "room")]
+
+        assert build_asset_tree(assets, root_ids=["room"], max_depth=0) == [
+            {"id": "room", "name": "room", "type": "ThingAsset", "children_count": 2}
+        ]
+
+        (site,) = build_asset_tree(assets, max_depth=1)
+        assert site["children"] == [{"id": "room", "name": "room", "type": "ThingAsset", "children_count": 2}]
+
+    @pytest.mark.unit
+    def test_deep_hierarchies_are_not_recursive(self):
+        """Test a hierarchy deeper than the recursion limit is assembled."""
+        assets = [make_asset("asset-0")] + [make_asset(f"asset-{i}", f"asset-{i - 1}") for i in range(1, 5000)]
+
+        node = build_asset_tree(assets)[0]
+        depth = 0
+        while "children" in node:
+            node, depth = node["children"][0], depth + 1
+
+        assert depth == 4999
@@ -0,0 +1,154 @@
+# Copyright 2025, OpenRemote Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+
+"""Tests for the stale-while-revalidate cache."""
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, patch
+
+from app.utils.cache import StaleWhileRevalidateCache, cache_requests_total, cache_hit_ratio
+
+
+class TestStaleWhileRevalidateCache:
+    """Test cases for the stale-while-revalidate cache."""
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_fresh_entry_is_served_from_memory(self):
+        """Test a fresh entry does not call the loader again."""
+        cache = StaleWhileRevalidateCache(ttl=60)
+        loader = AsyncMock(return_value="value")
+
+        assert await cache.get("key", loader) == "value"
+        assert await cache.get("key", loader) == "value"
+        loader.assert_called_once()
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_lookups_are_counted_in_metrics(self):
+        """Test hits and misses are counted under the name of the cache."""
+        cache = StaleWhileRevalidateCache(ttl=60, name="test")
+        loader = AsyncMock(return_value="value")
+
+        for _ in range(4):
+            await cache.get("key", loader)
+
+        assert cache_requests_total.value(cache="test", result="miss") == 1
+        assert cache_requests_total.value(cache="test", result="hit") == 3
+        assert cache_hit_ratio.value(cache="test") == 0.75
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_concurrent_misses_share_one_load(self):
+        """Test concurrent misses for the same key only load once."""
+        cache = StaleWhileRevalidateCache(ttl=60)
+
+        async def slow_loader():
+            await asyncio.sleep(0.01)
+            return "value"
+
+        loader = AsyncMock(side_effect=slow_loader)
+
+        results = await asyncio.gather(*(cache.get("key", loader) for _ in range(5)))
+
+        assert results == ["value"] * 5
+        loader.assert_called_once()
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_stale_entry_is_served_while_refreshing(self):
+        """Test a stale entry is returned immediately and refreshed in the background."""
+        cache = StaleWhileRevalidateCache(ttl=10, stale_ttl=100)
+        loader = AsyncMock(side_effect=["old", "new"])
+
+        with patch("app.utils.cache.time.monotonic", return_value=0):
+            await cache.get("key", loader)
+
+        with patch("app.utils.cache.time.monotonic", return_value=20):
+            assert await cache.get("key", loader) == "old"
+            await asyncio.sleep(0)
+            assert await cache.get("key", loader) == "new"
+
+        assert loader.call_count == 2
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_failed_refresh_keeps_stale_entry(self):
+        """Test a failing background refresh keeps serving the stale entry."""
+        cache = StaleWhileRevalidateCache(ttl=10, stale_ttl=100)
+        loader = AsyncMock(side_effect=["old", RuntimeError("OpenRemote unavailable")])
+
+        with patch("app.utils.cache.time.monotonic", return_value=0):
+            await cache.get("key", loader)
+
+        with patch("app.utils.cache.time.monotonic", return_value=20):
+            assert await cache.get("key", loader) == "old"
+            await asyncio.sleep(0)
+            assert await cache.get("key", AsyncMock(return_value="new")) == "old"
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_expired_entry_waits_for_loader(self):
+        """Test an entry past the stale window is loaded synchronously."""
+        cache = StaleWhileRevalidateCache(ttl=10, stale_ttl=10)
+        loader = AsyncMock(side_effect=["old", "new"])
+
+        with patch("app.utils.cache.time.monotonic", return_value=0):
+            await cache.get("key", loader)
+
+        with patch("app.utils.cache.time.monotonic", return_value=30):
+            assert await cache.get("key", loader) == "new"
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_invalidate(self):
+        """Test invalidation forces the next call to load again."""
+        cache = StaleWhileRevalidateCache(ttl=60)
+        loader = AsyncMock(side_effect=["old", "new"])
+
+        await cache.get("key", loader)
+        cache.invalidate("key")
+
+        assert await cache.get("key", loader) == "new"
+
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_invalidate_detaches_load_in_flight(self):
+        """Test a load started before an invalidation neither fills the cache nor answers later misses."""
+        cache = StaleWhileRevalidateCache(ttl=60)
+        released = asyncio.Event()
+
+        async def outdated_loader():
+            await released.wait()
+            return "outdated"
+
+        in_flight = asyncio.create_task(cache.get("key", outdated_loader))
+        other = asyncio.create_task(cache.get("other", AsyncMock(return_value="other")))
+        await asyncio.sleep(0)
+        cache.invalidate("key")
+
+        assert await cache.get("key", AsyncMock(return_value="new")) == "new"
+
+        released.set()
+
+        assert await in_flight == "outdated"
+        assert await other == "other"
+        assert await cache.get("key", AsyncMock(return_value="reloaded")) == "new"
+        # Invalidating one key leaves the loads of other keys alone
+        assert await cache.get("other", AsyncMock(return_value="reloaded")) == "other"
@@ -0,0 +1,75 @@
+# Copyright 2025, OpenRemote Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+"""Tests for the Prometheus metrics."""
+import pytest
+
+from app.utils.metrics import MetricsRegistry
+
+
+class TestMetricsRegistry:
+    """Test cases for rendering metrics in the Prometheus text format."""
+
+    @pytest.mark.unit
+    def test_counter_and_gauge(self):
+        """Test counters and gauges are rendered per label combination."""
+        registry = MetricsRegistry()
+        calls = registry.counter("calls_total", "Calls", ("tool",))
+        in_flight = registry.gauge("in_flight", "In flight")
+
+        calls.inc(tool="query")
+        calls.inc(2, tool='say "hi"')
+        in_flight.inc()
+
+        assert registry.render() == (
+            "# HELP calls_total Calls\n"
+            "# TYPE calls_total counter\n"
+            'calls_total{tool="query"} 1\n'
+            'calls_total{tool="say \\"hi\\""} 2\n'
+            "# HELP in_flight In flight\n"
+            "# TYPE in_flight gauge\n"
+            "in_flight 1\n"
+        )
+
+    @pytest.mark.unit
+    def test_histogram_buckets_are_cumulative(self):
+        """Test histograms render cumulative buckets, sum and count."""
+        registry = MetricsRegistry()
+        duration = registry.histogram("duration_seconds", "Duration", ("tool",), buckets=(0.1, 1))
+
+        duration.observe(0.05, tool="query")
+        duration.observe(0.5, tool="query")
+        duration.observe(5, tool="query")
+
+        rendered = registry.render()
+
+        assert 'duration_seconds_bucket{tool="query",le="0.1"} 1\n' in rendered
+        assert 'duration_seconds_bucket{tool="query",le="1"} 2\n' in rendered
+        assert 'duration_seconds_bucket{tool="query",le="+Inf"} 3\n' in rendered
+        assert 'duration_seconds_sum{tool="query"} 5.55\n' in rendered
+        assert 'duration_seconds_count{tool="query"} 3\n' in rendered
+
+    @pytest.mark.unit
+    def test_wrong_labels_are_rejected(self):
+        """Test using a metric with other labels than it was registered with fails."""
+        registry = MetricsRegistry()
+        calls = registry.counter("calls_total", "Calls", ("tool",))
+
+        with pytest.raises(ValueError):
+            calls.inc(endpoint="query")
+        with pytest.raises(ValueError):
+            registry.counter("calls_total", "Calls")
@@ -0,0 +1,47 @@
+# Copyright 2025, OpenRemote Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+"""Tests for the pagination cursors."""
+import pytest
+from openremote_client.schemas import AssetQuerySchema
+
+from app.utils.pagination import encode_cursor, decode_cursor
+
+
+class TestPaginationCursor:
+    """Test cases for opaque pagination cursors."""
+
+    @pytest.mark.unit
+    def test_round_trip_ignores_paging_fields(self):
+        """Test a cursor decodes for the same query, regardless of its limit and offset."""
+        cursor = encode_cursor(AssetQuerySchema(types=["ThingAsset"]), 200)
+
+        assert decode_cursor(AssetQuerySchema(types=["ThingAsset"], limit=10, offset=5), cursor) == 200
+
+    @pytest.mark.unit
+    def test_cursor_of_other_query_is_rejected(self):
+        """Test a cursor can't be used to continue a different query."""
+        cursor = encode_cursor(AssetQuerySchema(types=["ThingAsset"]), 200)
+
+        with pytest.raises(ValueError):
+            decode_cursor(AssetQuerySchema(types=["BuildingAsset"]), cursor)
+
+    @pytest.mark.unit
+    def test_malformed_cursor_is_rejected(self):
+        """Test garbage cursors raise a ValueError."""
+        with pytest.raises(ValueError):
+            decode_cursor(AssetQuerySchema(), "not-a-cursor")
@@ -0,0 +1,64 @@
+# Copyright 2025, OpenRemote Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+"""Tests for asset field projection."""
+import pytest
+from openremote_client.schemas import AssetObjectSchema
+
+from app.utils.projection import parse_projection, SUMMARY_FIELDS
+
+ASSET = AssetObjectSchema.model_construct(
+    id="asset-1",
+    name="Thermostat",
+    type="ThermostatAsset",
+    realm="master",
+    parentId="building-1",
+    path=["asset-1", "building-1"],
+    attributes={
+        "temperature": {"name": "temperature", "type": "number", "value": 21.5, "meta": {"label": "Temperature"}},
+        "notes": {"name": "notes", "type": "text", "value": "Hallway", "timestamp": 1700000000000},
+    },
+)
+
+
+class TestAssetProjection:
+    """Test cases for slimming assets down to the requested fields."""
+
+    @pytest.mark.unit
+    def test_summary_has_no_attributes(self):
+        """Test the summary preset only keeps the identifying fields."""
+        projection = parse_projection(["summary"])
+
+        assert not projection.needs_attributes
+        assert projection.apply(ASSET) == {field: getattr(ASSET, field) for field in SUMMARY_FIELDS}
+
+    @pytest.mark.unit
+    def test_attributes_are_reduced_to_values(self):
+        """Test selected attributes only keep their value."""
+        projection = parse_projection(["id", "attributes.temperature", "attributes.missing"])
+
+        assert projection.apply(ASSET) == {"id": "asset-1", "attributes": {"temperature": 21.5}}
+        assert parse_projection(["attributes"]).apply(ASSET)["attributes"] == {"temperature": 21.5, "notes": "Hallway"}
+
+    @pytest.mark.unit
+    def test_unknown_and_empty_fields(self):
+        """Test unknown fields are rejected and no fields means no projection."""
+        assert parse_projection(None) is None
+        assert parse_projection([]) is None
+
+        with pytest.raises(ValueError):
+            parse_projection(["colour"])
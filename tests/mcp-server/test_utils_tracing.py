@@ -0,0 +1,140 @@
+# Copyright 2025, OpenRemote Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+"""Tests for tracing tool calls."""
+import json
+import pytest
+import threading
+from fastmcp import FastMCP, Client
+
+from app.middleware.tracing import TracingMiddleware, UpstreamTracing
+from app.utils.tracing import JsonLinesExporter, Span, SpanExporter, instrument_tools, parse_traceparent, tracer
+from services.upstream import OpenRemoteUpstream
+
+
+class MemoryExporter(SpanExporter):
+    def __init__(self):
+        self.spans = []
+
+    def export(self, span):
+        self.spans.append(span)
+
+
+@pytest.fixture
+def exporter():
+    exporter = MemoryExporter()
+    tracer.add_exporter(exporter)
+    yield exporter
+    tracer.shutdown()
+
+
+class TestTracer:
+    """Test cases for creating and exporting spans."""
+
+    @pytest.mark.unit
+    def test_spans_are_nested_and_continue_remote_traces(self, exporter):
+        """Test child spans share the trace of their parent, which continues the trace of the traceparent."""
+        traceparent = "00-0af7651916cd43dd8448eb211c80319c-b7ad6b7169203331-01"
+
+        with tracer.span("parent", traceparent=traceparent) as parent:
+            with tracer.span("child") as child:
+                pass
+
+        assert [span.name for span in exporter.spans] == ["child", "parent"]
+        assert parent.trace_id == child.trace_id == "0af7651916cd43dd8448eb211c80319c"
+        assert parent.parent_id == "b7ad6b7169203331"
+        assert child.parent_id == parent.span_id
+        assert parse_traceparent(child.traceparent) == (child.trace_id, child.span_id)
+        assert parse_traceparent("00-invalid-b7ad6b7169203331-01") is None
+
+    @pytest.mark.unit
+    def test_disabled_without_exporter(self):
+        """Test no spans are created while there is no exporter."""
+        with tracer.span("ignored") as span:
+            assert span is None
+
+    @pytest.mark.unit
+    def test_jsonl_exporter(self, tmp_path):
+        """Test the JSON-lines exporter writes one line per span, including failures."""
+        path = tmp_path / "traces" / "spans.jsonl"
+        tracer.add_exporter(JsonLinesExporter(str(path)))
+
+        try:
+            with pytest.raises(RuntimeError):
+                with tracer.span("failing", tool="query"):
+                    raise RuntimeError("Broken")
+        finally:
+            tracer.shutdown()
+
+        line = json.loads(path.read_text().strip())
+        assert line["name"] == "failing"
+        assert line["status"] == "error"
+        assert line["attributes"] == {"tool": "query"}
+        assert line["duration_ms"] >= 0
+
+
+    @pytest.mark.unit
+    def test_jsonl_exporter_writes_in_the_background(self, tmp_path):
+        """Test spans are serialized and written off the calling thread, and all of them are written on close."""
+        path = tmp_path / "spans.jsonl"
+        exporter = JsonLinesExporter(str(path))
+        written_by = set()
+
+        class Attribute:
+            def __repr__(self):
+                written_by.add(threading.current_thread().name)
+                return "attribute"
+
+        for i in range(50):
+            exporter.export(Span(name=f"span-{i}", trace_id="0" * 31 + "1", attributes={"value": Attribute()}))
+        exporter.close()
+
+        lines = [json.loads(line) for line in path.read_text().splitlines()]
+        assert [line["name"] for line in lines] == [f"span-{i}" for i in range(50)]
+        assert written_by == {"span-writer"}
+
+
+class TestToolTracing:
+    """Test cases for tracing a tool call down to OpenRemote."""
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_tool_call_spans(self, exporter, mock_openremote_client):
+        """Test a tool call produces validation, execution, upstream and serialization spans in one trace."""
+        upstream = OpenRemoteUpstream(mock_openremote_client, interceptors=[UpstreamTracing()])
+        server = FastMCP("Test")
+        server.add_middleware(TracingMiddleware())
+
+        @server.tool
+        async def realm(name: str) -> dict:
+            return await upstream.realm.get_realm(name)
+
+        await instrument_tools(server)
+
+        async with Client(server) as client:
+            await client.call_tool("realm", {"name": "master"})
+
+        spans = {span.name: span for span in exporter.spans}
+        tool_span = spans["tool realm"]
+        upstream_span = spans["openremote realm.get_realm"]
+
+        assert set(spans) == {"tool realm", "validate arguments", "execute", "openremote realm.get_realm", "serialize result"}
+        assert {span.trace_id for span in exporter.spans} == {tool_span.trace_id}
+        assert spans["validate arguments"].parent_id == spans["execute"].parent_id == tool_span.span_id
+        assert upstream_span.parent_id == spans["execute"].span_id
+
+        mock_openremote_client.realm.get_realm.assert_called_once_with("master", headers={"traceparent": upstream_span.traceparent})
@@ -0,0 +1,129 @@
+# Copyright 2025, OpenRemote Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+"""Tests for services module - caching attribute values from the OpenRemote event stream."""
+import asyncio
+import json
+import pytest
+from urllib.parse import parse_qs, urlsplit
+
+import websockets
+
+from services.attribute_events import AttributeEventStream, AttributeValueCache, event_stream_url
+
+
+class TestAttributeValueCache:
+    """Test cases for the attribute value cache."""
+
+    @pytest.mark.unit
+    def test_older_values_never_replace_newer_ones(self):
+        """Test an asset fetched over REST keeps values of newer events, and drops removed attributes."""
+        cache = AttributeValueCache(realms=["master"])
+        cache.put_event("a", "temperature", 22, timestamp=200, realm="master")
+        cache.put_event("a", "temperature", 20, timestamp=100, realm="master")
+
+        # Only attributes seen in events are known until the whole asset is
+        assert cache.lookup("a", ["temperature"])["temperature"].value == 22
+        assert cache.lookup("a") is None
+
+        cache.put_asset({"id": "a", "realm": "master", "attributes": {
+            "temperature": {"value": 21, "timestamp": 150},
+            "humidity": {"value": 40, "timestamp": 150},
+        }})
+
+        assert {name: value.value for name, value in cache.lookup("a").items()} == {"temperature": 22, "humidity": 40}
+        assert cache.lookup("a", ["temperature", "unknown"]).keys() == {"temperature"}
+
+    @pytest.mark.unit
+    def test_assets_fetched_before_a_gap_are_not_stored(self):
+        """Test clearing a realm drops its assets and ignores assets fetched before the clear."""
+        cache = AttributeValueCache(realms=["master", "other"], max_assets=2)
+        cache.put_asset({"id": "a", "realm": "master", "attributes": {}})
+        cache.put_asset({"id": "b", "realm": "other", "attributes": {}})
+        generation = cache.generation
+
+        cache.clear("master")
+        cache.put_asset({"id": "c", "realm": "master", "attributes": {}}, generation)
+
+        assert cache.lookup("a") is None and cache.lookup("c") is None
+        assert cache.lookup("b") == {}
+
+        cache.put_asset({"id": "d", "realm": "master", "attributes": {}})
+        cache.put_asset({"id": "e", "realm": "master", "attributes": {}})
+        assert len(cache) == 2 and cache.lookup("b") is None
+
+    @pytest.mark.unit
+    def test_only_subscribed_realms_are_stored(self):
+        """Test assets and events of realms without a subscription are never cached."""
+        cache = AttributeValueCache(realms=["master"])
+        cache.put_asset({"id": "a", "realm": "other", "attributes": {}})
+        cache.put_event("b", "temperature", 21, timestamp=1, realm="other")
+        assert len(cache) == 0
+
+        cache.put_asset({"id": "c", "realm": "master", "attributes": {}})
+        cache.unsubscribe("master")
+        cache.put_asset({"id": "c", "realm": "master", "attributes": {}})
+        assert len(cache) == 0
+
+
+class TestAttributeEventStream:
+    """Test cases for subscribing to the attribute events."""
+
+    @pytest.mark.unit
+    def test_event_stream_url(self):
+        """Test the websocket URL follows the scheme of the OpenRemote URL."""
+        assert event_stream_url("https://openremote.io/") == "wss://openremote.io/websocket/events"
+        assert event_stream_url("http://localhost:8080") == "ws://localhost:8080/websocket/events"
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_events_update_the_cache(self):
+        """Test the stream subscribes with the token and stores the values of triggered events."""
+        requests = []
+        subscriptions = []
+
+        async def openremote(websocket):
+            requests.append(parse_qs(urlsplit(websocket.request.path).query))
+            for _ in range(2):
+                subscriptions.append(json.loads((await websocket.recv()).removeprefix("SUBSCRIBE:")))
+
+            await websocket.send("SUBSCRIBED:" + json.dumps(subscriptions[0]))
+            await websocket.send("TRIGGERED:" + json.dumps({"subscriptionId": "mcp-attribute", "events": [
+                {"eventType": "attribute", "ref": {"id": "a", "name": "temperature"}, "value": 21.5, "timestamp": 1},
+            ]}))
+            await websocket.wait_closed()
+
+        async def get_token():
+            return "token"
+
+        async with websockets.serve(openremote, "127.0.0.1", 0) as server:
+            port = server.sockets[0].getsockname()[1]
+            cache = AttributeValueCache()
+            stream = AttributeEventStream(f"ws://127.0.0.1:{port}/websocket/events", ["master"], cache, get_token)
+            stream.start()
+
+            try:
+                while cache.lookup("a", ["temperature"]) is None:
+                    await asyncio.sleep(0.01)
+            finally:
+                await stream.stop()
+
+        assert requests == [{"Realm": ["master"], "Authorization": ["Bearer token"]}]
+        assert [subscription["eventType"] for subscription in subscriptions] == ["attribute", "asset"]
+        assert stream.events == 1
+        # Values may have been missed once disconnected
+        assert not stream.connected["master"] and len(cache) == 0
@@ -0,0 +1,89 @@
+# Copyright 2025, OpenRemote Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+"""Tests for services module - heartbeats to OpenRemote."""
+import asyncio
+import httpx
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from openremote_client.schemas import ExternalServiceSchema
+
+from services.openremote_service import HeartbeatSchedule, OpenRemoteService
+
+
+def registered_service(client, instance_id: int = 123) -> OpenRemoteService:
+    schema = ExternalServiceSchema(
+        serviceId="test-service", instanceId=instance_id, label="Test", homepageUrl="http://test", status="AVAILABLE"
+    )
+
+    return OpenRemoteService(client, schema, HeartbeatSchedule(interval=30, timeout=0.05), send_heartbeats=False)
+
+
+class TestHeartbeat:
+    """Test cases for sending heartbeats and registering again."""
+
+    @pytest.mark.unit
+    def test_jitter_only_makes_heartbeats_earlier(self):
+        """Test the delay stays between the interval minus the jitter and the interval."""
+        schedule = HeartbeatSchedule(interval=30, jitter=0.2)
+
+        assert all(24 <= schedule.delay() <= 30 for _ in range(100))
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_failures_are_recorded_not_raised(self, mock_openremote_client):
+        """Test failed and timed out heartbeats are counted, and a success resets the count."""
+        service = registered_service(mock_openremote_client)
+
+        async def hang(*args):
+            await asyncio.sleep(1)
+
+        mock_openremote_client.services.heartbeat = AsyncMock(side_effect=httpx.ConnectError("Connection refused"))
+        assert not await service.beat()
+        mock_openremote_client.services.heartbeat = AsyncMock(side_effect=hang)
+        assert not await service.beat()
+        assert service.heartbeat_failures == 2
+        assert service.last_heartbeat_at is None
+
+        mock_openremote_client.services.heartbeat = AsyncMock(return_value=None)
+        assert await service.beat()
+        assert service.heartbeat_stats()["consecutive_failures"] == 0
+        assert service.heartbeat_stats()["last_success_at"] is not None
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_registers_again_when_instance_is_unknown(self, mock_openremote_client):
+        """Test a 404 on the heartbeat registers the service again under a new instance id."""
+        service = registered_service(mock_openremote_client)
+        response = httpx.Response(404, request=httpx.Request("PUT", "http://openremote"))
+        mock_openremote_client.services.heartbeat = AsyncMock(
+            side_effect=httpx.HTTPStatusError("404", request=response.request, response=response)
+        )
+        registration = MagicMock()
+        registration.content = ExternalServiceSchema(
+            serviceId="test-service", instanceId=456, label="Test", homepageUrl="http://test", status="AVAILABLE"
+        )
+        mock_openremote_client.services.register_service = AsyncMock(return_value=registration)
+        listener = MagicMock()
+        service.add_registration_listener(listener)
+
+        assert await service.beat()
+
+        assert service.instance_id == 456
+        assert mock_openremote_client.services.register_service.await_args.args[0].instanceId is None
+        listener.assert_called_once_with(service)
@@ -0,0 +1,182 @@
+# Copyright 2025, OpenRemote Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+"""Tests for services module - leader election between worker processes."""
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from services.leader import LeaderElection
+from services.openremote_service import get_openremote_service, init_openremote_service, stop_openremote_service
+
+
+class TestLeaderElection:
+    """Test cases for electing a leader with a lock file."""
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_single_leader_and_takeover(self, tmp_path):
+        """Test only one worker leads, and another one takes over once it resigns."""
+        lock_path = tmp_path / "worker.lock"
+        leader, follower = LeaderElection(lock_path, group=1), LeaderElection(lock_path, group=1)
+
+        assert leader.try_lead()
+        assert not follower.try_lead()
+
+        leader.publish({"instanceId": 7})
+        assert await follower.wait_for_state(timeout=1) == {"instanceId": 7}
+
+        leader.resign()
+        await asyncio.wait_for(follower.wait_for_leadership(poll_interval=0.01), timeout=1)
+        assert follower.is_leader
+
+        follower.resign()
+
+    @pytest.mark.unit
+    def test_state_of_other_runs_is_ignored(self, tmp_path):
+        """Test workers don't pick up the state published by an earlier run of the server."""
+        lock_path = tmp_path / "worker.lock"
+
+        LeaderElection(lock_path, group=1).publish({"instanceId": 7})
+
+        assert LeaderElection(lock_path, group=2).read() is None
+
+    @pytest.mark.unit
+    def test_last_member_is_recognized(self, tmp_path):
+        """Test a worker only counts as the last one once every other worker has left."""
+        lock_path = tmp_path / "worker.lock"
+        first, second = LeaderElection(lock_path, group=1), LeaderElection(lock_path, group=1)
+        first.join()
+        second.join()
+
+        assert not first.is_last_member()
+        assert second.is_last_member()
+
+
+class TestDeregistration:
+    """Test cases for deregistering the shared instance."""
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("follower_running", [True, False])
+    async def test_only_the_last_worker_deregisters(self, mock_openremote_client, tmp_path, follower_running):
+        """Test a stopping leader leaves the instance registered while another worker still uses it."""
+        from openremote_client.schemas import ExternalServiceSchema
+
+        lock_path = tmp_path / "worker.lock"
+        follower = LeaderElection(lock_path, group=1)
+        schema = ExternalServiceSchema(serviceId="test-service", label="Test", homepageUrl="http://test", status="AVAILABLE")
+        mock_openremote_client.services.deregister_service = AsyncMock()
+
+        if follower_running:
+            follower.join()
+
+        with patch('services.openremote_service.OpenRemoteClient', return_value=mock_openremote_client):
+            await init_openremote_service(
+                service_schema=schema,
+                host="http://localhost:8080",
+                client_id="test",
+                client_secret="test",
+                election=LeaderElection(lock_path, group=1),
+            )
+
+        await stop_openremote_service()
+        follower.resign()
+
+        assert mock_openremote_client.services.deregister_service.await_count == (0 if follower_running else 1)
+
+
+class TestStaleState:
+    """Test cases for state left behind by an earlier run with the same parent pid."""
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_new_leader_replaces_stale_state_and_removes_it_on_resign(self, mock_openremote_client, tmp_path):
+        """Test stale state is removed before registering, then replaced, and removed again when the leader stops."""
+        from openremote_client.schemas import ExternalServiceSchema
+
+        lock_path = tmp_path / "worker.lock"
+        follower = LeaderElection(lock_path, group=1)
+        schema = ExternalServiceSchema(serviceId="test-service", label="Test", homepageUrl="http://test", status="AVAILABLE")
+
+        # Published by the leader of a run that crashed
+        LeaderElection(lock_path, group=1).publish({"serviceId": "test-service", "instanceId": 7})
+
+        async def register_service(service_schema):
+            assert follower.read() is None
+            return MagicMock(content=service_schema.model_copy(update={"instanceId": 456}))
+
+        mock_openremote_client.services.register_service = AsyncMock(side_effect=register_service)
+
+        with patch('services.openremote_service.OpenRemoteClient', return_value=mock_openremote_client):
+            await init_openremote_service(
+                service_schema=schema,
+                host="http://localhost:8080",
+                client_id="test",
+                client_secret="test",
+                election=LeaderElection(lock_path, group=1),
+            )
+
+        try:
+            assert follower.read() == {"serviceId": "test-service", "instanceId": 456}
+        finally:
+            await stop_openremote_service()
+
+        assert follower.read() is None
+
+
+class TestSharedRegistration:
+    """Test cases for registering the service once for all workers."""
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_followers_share_the_instance_of_the_leader(self, mock_openremote_client, tmp_path):
+        """Test only the leader registers and sends heartbeats, followers use its instance id."""
+        from openremote_client.schemas import ExternalServiceSchema
+
+        lock_path = tmp_path / "worker.lock"
+        leader = LeaderElection(lock_path, group=1)
+        schema = ExternalServiceSchema(serviceId="test-service", label="Test", homepageUrl="http://test", status="AVAILABLE")
+
+        # The leader is another worker, only its lock and published state are visible to this one
+        assert leader.try_lead()
+        leader.publish({"serviceId": "test-service", "instanceId": 123})
+
+        with patch('services.openremote_service.OpenRemoteClient', return_value=mock_openremote_client):
+            await init_openremote_service(
+                service_schema=schema,
+                host="http://localhost:8080",
+                client_id="test",
+                client_secret="test",
+                election=LeaderElection(lock_path, group=1),
+            )
+
+        try:
+            service = get_openremote_service()
+            assert service.instance_id == 123
+            assert not service.sends_heartbeats
+            mock_openremote_client.services.register_service.assert_not_called()
+
+            leader.resign()
+            for _ in range(30):
+                if service.sends_heartbeats:
+                    break
+                await asyncio.sleep(0.1)
+
+            assert service.sends_heartbeats
+        finally:
+            await stop_openremote_service()
@@ -0,0 +1,141 @@
+# Copyright 2025, OpenRemote Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+"""Tests for services module - retries and circuit breaker around OpenRemote calls."""
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import httpx
+
+from services.resilience import CircuitBreaker, CircuitOpenError, Retry
+from services.upstream import OpenRemoteUpstream
+
+
+def http_error(status_code: int) -> httpx.HTTPStatusError:
+    response = httpx.Response(status_code, request=httpx.Request("GET", "http://openremote"))
+    return httpx.HTTPStatusError(str(status_code), request=response.request, response=response)
+
+
+class TestRetry:
+    """Test cases for retrying transient failures."""
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_transient_read_failures_are_retried(self, mock_openremote_client):
+        """Test reads are retried after transient failures until they succeed."""
+        mock_openremote_client.realm.get_realm = AsyncMock(
+            side_effect=[http_error(503), httpx.ConnectError("Connection refused"), {"name": "master"}]
+        )
+        upstream = OpenRemoteUpstream(mock_openremote_client, interceptors=[Retry(attempts=3, base_delay=0, max_delay=0)])
+
+        assert await upstream.realm.get_realm("master") == {"name": "master"}
+        assert mock_openremote_client.realm.get_realm.await_count == 3
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_writes_and_client_errors_are_not_retried(self, mock_openremote_client):
+        """Test writes and non-transient errors fail on the first attempt."""
+        mock_openremote_client.asset.create_asset = AsyncMock(side_effect=http_error(503))
+        mock_openremote_client.realm.get_realm = AsyncMock(side_effect=http_error(404))
+        upstream = OpenRemoteUpstream(mock_openremote_client, interceptors=[Retry(attempts=3, base_delay=0, max_delay=0)])
+
+        with pytest.raises(httpx.HTTPStatusError):
+            await upstream.asset.create_asset(MagicMock())
+        with pytest.raises(httpx.HTTPStatusError):
+            await upstream.realm.get_realm("missing")
+
+        assert mock_openremote_client.asset.create_asset.await_count == 1
+        assert mock_openremote_client.realm.get_realm.await_count == 1
+
+    @pytest.mark.unit
+    def test_backoff_is_capped(self):
+        """Test the jittered backoff never exceeds the maximum delay."""
+        retry = Retry(attempts=10, base_delay=0.5, max_delay=2)
+
+        assert all(0 <= retry.delay(attempt) <= 2 for attempt in range(10))
+
+
+class TestCircuitBreaker:
+    """Test cases for failing fast while OpenRemote is down."""
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_opens_after_failures_and_closes_after_successful_trial(self, mock_openremote_client):
+        """Test the breaker fails fast once open, and a successful trial call closes it."""
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout=30)
+        mock_openremote_client.realm.get_realm = AsyncMock(side_effect=http_error(502))
+        upstream = OpenRemoteUpstream(mock_openremote_client, interceptors=[breaker])
+
+        for _ in range(2):
+            with pytest.raises(httpx.HTTPStatusError):
+                await upstream.realm.get_realm("master")
+
+        assert breaker.state == CircuitBreaker.OPEN
+        with pytest.raises(CircuitOpenError):
+            await upstream.realm.get_realm("master")
+        assert mock_openremote_client.realm.get_realm.await_count == 2
+
+        mock_openremote_client.realm.get_realm = AsyncMock(return_value={"name": "master"})
+        with patch('services.resilience.time.monotonic', return_value=breaker.opened_at + 31):
+            assert breaker.state == CircuitBreaker.HALF_OPEN
+            assert await upstream.realm.get_realm("master") == {"name": "master"}
+
+        assert breaker.stats() == {"state": "closed", "failures": 0, "retry_after": 0}
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_client_errors_do_not_open_the_circuit(self, mock_openremote_client):
+        """Test errors that show OpenRemote is reachable don't count as failures."""
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=30)
+        mock_openremote_client.realm.get_realm = AsyncMock(side_effect=http_error(403))
+        upstream = OpenRemoteUpstream(mock_openremote_client, interceptors=[breaker])
+
+        with pytest.raises(httpx.HTTPStatusError):
+            await upstream.realm.get_realm("master")
+
+        assert breaker.state == CircuitBreaker.CLOSED
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_client_error_ends_a_run_of_failures(self, mock_openremote_client):
+        """Test a 4xx response between transient failures resets the count of failures in a row."""
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout=30)
+        mock_openremote_client.realm.get_realm = AsyncMock(side_effect=[http_error(502), http_error(404), http_error(502)])
+        upstream = OpenRemoteUpstream(mock_openremote_client, interceptors=[breaker])
+
+        for _ in range(3):
+            with pytest.raises(httpx.HTTPStatusError):
+                await upstream.realm.get_realm("master")
+
+        assert breaker.state == CircuitBreaker.CLOSED
+        assert breaker.failures == 1
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_heartbeats_pass_an_open_circuit(self, mock_openremote_client):
+        """Test heartbeats still reach OpenRemote while the circuit is open."""
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=30)
+        mock_openremote_client.realm.get_realm = AsyncMock(side_effect=http_error(502))
+        upstream = OpenRemoteUpstream(mock_openremote_client, interceptors=[breaker])
+
+        with pytest.raises(httpx.HTTPStatusError):
+            await upstream.realm.get_realm("master")
+        assert breaker.state == CircuitBreaker.OPEN
+
+        await upstream.services.heartbeat("test-service", 123)
+
+        mock_openremote_client.services.heartbeat.assert_awaited_once_with("test-service", 123)
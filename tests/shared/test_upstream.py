@@ -0,0 +1,172 @@
+# Copyright 2025, OpenRemote Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+
+"""Tests for services module - OpenRemote upstream proxy."""
+import asyncio
+import pytest
+from unittest.mock import AsyncMock
+
+from openremote_client.schemas import AssetQuerySchema
+
+from services.upstream import Bulkhead, OpenRemoteUpstream, SingleFlight, UpstreamCall, UpstreamInterceptor
+
+
+class RecordingInterceptor(UpstreamInterceptor):
+    def __init__(self):
+        self.calls = []
+
+    async def __call__(self, call, call_next):
+        self.calls.append(call)
+        return await call_next(call)
+
+
+class TestOpenRemoteUpstream:
+    """Test cases for the interceptor chain around the OpenRemote client."""
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_calls_are_routed_through_interceptors(self, mock_openremote_client):
+        """Test API calls pass through interceptors and reach the client."""
+        interceptor = RecordingInterceptor()
+        upstream = OpenRemoteUpstream(mock_openremote_client, interceptors=[interceptor])
+
+        result = await upstream.realm.get_realm("master")
+
+        assert result == {"name": "master"}
+        assert interceptor.calls == [UpstreamCall("realm", "get_realm", ("master",), {})]
+        mock_openremote_client.realm.get_realm.assert_called_once_with("master")
+
+    @pytest.mark.unit
+    def test_read_calls(self):
+        """Test which calls are considered reads."""
+        assert UpstreamCall("asset", "get_asset").is_read
+        assert UpstreamCall("asset", "query_assets").is_read
+        assert not UpstreamCall("asset", "create_asset").is_read
+        assert not UpstreamCall("services", "heartbeat").is_read
+        assert UpstreamCall("http", "get").is_read
+        assert not UpstreamCall("http", "put").is_read
+
+
+class TestSingleFlight:
+    """Test cases for coalescing identical in-flight calls."""
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_identical_reads_share_one_request(self, mock_openremote_client):
+        """Test concurrent identical reads only hit the client once."""
+        async def slow_get_asset(asset_id):
+            await asyncio.sleep(0.01)
+            return {"id": asset_id}
+
+        mock_openremote_client.asset.get_asset = AsyncMock(side_effect=slow_get_asset)
+        single_flight = SingleFlight()
+        upstream = OpenRemoteUpstream(mock_openremote_client, interceptors=[single_flight])
+
+        results = await asyncio.gather(*(upstream.asset.get_asset("a") for _ in range(10)))
+
+        assert results == [{"id": "a"}] * 10
+        mock_openremote_client.asset.get_asset.assert_called_once_with("a")
+        assert single_flight.in_flight == 0
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_different_arguments_are_not_coalesced(self, mock_openremote_client):
+        """Test reads with different arguments each hit the client."""
+        upstream = OpenRemoteUpstream(mock_openremote_client, interceptors=[SingleFlight()])
+
+        await asyncio.gather(
+            upstream.asset.query_assets(AssetQuerySchema(types=["ThingAsset"])),
+            upstream.asset.query_assets(AssetQuerySchema(types=["BuildingAsset"])),
+        )
+
+        assert mock_openremote_client.asset.query_assets.call_count == 2
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_writes_are_not_coalesced(self, mock_openremote_client):
+        """Test writes are always forwarded."""
+        upstream = OpenRemoteUpstream(mock_openremote_client, interceptors=[SingleFlight()])
+
+        await asyncio.gather(
+            upstream.services.heartbeat("service", 1),
+            upstream.services.heartbeat("service", 1),
+        )
+
+        assert mock_openremote_client.services.heartbeat.call_count == 2
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_errors_are_shared(self, mock_openremote_client):
+        """Test every waiting caller receives the upstream error."""
+        async def failing_get_realm(name):
+            await asyncio.sleep(0.01)
+            raise RuntimeError("OpenRemote unavailable")
+
+        mock_openremote_client.realm.get_realm = AsyncMock(side_effect=failing_get_realm)
+        upstream = OpenRemoteUpstream(mock_openremote_client, interceptors=[SingleFlight()])
+
+        results = await asyncio.gather(
+            upstream.realm.get_realm("master"),
+            upstream.realm.get_realm("master"),
+            return_exceptions=True
+        )
+
+        assert all(isinstance(result, RuntimeError) for result in results)
+        mock_openremote_client.realm.get_realm.assert_called_once()
+
+
+class TestBulkhead:
+    """Test cases for limiting concurrent calls per API group."""
+
+    @pytest.mark.unit
+    def test_lanes(self):
+        """Test calls are assigned to the lane of their API group."""
+        bulkhead = Bulkhead(limits={"asset": 2}, default_limit=2, reserved_limit=1)
+
+        assert bulkhead.lane(UpstreamCall("asset", "query_assets")) == "asset"
+        assert bulkhead.lane(UpstreamCall("http", "put", ("/asset/attributes",))) == "asset"
+        assert bulkhead.lane(UpstreamCall("realm", "get_realm")) == "default"
+        assert bulkhead.lane(UpstreamCall("services", "heartbeat")) == "reserved"
+        assert bulkhead.lane(UpstreamCall("status", "get_health_status")) == "reserved"
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_busy_lane_does_not_block_reserved_lane(self, mock_openremote_client):
+        """Test calls queue up within their lane while the reserved lane stays available."""
+        release = asyncio.Event()
+
+        async def slow_query(query):
+            await release.wait()
+            return []
+
+        mock_openremote_client.asset.query_assets = AsyncMock(side_effect=slow_query)
+        mock_openremote_client.services.heartbeat = AsyncMock(return_value=None)
+        bulkhead = Bulkhead(limits={"asset": 2}, default_limit=2, reserved_limit=1)
+        upstream = OpenRemoteUpstream(mock_openremote_client, interceptors=[bulkhead])
+
+        queries = [asyncio.create_task(upstream.asset.query_assets(AssetQuerySchema(limit=i))) for i in range(5)]
+        await asyncio.sleep(0.01)
+
+        assert bulkhead.stats()["asset"] == {"limit": 2, "active": 2, "waiting": 3}
+        await asyncio.wait_for(upstream.services.heartbeat("MCP-Server", 1), timeout=1)
+
+        release.set()
+        await asyncio.gather(*queries)
+
+        assert bulkhead.waiting == 0
+        assert bulkhead.stats()["asset"]["active"] == 0